@@ -0,0 +1,115 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Benchmark the security group rule evaluation of the security group remediation runbooks.
+
+Security groups with hundreds of randomly generated wide-range ingress rules open to
+the internet are evaluated against the authorized ports of RevokeUnauthorizedInboundRules
+and the high-risk ports of DisableUnrestrictedAccessToHighRiskPorts, both port by port
+as the runbooks used to and with the interval evaluation in
+security_group_rule_engine.py. The median times and the number of
+revoke_security_group_ingress calls are printed as a Markdown table:
+
+    python deployment/utils/benchmark_security_group_rules.py [--runs 5] [--rules 100 500]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+SCRIPTS_DIR = (
+    Path(__file__).resolve().parents[2] / "source/remediation_runbooks/scripts"
+)
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import security_group_rule_engine as engine  # noqa: E402
+from DisableUnrestrictedAccessToHighRiskPorts import (  # noqa: E402
+    PORTS_TO_CHECK,
+    rule_has_access_to_high_risk_ports,
+)
+from RevokeUnauthorizedInboundRules import should_revoke_rule  # noqa: E402
+
+# Well-known service ports and the ephemeral port range
+AUTHORIZED_PORTS = {22, 80, 443} | set(range(1024, 65536))
+AUTHORIZED_INTERVALS = engine.to_port_intervals(AUTHORIZED_PORTS)
+
+
+def wide_range_rules(count: int) -> List[dict]:
+    rng = random.Random(count)
+    rules = []
+    for index in range(count):
+        from_port = rng.randint(1000, 65535)
+        rules.append(
+            {
+                "SecurityGroupRuleId": f"sgr-{index:05d}",
+                "IsEgress": False,
+                "IpProtocol": "tcp",
+                "FromPort": from_port,
+                "ToPort": rng.randint(from_port, 65535),
+                "CidrIpv4": engine.OPENIPV4,
+            }
+        )
+    return rules
+
+
+def revoke_port_by_port(rule: dict) -> bool:
+    for port in range(rule["FromPort"], rule["ToPort"] + 1):
+        if port not in AUTHORIZED_PORTS:
+            return True
+    return False
+
+
+def revoke_by_interval(rule: dict) -> bool:
+    return should_revoke_rule(rule, AUTHORIZED_INTERVALS)
+
+
+def high_risk_port_by_port(rule: dict) -> bool:
+    return any(
+        port in range(rule["FromPort"], rule["ToPort"] + 1) for port in PORTS_TO_CHECK
+    )
+
+
+def median_ms(evaluate: Callable[[dict], bool], rules: List[dict], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for rule in rules:
+            evaluate(rule)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rules", type=int, nargs="*", default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    print(
+        "| Runbook | Rules | Port by port (ms) | Interval (ms) "
+        "| Revoke calls before | Revoke calls after |"
+    )
+    print("| --- | ---: | ---: | ---: | ---: | ---: |")
+    for count in args.rules:
+        rules = wide_range_rules(count)
+        for runbook, before, after in [
+            ("RevokeUnauthorizedInboundRules", revoke_port_by_port, revoke_by_interval),
+            (
+                "DisableUnrestrictedAccessToHighRiskPorts",
+                high_risk_port_by_port,
+                rule_has_access_to_high_risk_ports,
+            ),
+        ]:
+            revoked = sum(after(rule) for rule in rules)
+            batches = -(-revoked // engine.REVOKE_BATCH_SIZE)
+            print(
+                f"| {runbook} | {count} | {median_ms(before, rules, args.runs):.1f} "
+                f"| {median_ms(after, rules, args.runs):.2f} | {revoked} | {batches} |"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure the cold-start import time of each Orchestrator Lambda handler.
+
+Each handler module is imported in a fresh interpreter, as in a new Lambda execution
+environment, and the median and minimum wall-clock import times over the runs are
+printed as a Markdown table. Run from the repository root with the layer's
+dependencies installed:
+
+    python deployment/utils/measure_cold_start.py [--runs 10] [handler ...]
+
+Use `python -X importtime -c "import <handler>"` with the same PYTHONPATH to see
+which imports a handler's time is spent in.
+"""
+import argparse
+import os
+import statistics
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
+SOURCE_DIR = Path(__file__).resolve().parents[2] / "source"
+HANDLERS = [
+    "get_approval_requirement",
+    "check_ssm_doc_state",
+    "exec_ssm_doc",
+    "check_ssm_execution",
+    "send_notifications",
+    "schedule_remediation",
+]
+IMPORT_TIMER = (
+    "import time; start = time.perf_counter(); import {handler}; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def measure(handler: str, runs: int) -> list[float]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [str(SOURCE_DIR), str(SOURCE_DIR / "Orchestrator")]
+        ),
+        "AWS_REGION": os.getenv("AWS_REGION", "us-east-1"),
+        "AWS_DEFAULT_REGION": os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+    }
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(  # nosec
+            [sys.executable, "-c", IMPORT_TIMER.format(handler=handler)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("handlers", nargs="*", default=HANDLERS)
+    args = parser.parse_args()
+
+    print("| Handler | Median (ms) | Min (ms) |")
+    print("| --- | ---: | ---: |")
+    for handler in args.handlers:
+        timings = measure(handler, args.runs)
+        print(f"| {handler} | {statistics.median(timings):.0f} | {min(timings):.0f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,9 @@ from typing import Any, Dict
 
 import boto3
 from botocore.exceptions import ClientError
-from layer import utils
+from layer import circuit_breaker, finding_dedupe, remediation_cooldown, utils
 from layer.awsapi_cached_client import BotoSession
-from layer.cloudwatch_metrics import CloudWatchMetrics
+from layer.cloudwatch_metrics import CloudWatchMetrics, flush_metrics_on_exit
 from layer.powertools_logger import get_logger
 from layer.sechub_findings import Finding
 from layer.tracer_utils import init_tracer
@@ -107,10 +107,11 @@ def _add_doc_state_to_answer(doc: str, account: str, region: str, answer: Any) -
         logger.error(answer.message)
 
 
-@tracer.capture_lambda_handler  # type: ignore[misc]
+@tracer.capture_lambda_handler
+@flush_metrics_on_exit
 def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
     answer = utils.StepFunctionLambdaAnswer()
-    logger.info("Processing SSM doc state check", **event)
+    logger.log_event("Processing SSM doc state check", event)
     if "Finding" not in event or "EventType" not in event:
         answer.update(
             {"status": "ERROR", "message": "Missing required data in request"}
@@ -118,6 +119,41 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
         logger.error(answer.message)
         return answer.json()  # type: ignore[no-any-return]
 
+    is_imported = event["EventType"] == "Security Hub Findings - Imported"
+    execution_id = event.get("ExecutionId", "")
+
+    # Security Hub re-emits findings on any field change; drop the events that carry
+    # nothing new for remediation before any other lookups. The hash is recorded
+    # with the execution ID, so a Step Functions retry of this task after an error
+    # (such as SSM throttling) does not match the hash of its own execution.
+    if is_imported and finding_dedupe.is_duplicate(event["Finding"], execution_id):
+        answer.update(
+            {
+                "status": "DUPLICATE",
+                "message": f'Duplicate finding event: {event["Finding"].get("Id")}',
+            }
+        )
+        return answer.json()  # type: ignore[no-any-return]
+
+    result = _check_doc_state(event, is_imported)
+
+    # Only an event that goes on to remediation makes its re-emissions duplicates
+    if is_imported and result.get("status") != "ACTIVE":
+        finding_dedupe.forget(event["Finding"], execution_id)
+
+    return result
+
+
+def _check_doc_state(event: Dict[str, Any], is_imported: bool) -> Dict[str, Any]:
+    answer = utils.StepFunctionLambdaAnswer()
+
+    # A resource that was just remediated for this control is still reported until
+    # Security Hub re-evaluates it
+    cooldown = remediation_cooldown.get_active_cooldown(event) if is_imported else None
+    if cooldown:
+        answer.update(cooldown)
+        return answer.json()  # type: ignore[no-any-return]
+
     product_name = (
         event["Finding"]
         .get("ProductFields", {})
@@ -150,7 +186,7 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
         answer.update({"status": "ACTIVE"})
         return answer.json()  # type: ignore[no-any-return]
 
-    finding = Finding(event["Finding"])
+    finding = Finding(event["Finding"], event.get("ResolvedFinding"))
 
     answer.update(
         {
@@ -192,9 +228,20 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
     # it in get_approval_requirement
     if alt_workflow_doc:
         answer.update({"status": "ACTIVE"})
-    else:
-        _add_doc_state_to_answer(
-            automation_docid, finding.account_id, finding.resource_region, answer
+        return answer.json()  # type: ignore[no-any-return]
+
+    # Skip the cross-account checks for targets that keep failing. Operator-triggered
+    # remediations bypass the breaker and act as probes.
+    if is_imported:
+        verdict = circuit_breaker.get_open_verdict(
+            finding.account_id, finding.resource_region, finding.standard_control
         )
+        if verdict:
+            answer.update(verdict)
+            return answer.json()  # type: ignore[no-any-return]
+
+    _add_doc_state_to_answer(
+        automation_docid, finding.account_id, finding.resource_region, answer
+    )
 
     return answer.json()  # type: ignore[no-any-return]
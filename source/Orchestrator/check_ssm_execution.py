@@ -5,7 +5,7 @@ import re
 from json.decoder import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from layer import utils
+from layer import claim_check, utils
 from layer.awsapi_cached_client import BotoSession
 from layer.powertools_logger import get_logger
 from layer.tracer_utils import init_tracer
@@ -183,7 +183,7 @@ def get_remediation_response(remediation_response_raw):
     return remediation_response
 
 
-@tracer.capture_lambda_handler  # type: ignore[misc]
+@tracer.capture_lambda_handler
 def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
     answer = utils.StepFunctionLambdaAnswer()
     automation_doc = event["AutomationDocument"]
@@ -276,10 +276,17 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
                 "status": automation_exec_info.status,
                 "remediation_status": status_for_message,
                 "message": remediation_message,
-                "remediation_output": remediation_output,
+                # Verbose runbook output continues through the state machine as a
+                # claim check
+                "remediation_output": claim_check.check_out(
+                    f"{SSM_EXEC_ID}#RemediationOutput", remediation_output
+                ),
                 "executionid": SSM_EXEC_ID,
                 "affected_object": affected_object,
-                "logdata": json.dumps(remediation_logdata, default=str),
+                "logdata": claim_check.check_out(
+                    f"{SSM_EXEC_ID}#LogData",
+                    json.dumps(remediation_logdata, default=str),
+                ),
             }
         )
     else:
@@ -6,7 +6,7 @@ import re
 from typing import Any, Dict
 
 from botocore.exceptions import ClientError
-from layer import utils
+from layer import claim_check, finding_projection, utils
 from layer.awsapi_cached_client import BotoSession
 from layer.powertools_logger import get_logger
 from layer.tracer_utils import init_tracer
@@ -53,7 +53,7 @@ def lambda_role_exists(account: str, rolename: str) -> bool:
         exit("An unhandled error occurred: " + str(e))
 
 
-@tracer.capture_lambda_handler  # type: ignore[misc]
+@tracer.capture_lambda_handler
 def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
     # Expected:
     # {
@@ -72,7 +72,7 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
     #   executionid: { '' | string }
     # }
     answer = utils.StepFunctionLambdaAnswer()
-    logger.info("Processing SSM execution request", **event)
+    logger.log_event("Processing SSM execution request", event)
     if "Finding" not in event or "EventType" not in event:
         answer.update(
             {"status": "ERROR", "message": "Missing required data in request"}
@@ -137,21 +137,34 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
 
     ssm = _get_ssm_client(execution_account, remediation_role, execution_region)
 
+    # Check if this a security hub finding, if not then we only send the finding.
+    workflow_data = event.get("Workflow", {}).get("WorkflowConfig", {})
+
+    # A claim-checked finding is resolved here.
+    finding = claim_check.resolve_finding(event)
+
+    # ASR playbooks only read the fields parse_input consumes. Alternate workflows and
+    # non-Security Hub runbooks may read anything, so they get the full finding.
+    if (
+        remote_workflow_doc == automation_doc["AutomationDocId"]
+        and workflow_data.get("security_hub") != "false"
+    ):
+        finding = finding_projection.project_finding(finding)
+
+    finding_parameter = json.dumps(finding)
+
     ssm_parameters = {
-        "Finding": [json.dumps(event["Finding"])],
+        "Finding": [finding_parameter],
         "AutomationAssumeRole": [remediation_role_arn],
     }
     if remote_workflow_doc != automation_doc["AutomationDocId"]:
         ssm_parameters["RemediationDoc"] = [automation_doc["AutomationDocId"]]
         ssm_parameters["Workflow"] = [json.dumps(event.get("Workflow", {}))]
 
-    # Check if this a security hub finding, if not then we only send the finding.
-    workflow_data = event.get("Workflow", {}).get("WorkflowConfig", {})
-
     if "security_hub" in workflow_data:
         if workflow_data["security_hub"] == "false":
             ssm_parameters = {
-                "Finding": [json.dumps(event["Finding"])],
+                "Finding": [finding_parameter],
                 "AutomationAssumeRole": [remediation_role_arn],
             }
 
@@ -17,7 +17,7 @@ from typing import Any, Dict
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
-from layer import utils
+from layer import claim_check, utils
 from layer.awsapi_cached_client import BotoSession
 from layer.powertools_logger import get_logger
 from layer.sechub_findings import Finding
@@ -133,7 +133,7 @@ def _doc_is_active(doc: str, account: str) -> bool:
         return False
 
 
-@tracer.capture_lambda_handler  # type: ignore[misc]
+@tracer.capture_lambda_handler
 def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
     answer = utils.StepFunctionLambdaAnswer()
     answer.update(
@@ -142,9 +142,12 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
             "workflowaccount": "",
             "workflowrole": "",
             "workflow_data": {"impact": "nondestructive", "approvalrequired": "false"},
+            # Large findings continue through the state machine as a claim check
+            "finding": claim_check.check_out_finding(event),
+            "resolved_finding": {},
         }
     )
-    logger.info("Processing approval requirement request", **event)
+    logger.log_event("Processing approval requirement request", event)
     if "Finding" not in event or "EventType" not in event:
         answer.update(
             {"status": "ERROR", "message": "Missing required data in request"}
@@ -191,6 +194,8 @@ def lambda_handler(event: Dict[str, Any], _: Any) -> Dict[str, Any]:
             return answer.json()  # type: ignore[no-any-return]
 
     finding = Finding(event["Finding"])
+    # Later Lambdas rehydrate the Finding from this instead of repeating the lookups
+    answer.update({"resolved_finding": finding.to_resolved()})
 
     auto_trigger = _is_automatic_trigger(event["EventType"])
     is_destructive = _is_remediation_destructive(
@@ -2,10 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 import os
-from typing import Any, Optional, Union, cast
-
-from layer import sechub_findings
-from layer.cloudwatch_metrics import CloudWatchMetrics
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional, Union, cast
+
+from layer import (
+    applogger,
+    circuit_breaker,
+    claim_check,
+    notification_digest,
+    remediation_cooldown,
+    sechub_findings,
+)
+from layer.cloudwatch_metrics import CloudWatchMetrics, flush_metrics_on_exit
 from layer.event_transformers import (
     Event,
     extract_account_id,
@@ -18,7 +27,7 @@ from layer.event_transformers import (
     transform_stepfunctions_failure_event,
 )
 from layer.history_repository import RemediationUpdateRequest
-from layer.metrics import Metrics
+from layer.metrics import Metrics, flush_metrics_queue_on_exit
 from layer.powertools_logger import get_logger
 from layer.remediation_data_service import (
     get_security_hub_console_url,
@@ -44,6 +53,10 @@ AWS_PARTITION = os.getenv("AWS_PARTITION", "aws")  # MUST BE SET in global varia
 logger = get_logger("send_notifications")
 tracer = init_tracer()
 
+SIDE_EFFECT_WORKERS = int(os.getenv("SIDE_EFFECT_WORKERS", "4"))
+# Time kept back from the Lambda timeout to log results and flush metrics
+DEADLINE_MARGIN_MS = 2000
+
 
 def format_details_for_output(details: Any) -> list[str]:
     """Handle various possible formats in the details"""
@@ -70,6 +83,17 @@ def format_details_for_output(details: Any) -> list[str]:
     return details_formatted
 
 
+def _resolve_claim_check(value: Any) -> Any:
+    """Resolve a claim-checked output, keeping the reference if it cannot be read"""
+    try:
+        return claim_check.resolve(value)
+    except Exception as e:
+        logger.warning(
+            "Failed to resolve claim check", extra={"reference": value, "error": str(e)}
+        )
+        return value
+
+
 def set_message_prefix_and_suffix(event):
     message_prefix = event["Notification"].get("SSMExecutionId", "")
     message_suffix = event["Notification"].get("AffectedObject", "")
@@ -91,7 +115,7 @@ def _process_metrics(
     metrics_data["status"], metrics_data["status_reason"] = (
         Metrics.get_status_for_metrics(status_from_event)
     )
-    metrics.send_metrics(metrics_data)
+    metrics.enqueue_metrics(metrics_data)
 
     create_and_send_cloudwatch_metrics(
         status_from_event, control_id, custom_action_name
@@ -188,8 +212,17 @@ def _update_finding_remediation_status(
         )
 
 
-@tracer.capture_lambda_handler  # type: ignore[misc]
+@tracer.capture_lambda_handler
+@flush_metrics_on_exit
+@flush_metrics_queue_on_exit
+@applogger.flush_on_exit
+@notification_digest.flush_on_exit
 def lambda_handler(event: Union[Event, dict[str, Any]], context: Any) -> None:
+    if isinstance(event, dict) and event.get("detail-type") == "Scheduled Event":
+        # Scheduled digest flush: notification_digest.flush_on_exit publishes the
+        # digests whose window has elapsed
+        return
+
     try:
         # Type narrowing: check if this is a Step Functions event (raw dict)
         if (
@@ -225,25 +258,102 @@ def lambda_handler(event: Union[Event, dict[str, Any]], context: Any) -> None:
     control_id = extract_security_control_id(event_dict)
     custom_action_name = event.get("CustomActionName", "")
 
-    _process_metrics(event_dict, status_from_event, control_id, custom_action_name)
-
     notification = _create_notification(
         event, status_from_event, stepfunctions_execution_id, finding
     )
 
-    build_and_send_notification(
-        event, notification, message_prefix, message_suffix, finding_info
-    )
-
     notified_workflow = is_notified_workflow(event)
 
-    if "Finding" in event and not notified_workflow:
-        _update_finding_remediation_status(
-            stepfunctions_execution_id, status_from_event, event
+    def update_status_and_resolve() -> None:
+        # The finding is resolved only after its remediation status is recorded
+        if "Finding" in event and not notified_workflow:
+            _update_finding_remediation_status(
+                stepfunctions_execution_id, status_from_event, event
+            )
+
+        if status_from_event == "SUCCESS" and finding:
+            finding.resolve(event["Notification"]["Message"])
+
+    side_effects: dict[str, Callable[[], None]] = {
+        "metrics": lambda: _process_metrics(
+            event_dict, status_from_event, control_id, custom_action_name
+        ),
+        "notification": lambda: build_and_send_notification(
+            event, notification, message_prefix, message_suffix, finding_info
+        ),
+        "status": update_status_and_resolve,
+        "circuit_breaker": lambda: circuit_breaker.record_outcome(
+            event_dict, status_from_event
+        ),
+    }
+    if status_from_event == "SUCCESS":
+        side_effects["cooldown"] = lambda: remediation_cooldown.start_cooldown(
+            event_dict
         )
 
-    if status_from_event == "SUCCESS" and finding:
-        finding.resolve(event["Notification"]["Message"])
+    _run_side_effects(side_effects, _get_deadline_seconds(context))
+
+
+def _get_deadline_seconds(context: Any) -> Optional[float]:
+    get_remaining_time = getattr(context, "get_remaining_time_in_millis", None)
+    remaining_ms = get_remaining_time() if callable(get_remaining_time) else None
+    if not isinstance(remaining_ms, (int, float)):
+        return None
+    return max(remaining_ms - DEADLINE_MARGIN_MS, 0) / 1000
+
+
+def _run_side_effects(
+    side_effects: dict[str, Callable[[], None]], deadline_seconds: Optional[float]
+) -> None:
+    """
+    Run independent side effects concurrently. Side effects that have not started by
+    the deadline are cancelled and reported as DEADLINE_EXCEEDED; those already running
+    are waited for, so that no thread carries over into a frozen environment or the
+    next invocation. If they overrun the Lambda timeout, the execution environment is
+    replaced with them. The outcome of each side effect is taken once all of them have
+    finished, durations and failures are logged in one record, and the first failure
+    is raised.
+    """
+    durations_ms: dict[str, int] = {}
+
+    def timed(name: str, side_effect: Callable[[], None]) -> None:
+        start = time.perf_counter()
+        try:
+            side_effect()
+        finally:
+            durations_ms[name] = int((time.perf_counter() - start) * 1000)
+
+    executor = ThreadPoolExecutor(
+        max_workers=SIDE_EFFECT_WORKERS, thread_name_prefix="side-effect"
+    )
+    futures = {
+        executor.submit(timed, name, side_effect): name
+        for name, side_effect in side_effects.items()
+    }
+    wait(futures, timeout=deadline_seconds)
+    executor.shutdown(wait=True, cancel_futures=True)
+
+    failures: dict[str, str] = {}
+    first_error: Optional[BaseException] = None
+    for future, name in futures.items():
+        if future.cancelled():
+            failures[name] = "DEADLINE_EXCEEDED"
+            continue
+        error = future.exception()
+        if error is not None:
+            failures[name] = str(error)
+            first_error = first_error or error
+
+    logger.info(
+        "Notification side effects complete",
+        extra={
+            "durations_ms": durations_ms,
+            "failures": failures,
+            "deadline_seconds": deadline_seconds,
+        },
+    )
+    if first_error is not None:
+        raise first_error
 
 
 def build_and_send_notification(
@@ -257,7 +367,9 @@ def build_and_send_notification(
         message_prefix + event["Notification"]["Message"] + message_suffix
     )
 
-    notification.remediation_output = event["Notification"].get("RemediationOutput", "")
+    notification.remediation_output = _resolve_claim_check(
+        event["Notification"].get("RemediationOutput", "")
+    )
 
     notification.remediation_status = event["Notification"]["State"]
 
@@ -286,7 +398,7 @@ def build_and_send_notification(
         and event["Notification"]["Details"] != "MISSING"
     ):
         notification.logdata = format_details_for_output(
-            event["Notification"]["Details"]
+            _resolve_claim_check(event["Notification"]["Details"])
         )
 
     if "GenerateTicket" in event and event["GenerateTicket"]:
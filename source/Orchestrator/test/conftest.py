@@ -4,6 +4,7 @@ import os
 from unittest.mock import patch
 
 import pytest
+from layer import metrics_context
 from layer.awsapi_cached_client import AWSCachedClient
 
 
@@ -26,3 +27,11 @@ def mock_get_local_account_id():
     mock.start()
     yield
     mock.stop()
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics_context():
+    # Metrics parameters are cached per execution environment, i.e. across tests
+    metrics_context.clear_cache()
+    yield
+    metrics_context.clear_cache()
@@ -2,11 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 import os
 
+import boto3
 import botocore.session
+import pytest
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from botocore.stub import Stubber
 from check_ssm_doc_state import lambda_handler
 from layer.awsapi_cached_client import AWSCachedClient
+from moto import mock_aws
 
 from .test_orc_utils import create_lambda_context
 
@@ -858,3 +862,250 @@ def test_playbook_not_enabled(mocker):
     assert "Security Standard is not enabled" in result["message"]
 
     ssmc_stub.deactivate()
+
+
+def test_circuit_breaker_open(mocker):
+    """Imported findings for a target with an open breaker skip the document checks"""
+    test_input = {
+        "EventType": "Security Hub Findings - Imported",
+        "Finding": {
+            "Id": "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1/finding/635ceb5d-3dfd-4458-804e-48a42cd723e4",
+            "ProductArn": "arn:aws:securityhub:us-east-1::product/aws/securityhub",
+            "GeneratorId": "aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1",
+            "AwsAccountId": "111111111111",
+            "ProductFields": {
+                "StandardsArn": "arn:aws:securityhub:::standards/aws-foundational-security-best-practices/v/1.0.0",
+                "StandardsSubscriptionArn": "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0",
+                "ControlId": "AutoScaling.1",
+                "StandardsControlArn": "arn:aws:securityhub:us-east-1:111111111111:control/aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1",
+                "aws/securityhub/ProductName": "Security Hub",
+            },
+            "Resources": [
+                {
+                    "Type": "AwsAccount",
+                    "Id": "arn:aws:autoscaling:us-east-1:111111111111:autoScalingGroup:785df3481e1-cd66-435d-96de-d6ed5416defd:autoScalingGroupName/sharr-test-autoscaling-1",
+                    "Partition": "aws",
+                    "Region": "us-east-1",
+                }
+            ],
+            "WorkflowState": "NEW",
+            "Workflow": {"Status": "NEW"},
+            "RecordState": "ACTIVE",
+        },
+    }
+
+    AWS = AWSCachedClient(get_region())
+    ssm_c = AWS.get_connection("ssm")
+
+    ssmc_stub = Stubber(ssm_c)
+    ssmc_stub.add_response(
+        "get_parameter",
+        {
+            "Parameter": {
+                "Name": "/Solutions/SO0111/aws-foundational-security-best-practices/1.0.0/shortname",
+                "Type": "String",
+                "Value": "AFSBP",
+                "Version": 1,
+                "LastModifiedDate": "2021-05-11T08:21:43.794000-04:00",
+                "ARN": "arn:aws:ssm:us-east-1:111111111111:parameter/Solutions/SO0111/aws-foundational-security-best-practices/1.0.0/shortname",
+                "DataType": "text",
+            }
+        },
+        {
+            "Name": "/Solutions/SO0111/aws-foundational-security-best-practices/1.0.0/shortname"
+        },
+    )
+    ssmc_stub.add_client_error("get_parameter", "ParameterNotFound")
+    ssmc_stub.add_response(
+        "get_parameter",
+        {
+            "Parameter": {
+                "Name": "/Solutions/SO0111/aws-foundational-security-best-practices/1.0.0",
+                "Type": "String",
+                "Value": "enabled",
+                "Version": 1,
+                "LastModifiedDate": "2021-05-11T08:21:44.632000-04:00",
+                "ARN": "arn:aws:ssm:us-east-1:111111111111:parameter/Solutions/SO0111/aws-foundational-security-best-practices/1.0.0",
+                "DataType": "text",
+            }
+        },
+    )
+
+    ssmc_stub.activate()
+    mocker.patch("check_ssm_doc_state._get_ssm_client", return_value=ssm_c)
+    mock_verdict = mocker.patch(
+        "check_ssm_doc_state.circuit_breaker.get_open_verdict",
+        return_value={
+            "status": "ACCESSDENIED",
+            "message": "Circuit breaker open for 111111111111#us-east-1#AutoScaling.1: Could not assume role",
+        },
+    )
+    mock_doc_state = mocker.patch("check_ssm_doc_state._add_doc_state_to_answer")
+
+    result = lambda_handler(test_input, create_lambda_context())
+
+    assert result["status"] == "ACCESSDENIED"
+    assert result["automationdocid"] == "ASR-AFSBP_1.0.0_AutoScaling.1"
+    mock_verdict.assert_called_once_with("111111111111", "us-east-1", "AutoScaling.1")
+    mock_doc_state.assert_not_called()
+
+    ssmc_stub.deactivate()
+
+
+def imported_finding_event(execution_id="execution-1"):
+    finding_id = "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1/finding/635ceb5d-3dfd-4458-804e-48a42cd723e4"
+    return {
+        "EventType": "Security Hub Findings - Imported",
+        "ExecutionId": execution_id,
+        "Finding": {
+            "Id": finding_id,
+            "GeneratorId": "aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1",
+            "AwsAccountId": "111111111111",
+            "ProductFields": {"aws/securityhub/ProductName": "Security Hub"},
+            "Resources": [{"Region": "us-east-1"}],
+        },
+        "ResolvedFinding": {
+            "finding_id": finding_id,
+            "standard_name": "aws-foundational-security-best-practices",
+            "standard_shortname": "AFSBP",
+            "standard_version": "1.0.0",
+            "standard_control": "AutoScaling.1",
+            "remediation_control": "AutoScaling.1",
+            "playbook_enabled": "True",
+            "account_id": "111111111111",
+            "resource_region": "us-east-1",
+        },
+    }
+
+
+def active_document():
+    return {"Document": {"DocumentType": "Automation", "Status": "Active"}}
+
+
+def test_duplicate_finding_event(mocker):
+    test_input = imported_finding_event()
+    mock_dedupe = mocker.patch(
+        "check_ssm_doc_state.finding_dedupe.is_duplicate", return_value=True
+    )
+    mock_ssm = mocker.patch("check_ssm_doc_state._get_ssm_client")
+
+    result = lambda_handler(test_input, create_lambda_context())
+
+    assert result["status"] == "DUPLICATE"
+    mock_dedupe.assert_called_once_with(test_input["Finding"], "execution-1")
+    mock_ssm.assert_not_called()
+
+
+def test_missing_document_forgets_finding_hash(mocker):
+    test_input = imported_finding_event()
+    mocker.patch("check_ssm_doc_state.finding_dedupe.is_duplicate", return_value=False)
+    mock_forget = mocker.patch("check_ssm_doc_state.finding_dedupe.forget")
+    mocker.patch(
+        "check_ssm_doc_state._get_ssm_client"
+    ).return_value.describe_document.side_effect = ClientError(
+        {"Error": {"Code": "InvalidDocument", "Message": "Not found"}},
+        "DescribeDocument",
+    )
+
+    result = lambda_handler(test_input, create_lambda_context())
+
+    assert result["status"] == "NOTFOUND"
+    mock_forget.assert_called_once_with(test_input["Finding"], "execution-1")
+
+
+@mock_aws
+def test_retry_in_the_same_execution_is_not_a_duplicate(mocker, monkeypatch):
+    table_name = "test-finding-dedupe-table"
+    monkeypatch.setenv("FINDING_DEDUPE_TABLE_NAME", table_name)
+    dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+    dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "findingId", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "findingId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    mocker.patch(
+        "layer.finding_dedupe.AWSCachedClient"
+    ).return_value.get_connection.return_value = dynamodb
+    mocker.patch(
+        "check_ssm_doc_state._get_ssm_client"
+    ).return_value.describe_document.side_effect = [
+        ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+            "DescribeDocument",
+        ),
+        active_document(),
+        active_document(),
+    ]
+    test_input = imported_finding_event()
+
+    # The throttled attempt raises so that Step Functions retries the task
+    with pytest.raises(ClientError):
+        lambda_handler(test_input, create_lambda_context())
+    retried = lambda_handler(test_input, create_lambda_context())
+    # The same event in a later execution is a duplicate
+    reemitted = lambda_handler(
+        imported_finding_event("execution-2"), create_lambda_context()
+    )
+
+    assert retried["status"] == "ACTIVE"
+    assert reemitted["status"] == "DUPLICATE"
+
+
+def test_remediation_cooldown(mocker):
+    test_input = {
+        "EventType": "Security Hub Findings - Imported",
+        "Finding": {
+            "Id": "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1/finding/635ceb5d-3dfd-4458-804e-48a42cd723e4",
+            "AwsAccountId": "111111111111",
+            "Resources": [{"Region": "us-east-1"}],
+        },
+    }
+    mocker.patch("check_ssm_doc_state.finding_dedupe.is_duplicate", return_value=False)
+    mocker.patch(
+        "check_ssm_doc_state.remediation_cooldown.get_active_cooldown",
+        return_value={"status": "COOLDOWN", "message": "Remediation cooldown active"},
+    )
+    mock_ssm = mocker.patch("check_ssm_doc_state._get_ssm_client")
+
+    result = lambda_handler(test_input, create_lambda_context())
+
+    assert result["status"] == "COOLDOWN"
+    mock_ssm.assert_not_called()
+
+
+def test_resolved_finding_skips_lookups(mocker):
+    finding_id = "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1/finding/635ceb5d-3dfd-4458-804e-48a42cd723e4"
+    test_input = {
+        "EventType": "Security Hub Findings - Custom Action",
+        "Finding": {
+            "Id": finding_id,
+            "GeneratorId": "aws-foundational-security-best-practices/v/1.0.0/AutoScaling.1",
+            "AwsAccountId": "111111111111",
+            "ProductFields": {"aws/securityhub/ProductName": "Security Hub"},
+            "Resources": [{"Region": "us-east-1"}],
+        },
+        "ResolvedFinding": {
+            "finding_id": finding_id,
+            "standard_name": "aws-foundational-security-best-practices",
+            "standard_shortname": "AFSBP",
+            "standard_version": "1.0.0",
+            "standard_control": "AutoScaling.1",
+            "remediation_control": "AutoScaling.1",
+            "playbook_enabled": "True",
+            "account_id": "111111111111",
+            "resource_region": "us-east-1",
+        },
+    }
+    mock_sechub_ssm = mocker.patch("layer.sechub_findings.get_ssm_connection")
+    mocker.patch(
+        "check_ssm_doc_state._get_ssm_client"
+    ).return_value.describe_document.return_value = {
+        "Document": {"DocumentType": "Automation", "Status": "Active"}
+    }
+
+    result = lambda_handler(test_input, create_lambda_context())
+
+    assert result["status"] == "ACTIVE"
+    assert result["automationdocid"] == "ASR-AFSBP_1.0.0_AutoScaling.1"
+    mock_sechub_ssm.assert_not_called()
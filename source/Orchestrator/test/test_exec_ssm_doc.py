@@ -1,5 +1,6 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import json
 from typing import Any
 
 import boto3
@@ -129,3 +130,67 @@ def test_exec_runbook(mocker):
     assert response["status"] == expected_result["status"]
     ssmc_stub.deactivate()
     iamc_stub.deactivate()
+
+
+def test_exec_runbook_resolves_claim_check(mocker):
+    """
+    Verifies the playbook receives the full finding when the state carries a claim
+    check
+    """
+    finding = {
+        "Id": "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0/EC2.19/finding/635ceb5d-3dfd-4458-804e-48a42cd723e4",
+        "AwsAccountId": "111111111111",
+        "Resources": [{"Id": "sg-1", "Region": "us-east-1", "Details": {}}],
+        "ProductFields": {},
+    }
+    step_input: dict[str, Any] = {
+        "EventType": "Security Hub Findings - Imported",
+        "Finding": {
+            "Id": finding["Id"],
+            "ClaimCheck": "claimcheck:execution#finding#Finding",
+        },
+        "AutomationDocument": {
+            "DocState": "ACTIVE",
+            "SecurityStandardVersion": "1.0.0",
+            "AccountId": "111111111111",
+            "AutomationDocId": "ASR-AFSBP_1.0.0_EC2.19",
+            "RemediationRole": "SO0111-Remediate-AFSBP-1.0.0-EC2.19",
+            "ControlId": "EC2.19",
+            "SecurityStandard": "AFSBP",
+            "PlaybookEnabled": "True",
+        },
+        "SSMExecution": {},
+    }
+    mock_resolve = mocker.patch(
+        "exec_ssm_doc.claim_check.resolve", return_value=finding
+    )
+
+    iam_c = boto3.client("iam")
+    iamc_stub = Stubber(iam_c)
+    iamc_stub.add_client_error("get_role", "NoSuchEntity")
+    iamc_stub.activate()
+
+    ssm_c = boto3.client("ssm")
+    ssmc_stub = Stubber(ssm_c)
+    ssmc_stub.add_response(
+        "start_automation_execution",
+        {"AutomationExecutionId": "43374019-a309-4627-b8a2-c641e0140262"},
+        {
+            "DocumentName": "ASR-AFSBP_1.0.0_EC2.19",
+            "Parameters": {
+                "Finding": [json.dumps(finding)],
+                "AutomationAssumeRole": [ANY],
+            },
+        },
+    )
+    ssmc_stub.activate()
+    mocker.patch("exec_ssm_doc._get_ssm_client", return_value=ssm_c)
+    mocker.patch("exec_ssm_doc._get_iam_client", return_value=iam_c)
+
+    response = lambda_handler(step_input, create_lambda_context())
+
+    assert response["status"] == "QUEUED"
+    mock_resolve.assert_called_once_with("claimcheck:execution#finding#Finding")
+    ssmc_stub.assert_no_pending_responses()
+    ssmc_stub.deactivate()
+    iamc_stub.deactivate()
@@ -242,6 +242,9 @@ def test_get_approval_req(mocker):
     assert response["workflowdoc"] == expected_result["workflowdoc"]
     assert response["workflowaccount"] == expected_result["workflowaccount"]
     assert response["workflowrole"] == expected_result["workflowrole"]
+    assert response["resolved_finding"]["finding_id"] == step_input()["Finding"]["Id"]
+    assert response["resolved_finding"]["standard_shortname"] == "AFSBP"
+    assert response["resolved_finding"]["playbook_enabled"] == "True"
 
     ssmc_stub.deactivate()
 
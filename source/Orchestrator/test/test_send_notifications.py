@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 import copy
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Any, cast
 
@@ -22,6 +23,7 @@ from layer.sechub_findings import (
 from layer.test.conftest import create_dynamodb_tables  # type: ignore[import-not-found]
 from moto import mock_aws
 from send_notifications import (
+    _run_side_effects,
     create_and_send_cloudwatch_metrics,
     lambda_handler,
     set_message_prefix_and_suffix,
@@ -143,6 +145,29 @@ def test_resolved(mocker):
     assert sharr_notification_stub.severity == "INFO"
 
 
+def test_records_circuit_breaker_outcome(mocker):
+    event = cast(Event, cast(object, copy.deepcopy(default_event)))
+    event["Notification"]["State"] = "ASSUME_ROLE_FAILURE"
+    setup(mocker)
+    mock_record = mocker.patch("send_notifications.circuit_breaker.record_outcome")
+
+    lambda_handler(event, {})
+
+    mock_record.assert_called_once_with(event, "ASSUME_ROLE_FAILURE")
+
+
+def test_starts_cooldown_on_success(mocker):
+    event = cast(Event, cast(object, copy.deepcopy(default_event)))
+    setup(mocker)
+    mock_cooldown = mocker.patch(
+        "send_notifications.remediation_cooldown.start_cooldown"
+    )
+
+    lambda_handler(event, {})
+
+    mock_cooldown.assert_called_once_with(event)
+
+
 def test_notification_with_ticketing(mocker):
     event = default_event
     event["GenerateTicket"] = {
@@ -270,7 +295,7 @@ def test_send_operational_metrics_with_event_type(mocker):
     setup_ssm_parameters()
     setup_dynamodb_tables()
 
-    mock_urlopen = mocker.patch("layer.metrics.urlopen")
+    mock_urlopen = mocker.patch("urllib.request.urlopen")
     sharr_notification_stub = setup(mocker)
 
     event = cast(Event, cast(object, copy.deepcopy(default_event)))
@@ -292,7 +317,7 @@ def test_send_operational_metrics_without_event_type(mocker):
     # ARRANGE
     setup_ssm_parameters()
     setup_dynamodb_tables()
-    mock_urlopen = mocker.patch("layer.metrics.urlopen")
+    mock_urlopen = mocker.patch("urllib.request.urlopen")
     sharr_notification_stub = setup(mocker)
 
     event = cast(Event, cast(object, copy.deepcopy(default_event)))
@@ -1035,6 +1060,19 @@ def test_lambda_handler_with_stepfunctions_failure_event(mocker):
     assert sharr_notification_stub.severity == "ERROR"
 
 
+def test_lambda_handler_scheduled_event_flushes_digests(mocker):
+    sharr_notification_stub = setup(mocker)
+    flush = mocker.patch("layer.notification_digest.flush")
+    mocker.patch("layer.notification_digest.is_enabled", return_value=True)
+
+    lambda_handler(
+        {"source": "aws.events", "detail-type": "Scheduled Event", "detail": {}}, {}
+    )
+
+    flush.assert_called_once_with()
+    sharr_notification_stub.notify.assert_not_called()
+
+
 @mock_aws
 def test_lambda_handler_queued_notification_creates_history_without_finding(mocker):
     setup_ssm_parameters()
@@ -1170,3 +1208,89 @@ def test_lambda_handler_queued_notification_updates_existing_history(mocker):
 
     metrics = cloudwatch_client.list_metrics(Namespace="ASR")
     assert len(metrics["Metrics"]) == 1
+
+
+def test_side_effect_failure_is_raised_after_others_complete():
+    completed = []
+
+    def fail():
+        raise RuntimeError("SNS unavailable")
+
+    with pytest.raises(RuntimeError, match="SNS unavailable"):
+        _run_side_effects(
+            {"notification": fail, "status": lambda: completed.append("status")},
+            None,
+        )
+
+    assert completed == ["status"]
+
+
+def test_side_effects_running_at_deadline_finish_before_return(mocker):
+    log_info = mocker.patch("send_notifications.logger.info")
+    completed = []
+
+    def slow_notification():
+        time.sleep(0.2)
+        completed.append("notification")
+
+    def slow_status():
+        time.sleep(0.2)
+        raise RuntimeError("status update failed")
+
+    with pytest.raises(RuntimeError, match="status update failed"):
+        _run_side_effects(
+            {
+                "notification": slow_notification,
+                "status": slow_status,
+                "metrics": lambda: None,
+            },
+            0.05,
+        )
+
+    assert completed == ["notification"]
+    extra = log_info.call_args.kwargs["extra"]
+    assert extra["failures"] == {"status": "status update failed"}
+    assert set(extra["durations_ms"]) == {"notification", "status", "metrics"}
+
+
+def test_side_effects_not_started_at_deadline_are_dropped(mocker):
+    mocker.patch("send_notifications.SIDE_EFFECT_WORKERS", 1)
+    log_info = mocker.patch("send_notifications.logger.info")
+    completed = []
+
+    _run_side_effects(
+        {
+            "notification": lambda: time.sleep(0.2),
+            "metrics": lambda: completed.append("metrics"),
+        },
+        0.05,
+    )
+
+    assert completed == []
+    extra = log_info.call_args.kwargs["extra"]
+    assert extra["failures"] == {"metrics": "DEADLINE_EXCEEDED"}
+    assert set(extra["durations_ms"]) == {"notification"}
+
+
+@mock_aws
+def test_status_is_updated_before_finding_is_resolved(mocker):
+    setup_ssm_parameters()
+    setup_dynamodb_tables()
+    setup(mocker)
+    mocker.patch("urllib.request.urlopen")
+    calls = []
+    mocker.patch(
+        "send_notifications._update_finding_remediation_status",
+        side_effect=lambda *_: calls.append("status"),
+    )
+    finding = mocker.Mock()
+    finding.resolve.side_effect = lambda _: calls.append("resolve")
+    mocker.patch(
+        "send_notifications.extract_finding_info", return_value=(finding, "info")
+    )
+    context = mocker.Mock()
+    context.get_remaining_time_in_millis.return_value = 60000
+
+    lambda_handler(copy.deepcopy(default_event), context)
+
+    assert calls == ["status", "resolve"]
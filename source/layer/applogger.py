@@ -1,10 +1,25 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-
+"""
+Buffered writer for the solution's CloudWatch Logs group.
+
+Handlers live for the lifetime of the execution environment: get_log_handler returns
+one LogHandler per log group and stream name, and the dated streams known to exist are
+cached so create_log_stream is only called for a new stream or on date rollover.
+Messages are buffered within an invocation and sent with put_log_events when the
+batch reaches the size (LOG_MAX_BATCH_SIZE) or event (LOG_MAX_BATCH_EVENTS) limits,
+when the oldest message is older than LOG_FLUSH_INTERVAL_SECONDS, and when a handler
+decorated with flush_on_exit returns. The buffer is not carried over to the next
+invocation: a frozen execution environment may be shut down without resuming, which
+would lose the messages. Batching therefore only combines the messages of a single
+invocation, and the interval only matters for long-running invocations.
+"""
+import functools
 import os
+import threading
 import time
 from datetime import date
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from botocore.exceptions import ClientError
 from layer import awsapi_cached_client
@@ -15,6 +30,16 @@ LOG_ENTRY_ADDITIONAL = 26
 DEFAULT_REGION = "us-east-1"
 DEFAULT_LOG_GROUP = "SO0111-ASR"
 MAX_CREATE_STREAM_RETRIES = 3  # Maximum number of recursive attempts
+LOG_MAX_BATCH_EVENTS = 10000
+
+_log_handlers: Dict[Tuple[str, str], "LogHandler"] = {}
+# (log group, dated stream) pairs created or found to exist
+_known_streams: Set[Tuple[str, str]] = set()
+_registry_lock = threading.Lock()
+
+
+def get_flush_interval_seconds() -> float:
+    return float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "5"))
 
 
 def get_logs_connection(apiclient):
@@ -34,6 +59,7 @@ class LogHandler:
         self.log_group = os.getenv("SOLUTION_LOGGROUP", DEFAULT_LOG_GROUP)
         self._buffer: List[Tuple[int, str]] = []
         self._buffer_size: int = 0
+        self._buffer_started: float = 0
         self._current_stream: Optional[str] = None
         self.logs_client = get_logs_connection(self.apiclient)
 
@@ -54,6 +80,10 @@ class LogHandler:
         if self._current_stream == dated_stream:
             return dated_stream
 
+        if (self.log_group, dated_stream) in _known_streams:
+            self._current_stream = dated_stream
+            return dated_stream
+
         self._current_stream = dated_stream
 
         while retry_count <= MAX_CREATE_STREAM_RETRIES:
@@ -61,12 +91,14 @@ class LogHandler:
                 self.logs_client.create_log_stream(
                     logGroupName=self.log_group, logStreamName=dated_stream
                 )
+                _known_streams.add((self.log_group, dated_stream))
                 return dated_stream
 
             except ClientError as e:
                 error_code = e.response["Error"]["Code"]
 
                 if error_code == "ResourceAlreadyExistsException":
+                    _known_streams.add((self.log_group, dated_stream))
                     return dated_stream
 
                 if error_code == "ResourceNotFoundException":
@@ -89,12 +121,25 @@ class LogHandler:
         timestamp = int(time.time() * 1000)
         message_size = len(message) + LOG_ENTRY_ADDITIONAL
 
-        if self._buffer_size + message_size > LOG_MAX_BATCH_SIZE:
+        if (
+            self._buffer_size + message_size > LOG_MAX_BATCH_SIZE
+            or len(self._buffer) >= LOG_MAX_BATCH_EVENTS
+        ):
             self.flush()
 
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
         self._buffer.append((timestamp, message))
         self._buffer_size += message_size
 
+    def flush_if_due(self) -> None:
+        """Flush when the oldest buffered message is older than the flush interval"""
+        if (
+            self._buffer
+            and time.monotonic() - self._buffer_started >= get_flush_interval_seconds()
+        ):
+            self.flush()
+
     def flush(self) -> None:
         if not self._buffer:
             return
@@ -118,3 +163,45 @@ class LogHandler:
     def clear(self) -> None:
         self._buffer = []
         self._buffer_size = 0
+
+
+def get_log_handler(stream_name: str) -> LogHandler:
+    """Return the handler for stream_name, creating it on first use"""
+    key = (os.getenv("SOLUTION_LOGGROUP", DEFAULT_LOG_GROUP), stream_name.upper())
+    with _registry_lock:
+        if key not in _log_handlers:
+            _log_handlers[key] = LogHandler(stream_name)
+        return _log_handlers[key]
+
+
+def flush_all() -> None:
+    with _registry_lock:
+        handlers = list(_log_handlers.values())
+    for handler in handlers:
+        try:
+            handler.flush()
+        except Exception as e:
+            print(f"Error flushing log stream {handler.stream_name}: {str(e)}")
+
+
+def clear_log_handlers() -> None:
+    """Discard the handlers and known streams"""
+    with _registry_lock:
+        _log_handlers.clear()
+        _known_streams.clear()
+
+
+def flush_on_exit(lambda_handler: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorator that flushes every handler when the Lambda handler returns or raises,
+    so that no messages are left buffered while the execution environment is frozen
+    """
+
+    @functools.wraps(lambda_handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return lambda_handler(*args, **kwargs)
+        finally:
+            flush_all()
+
+    return wrapper
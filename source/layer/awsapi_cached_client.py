@@ -1,6 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import os
+import threading
 from typing import TYPE_CHECKING, Any, Final, Optional
 
 import boto3
@@ -21,6 +22,8 @@ class AWSCachedClient:
     account: Optional[str] = ""
     region: Optional[str] = ""
     client: dict[str, Any] = {}
+    # Handlers may connect from several threads; creating boto3 clients is not thread safe
+    _lock = threading.Lock()
     solution_id = ""
     solution_version = "undefined"
 
@@ -45,13 +48,14 @@ class AWSCachedClient:
         if not region:
             region = self.region
 
-        if service not in self.client:
-            self.client[service] = {}
+        with self._lock:
+            if service not in self.client:
+                self.client[service] = {}
 
-        if region not in self.client[service]:
-            self.client[service][region] = boto3.client(
-                service, region_name=region, config=self.boto_config
-            )
+            if region not in self.client[service]:
+                self.client[service][region] = boto3.client(
+                    service, region_name=region, config=self.boto_config
+                )
 
         return self.client[service][region]
 
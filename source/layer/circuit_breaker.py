@@ -0,0 +1,377 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Failure-rate circuit breaker keyed by (account, region, control).
+
+send_notifications records the outcome of every remediation. When the same
+account/region/control keeps failing for reasons that will not fix themselves
+(member account not onboarded, runbook missing or inactive) the breaker opens and
+check_ssm_doc_state replays the cached verdict instead of assuming a role and
+describing the document again. After CIRCUIT_BREAKER_OPEN_SECONDS a single
+execution is let through as a half-open probe; its outcome closes or re-opens the
+breaker. A probe whose remediation fails for any other reason (the runbook failed,
+timed out or was cancelled) re-opens the breaker with the cached verdict.
+
+The breaker is disabled when CIRCUIT_BREAKER_TABLE_NAME is not set. Any error
+talking to the table fails open so remediations are never blocked by the breaker
+itself.
+"""
+import os
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from botocore.exceptions import ClientError
+from layer.awsapi_cached_client import AWSCachedClient
+from layer.cloudwatch_metrics import CloudWatchMetrics
+from layer.powertools_logger import get_logger
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+logger = get_logger("circuit_breaker")
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+BREAKER_KEY = "breakerKey"
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+# Notification states that mean the target cannot currently be remediated, mapped
+# to the check_ssm_doc_state status that is replayed while the breaker is open
+FAILURE_STATE_TO_DOC_STATE = {
+    "ASSUME_ROLE_FAILURE": "ACCESSDENIED",
+    "NO_RUNBOOK": "NOTFOUND",
+    "RUNBOOK_NOT_ACTIVE": "NOTACTIVE",
+}
+
+# Notification states that prove the target can be remediated
+SUCCESS_STATES = ("SUCCESS", "QUEUED")
+
+# Notification states of a remediation that ran and did not succeed. They are not
+# counted toward opening the breaker, but a half-open probe that ends in one fails.
+PROBE_FAILURE_STATES = ("FAILED", "TIMEDOUT", "CANCELLING", "CANCELLED", "LAMBDA_ERROR")
+
+
+def get_table_name() -> str:
+    return os.getenv("CIRCUIT_BREAKER_TABLE_NAME", "")
+
+
+def is_enabled() -> bool:
+    return bool(get_table_name())
+
+
+def get_failure_threshold() -> int:
+    return int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5"))
+
+
+def get_window_seconds() -> int:
+    return int(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", "900"))
+
+
+def get_open_seconds() -> int:
+    return int(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "1800"))
+
+
+def build_breaker_key(account_id: str, region: str, control_id: str) -> str:
+    return f"{account_id}#{region}#{control_id}"
+
+
+def breaker_key_from_event(event: dict[str, Any]) -> Optional[str]:
+    """
+    Derive the breaker key from a send_notifications event. Depending on the
+    Orchestrator state that produced the notification, the account and control
+    are either top-level or nested under AutomationDocument.
+    """
+    finding = event.get("Finding", {}) or {}
+    automation_doc = event.get("AutomationDocument", {}) or {}
+    resources = finding.get("Resources", []) or [{}]
+
+    account_id = (
+        event.get("AccountId")
+        or automation_doc.get("AccountId")
+        or finding.get("AwsAccountId")
+    )
+    region = automation_doc.get("ResourceRegion") or resources[0].get("Region")
+    control_id = event.get("ControlId") or automation_doc.get("ControlId")
+
+    if not account_id or not region or not control_id:
+        return None
+    return build_breaker_key(account_id, region, control_id)
+
+
+def _get_dynamodb() -> "DynamoDBClient":
+    return AWSCachedClient(AWS_REGION).get_connection("dynamodb")  # type: ignore[no-any-return]
+
+
+def _send_breaker_metric(state: str) -> None:
+    try:
+        CloudWatchMetrics().send_metric(
+            {
+                "MetricName": "CircuitBreaker",
+                "Dimensions": [{"Name": "State", "Value": state}],
+                "Unit": "Count",
+                "Value": 1,
+            }
+        )
+    except Exception:
+        logger.debug("Did not send circuit breaker metric")
+
+
+def _is_conditional_check_failure(error: ClientError) -> bool:
+    return error.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def _short_circuit_verdict(item: dict[str, Any], key: str) -> dict[str, str]:
+    verdict_status = item.get("verdictStatus", {}).get("S", "ERROR")
+    verdict_message = item.get("verdictMessage", {}).get("S", "")
+    logger.info(
+        "Circuit breaker open, replaying cached verdict",
+        breakerKey=key,
+        verdictStatus=verdict_status,
+    )
+    _send_breaker_metric("ShortCircuited")
+    return {
+        "status": verdict_status,
+        "message": f"Circuit breaker open for {key}: {verdict_message}",
+    }
+
+
+def _try_start_probe(
+    dynamodb: "DynamoDBClient", key: str, guard_attribute: str, guard_value: str
+) -> bool:
+    """
+    Move the breaker to HALF_OPEN and claim the probe. The condition on the
+    attribute last written by the previous transition guarantees a single winner
+    when several executions see the expired breaker at once.
+    """
+    try:
+        dynamodb.update_item(
+            TableName=get_table_name(),
+            Key={BREAKER_KEY: {"S": key}},
+            UpdateExpression="SET breakerState = :half, probeStartedAt = :now",
+            ConditionExpression=f"{guard_attribute} = :guard",
+            ExpressionAttributeValues={
+                ":half": {"S": HALF_OPEN},
+                ":now": {"N": str(int(time.time()))},
+                ":guard": {"N": guard_value},
+            },
+        )
+    except ClientError as e:
+        if _is_conditional_check_failure(e):
+            return False
+        raise
+
+    logger.info("Circuit breaker half-open, allowing probe", breakerKey=key)
+    _send_breaker_metric("HalfOpen")
+    return True
+
+
+def get_open_verdict(
+    account_id: str, region: str, control_id: str
+) -> Optional[dict[str, str]]:
+    """
+    Returns the cached check_ssm_doc_state verdict ({"status", "message"}) when the
+    breaker for this target is open, or None when the execution should proceed.
+    """
+    if not is_enabled():
+        return None
+
+    key = build_breaker_key(account_id, region, control_id)
+    try:
+        dynamodb = _get_dynamodb()
+        item = dynamodb.get_item(
+            TableName=get_table_name(), Key={BREAKER_KEY: {"S": key}}
+        ).get("Item")
+        if not item:
+            return None
+
+        state = item.get("breakerState", {}).get("S", CLOSED)
+        now = int(time.time())
+
+        if state == OPEN:
+            opened_at = item.get("openedAt", {}).get("N", "0")
+            if now - int(opened_at) < get_open_seconds():
+                return _short_circuit_verdict(item, key)
+            if _try_start_probe(dynamodb, key, "openedAt", opened_at):
+                return None
+            return _short_circuit_verdict(item, key)
+
+        if state == HALF_OPEN:
+            # A probe that never reported back must not hold the breaker forever
+            probe_started_at = item.get("probeStartedAt", {}).get("N", "0")
+            if now - int(probe_started_at) < get_open_seconds():
+                return _short_circuit_verdict(item, key)
+            if _try_start_probe(dynamodb, key, "probeStartedAt", probe_started_at):
+                return None
+            return _short_circuit_verdict(item, key)
+
+        return None
+
+    except Exception as e:
+        logger.warning(
+            "Circuit breaker check failed, allowing execution",
+            breakerKey=key,
+            error=str(e),
+        )
+        return None
+
+
+def _record_success(dynamodb: "DynamoDBClient", key: str) -> None:
+    try:
+        dynamodb.update_item(
+            TableName=get_table_name(),
+            Key={BREAKER_KEY: {"S": key}},
+            UpdateExpression="SET breakerState = :closed, failureCount = :zero REMOVE openedAt, probeStartedAt",
+            ConditionExpression="breakerState <> :closed OR failureCount > :zero",
+            ExpressionAttributeValues={
+                ":closed": {"S": CLOSED},
+                ":zero": {"N": "0"},
+            },
+        )
+    except ClientError as e:
+        # Nothing to reset: no record, or already closed with no failures
+        if _is_conditional_check_failure(e):
+            return
+        raise
+
+    logger.info("Circuit breaker closed", breakerKey=key)
+    _send_breaker_metric("Closed")
+
+
+def _record_failure(
+    dynamodb: "DynamoDBClient", key: str, doc_state: str, message: str
+) -> None:
+    now = int(time.time())
+    window_seconds = get_window_seconds()
+    values = {
+        ":one": {"N": "1"},
+        ":zero": {"N": "0"},
+        ":now": {"N": str(now)},
+        ":status": {"S": doc_state},
+        ":message": {"S": message or doc_state},
+        ":exp": {"N": str(now + window_seconds + get_open_seconds() * 2)},
+    }
+    set_common = "verdictStatus = :status, verdictMessage = :message, lastFailureAt = :now, expireAt = :exp"
+
+    try:
+        # Count the failure in the current window
+        attributes = dynamodb.update_item(
+            TableName=get_table_name(),
+            Key={BREAKER_KEY: {"S": key}},
+            UpdateExpression=f"SET failureCount = if_not_exists(failureCount, :zero) + :one, windowStart = if_not_exists(windowStart, :now), {set_common}",
+            ConditionExpression="attribute_not_exists(windowStart) OR windowStart >= :floor",
+            ExpressionAttributeValues={
+                **values,
+                ":floor": {"N": str(now - window_seconds)},
+            },
+            ReturnValues="ALL_NEW",
+        )["Attributes"]
+    except ClientError as e:
+        if not _is_conditional_check_failure(e):
+            raise
+        # The window expired, start a new one with this failure
+        attributes = dynamodb.update_item(
+            TableName=get_table_name(),
+            Key={BREAKER_KEY: {"S": key}},
+            UpdateExpression=f"SET failureCount = :one, windowStart = :now, {set_common}",
+            ExpressionAttributeValues={k: v for k, v in values.items() if k != ":zero"},
+            ReturnValues="ALL_NEW",
+        )["Attributes"]
+
+    state = attributes.get("breakerState", {}).get("S", CLOSED)
+    failure_count = int(attributes["failureCount"]["N"])
+
+    should_open = state == HALF_OPEN or (
+        state == CLOSED and failure_count >= get_failure_threshold()
+    )
+    if not should_open:
+        return
+
+    dynamodb.update_item(
+        TableName=get_table_name(),
+        Key={BREAKER_KEY: {"S": key}},
+        UpdateExpression="SET breakerState = :open, openedAt = :now REMOVE probeStartedAt",
+        ExpressionAttributeValues={
+            ":open": {"S": OPEN},
+            ":now": {"N": str(now)},
+        },
+    )
+    logger.warning(
+        "Circuit breaker opened",
+        breakerKey=key,
+        previousState=state,
+        failureCount=failure_count,
+        verdictStatus=doc_state,
+    )
+    _send_breaker_metric("Opened")
+
+
+def _record_failed_probe(dynamodb: "DynamoDBClient", key: str) -> None:
+    try:
+        dynamodb.update_item(
+            TableName=get_table_name(),
+            Key={BREAKER_KEY: {"S": key}},
+            UpdateExpression="SET breakerState = :open, openedAt = :now REMOVE probeStartedAt",
+            ConditionExpression="breakerState = :half",
+            ExpressionAttributeValues={
+                ":open": {"S": OPEN},
+                ":half": {"S": HALF_OPEN},
+                ":now": {"N": str(int(time.time()))},
+            },
+        )
+    except ClientError as e:
+        # No probe in progress
+        if _is_conditional_check_failure(e):
+            return
+        raise
+
+    logger.warning("Circuit breaker probe failed, re-opened", breakerKey=key)
+    _send_breaker_metric("Opened")
+
+
+def record_outcome(event: dict[str, Any], notification_state: str) -> None:
+    """
+    Record the outcome of a remediation for the breaker of the event's target.
+    Failed remediations only re-open a half-open breaker; other states that are
+    neither a success nor a breaker-worthy failure are ignored.
+    """
+    if not is_enabled():
+        return
+
+    state = notification_state.upper()
+    if (
+        state not in SUCCESS_STATES
+        and state not in FAILURE_STATE_TO_DOC_STATE
+        and state not in PROBE_FAILURE_STATES
+    ):
+        return
+
+    key = breaker_key_from_event(event)
+    if not key:
+        logger.debug("Could not derive circuit breaker key from event")
+        return
+
+    try:
+        dynamodb = _get_dynamodb()
+        if state in SUCCESS_STATES:
+            _record_success(dynamodb, key)
+        elif state in PROBE_FAILURE_STATES:
+            _record_failed_probe(dynamodb, key)
+        else:
+            _record_failure(
+                dynamodb,
+                key,
+                FAILURE_STATE_TO_DOC_STATE[state],
+                event.get("Notification", {}).get("Message", ""),
+            )
+    except Exception as e:
+        logger.warning(
+            "Failed to record circuit breaker outcome",
+            breakerKey=key,
+            state=state,
+            error=str(e),
+        )
@@ -0,0 +1,210 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Claim-check storage for large Orchestrator state.
+
+Every Step Functions state carries the finding, and the monitor adds the runbook log
+and output. When one of these is larger than CLAIM_CHECK_THRESHOLD_BYTES it is stored
+compressed in the CLAIM_CHECK_TABLE_NAME table, keyed by execution ID, and only a
+reference travels through the state machine:
+
+- a finding is replaced by a compact copy holding the fields the Orchestrator reads,
+  with the reference in its ClaimCheck field
+- an output string is replaced by the reference itself
+
+Lambdas resolve a reference only where the full value is needed, e.g. exec_ssm_doc
+passing the finding to the playbook. Claim check is disabled when the table name is
+not set, and storing falls back to passing the full value on any table error.
+"""
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from layer.awsapi_cached_client import AWSCachedClient
+from layer.powertools_logger import get_logger
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+logger = get_logger("claim_check")
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+CLAIM_KEY = "claimKey"
+CLAIM_CHECK_FIELD = "ClaimCheck"
+REFERENCE_PREFIX = "claimcheck:"
+
+# Top-level finding fields read by the Orchestrator Lambdas and state machine
+FINDING_FIELDS = [
+    "SchemaVersion",
+    "Id",
+    "ProductArn",
+    "ProductName",
+    "CompanyName",
+    "GeneratorId",
+    "AwsAccountId",
+    "Region",
+    "Types",
+    "CreatedAt",
+    "UpdatedAt",
+    "Title",
+    "Description",
+    "Severity",
+    "Remediation",
+    "Compliance",
+    "Workflow",
+    "WorkflowState",
+    "RecordState",
+]
+RESOURCE_FIELDS = ["Id", "Type", "Partition", "Region"]
+PRODUCT_FIELDS = [
+    "StandardsArn",
+    "StandardsControlArn",
+    "StandardsGuideArn",
+    "ControlId",
+    "RuleId",
+    "Resources:0/Id",
+    "aws/securityhub/FindingId",
+    "aws/securityhub/ProductName",
+    "aws/securityhub/CompanyName",
+]
+
+
+def get_table_name() -> str:
+    return os.getenv("CLAIM_CHECK_TABLE_NAME", "")
+
+
+def is_enabled() -> bool:
+    return bool(get_table_name())
+
+
+def get_threshold_bytes() -> int:
+    return int(os.getenv("CLAIM_CHECK_THRESHOLD_BYTES", "32768"))
+
+
+def get_ttl_seconds() -> int:
+    # Long enough to outlive scheduled and long-running remediations
+    return int(os.getenv("CLAIM_CHECK_TTL_SECONDS", str(14 * 24 * 3600)))
+
+
+def _get_dynamodb() -> "DynamoDBClient":
+    return AWSCachedClient(AWS_REGION).get_connection("dynamodb")  # type: ignore[no-any-return]
+
+
+def is_reference(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(REFERENCE_PREFIX)
+
+
+def check_out(key: str, value: Any) -> Any:
+    """
+    Store value under key when it is over the size threshold and return a reference
+    to it. Small values, and all values when claim check is disabled, are returned
+    unchanged.
+    """
+    if not is_enabled() or is_reference(value):
+        return value
+
+    serialized = json.dumps(value, default=str)
+    if len(serialized.encode("utf-8")) <= get_threshold_bytes():
+        return value
+
+    try:
+        _get_dynamodb().put_item(
+            TableName=get_table_name(),
+            Item={
+                CLAIM_KEY: {"S": key},
+                "payload": {"B": zlib.compress(serialized.encode("utf-8"))},
+                "expireAt": {"N": str(int(time.time()) + get_ttl_seconds())},
+            },
+        )
+    except Exception as e:
+        logger.warning(
+            "Failed to store claim check, passing full value",
+            claimKey=key,
+            error=str(e),
+        )
+        return value
+
+    return REFERENCE_PREFIX + key
+
+
+def resolve(value: Any) -> Any:
+    """Return the stored value for a reference, or value when it is not a reference"""
+    if not is_reference(value):
+        return value
+
+    key = value[len(REFERENCE_PREFIX) :]
+    item = (
+        _get_dynamodb()
+        .get_item(
+            TableName=get_table_name(),
+            Key={CLAIM_KEY: {"S": key}},
+            ConsistentRead=True,
+        )
+        .get("Item")
+    )
+    if not item:
+        raise KeyError(f"Claim check {key} not found")
+
+    return json.loads(zlib.decompress(item["payload"]["B"]))
+
+
+def compact_finding(finding: dict[str, Any]) -> dict[str, Any]:
+    """Copy of the finding with only the fields the Orchestrator reads"""
+    compact = {field: finding[field] for field in FINDING_FIELDS if field in finding}
+    compact["Resources"] = [
+        {field: resource[field] for field in RESOURCE_FIELDS if field in resource}
+        for resource in finding.get("Resources", [])
+    ]
+    product_fields = finding.get("ProductFields", {})
+    compact["ProductFields"] = {
+        field: product_fields[field]
+        for field in PRODUCT_FIELDS
+        if field in product_fields
+    }
+    return compact
+
+
+def finding_claim_key(execution_id: str, finding: dict[str, Any]) -> str:
+    # A Step Functions execution processes every finding in the event
+    finding_hash = hashlib.sha256(finding.get("Id", "").encode("utf-8")).hexdigest()
+    return f"{execution_id}#{finding_hash[:16]}#Finding"
+
+
+def check_out_finding(event: dict[str, Any]) -> dict[str, Any]:
+    """
+    Returns the finding to carry through the state machine: a compact copy with a
+    claim check reference when the finding is large, otherwise the finding itself.
+    """
+    finding: dict[str, Any] = event.get("Finding", {})
+    if not is_enabled() or CLAIM_CHECK_FIELD in finding:
+        return finding
+
+    execution_id = event.get("ExecutionId", "")
+    if not execution_id:
+        return finding
+
+    reference = check_out(finding_claim_key(execution_id, finding), finding)
+    if not is_reference(reference):
+        return finding
+
+    compact = compact_finding(finding)
+    compact[CLAIM_CHECK_FIELD] = reference
+    return compact
+
+
+def resolve_finding(event: dict[str, Any]) -> dict[str, Any]:
+    """
+    Replace a compact finding in the event with the full finding and return it.
+    """
+    finding: dict[str, Any] = event.get("Finding", {})
+    if CLAIM_CHECK_FIELD not in finding:
+        return finding
+
+    event["Finding"] = resolve(finding[CLAIM_CHECK_FIELD])
+    return event["Finding"]  # type: ignore[no-any-return]
@@ -1,9 +1,25 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+"""
+CloudWatch metrics for the Orchestrator.
+
+CLOUDWATCH_METRICS_MODE controls how send_metric delivers a metric:
+
+- api (default): one synchronous put_metric_data call per metric
+- emf: written to stdout as an Embedded Metric Format log line by Powertools
+  EphemeralMetrics, which CloudWatch extracts into the same namespace and dimensions
+  without any API call
+- buffered: aggregated in memory into StatisticValues per metric and dimension set,
+  and sent by flush_metrics in put_metric_data batches. Handlers decorated with
+  flush_metrics_on_exit flush when they return. The buffer is shared by the threads
+  of an invocation, so it is only read and written under _metric_buffer_lock.
+"""
+import functools
 import os
-from typing import TYPE_CHECKING, Any, cast
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, cast
 
-import boto3
+from aws_lambda_powertools.metrics import EphemeralMetrics
 from layer.powertools_logger import get_logger
 
 if TYPE_CHECKING:
@@ -11,7 +27,7 @@ if TYPE_CHECKING:
 else:
     CloudWatchClient = object
 
-from layer import awsapi_cached_client
+from layer import metrics_context
 
 if TYPE_CHECKING:
     from mypy_boto3_ssm.client import SSMClient
@@ -22,16 +38,127 @@ else:
 LOG_LEVEL = os.getenv("log_level", "info")
 LOGGER = get_logger("cloudwatch_metrics", LOG_LEVEL)
 
+MODE_API = "api"
+MODE_EMF = "emf"
+MODE_BUFFERED = "buffered"
+
+# PutMetricData accepts at most 1000 metrics per request
+MAX_METRICS_PER_REQUEST = 1000
+
+# (namespace, metric name, unit, dimensions) -> StatisticValues
+_metric_buffer: dict[Tuple[str, str, str, Tuple[Tuple[str, str], ...]], Any] = {}
+_metric_buffer_lock = threading.Lock()
+
+
+def get_metrics_mode() -> str:
+    mode = os.getenv("CLOUDWATCH_METRICS_MODE", MODE_API).lower()
+    if mode not in (MODE_API, MODE_EMF, MODE_BUFFERED):
+        return MODE_API
+    return mode
+
+
+def emit_emf(metric: Any, namespace: str) -> None:
+    """Write a put_metric_data metric datum to stdout in Embedded Metric Format"""
+    # An empty service keeps POWERTOOLS_SERVICE_NAME out of the dimensions, so that
+    # the metric matches the one put_metric_data would have sent
+    emf_metrics = EphemeralMetrics(namespace=namespace, service="")
+    for dimension in metric.get("Dimensions", []):
+        emf_metrics.add_dimension(name=dimension["Name"], value=dimension["Value"])
+    emf_metrics.add_metric(
+        name=metric["MetricName"],
+        unit=metric.get("Unit", "None"),
+        value=metric.get("Value", 1),
+    )
+    emf_metrics.flush_metrics()
+
+
+def buffer_metric(metric: Any, namespace: str) -> None:
+    key = (
+        namespace,
+        metric["MetricName"],
+        metric.get("Unit", "None"),
+        tuple(
+            (dimension["Name"], dimension["Value"])
+            for dimension in metric.get("Dimensions", [])
+        ),
+    )
+    value = metric.get("Value", 1)
+    with _metric_buffer_lock:
+        statistics = _metric_buffer.get(key)
+        if statistics is None:
+            _metric_buffer[key] = {
+                "SampleCount": 1,
+                "Sum": value,
+                "Minimum": value,
+                "Maximum": value,
+            }
+            return
+        statistics["SampleCount"] += 1
+        statistics["Sum"] += value
+        statistics["Minimum"] = min(statistics["Minimum"], value)
+        statistics["Maximum"] = max(statistics["Maximum"], value)
+
+
+def flush_metrics() -> None:
+    """Send the buffered metrics, one put_metric_data call per batch and namespace"""
+    global _metric_buffer
+    with _metric_buffer_lock:
+        buffered, _metric_buffer = _metric_buffer, {}
+    if not buffered:
+        return
+
+    metric_data: dict[str, list[Any]] = {}
+    for (namespace, name, unit, dimensions), statistics in buffered.items():
+        metric_data.setdefault(namespace, []).append(
+            {
+                "MetricName": name,
+                "Dimensions": [
+                    {"Name": dimension_name, "Value": dimension_value}
+                    for dimension_name, dimension_value in dimensions
+                ],
+                "Unit": unit,
+                "StatisticValues": statistics,
+            }
+        )
+
+    try:
+        cloudwatch_client = metrics_context.get_connection("cloudwatch")
+        for namespace, data in metric_data.items():
+            for start in range(0, len(data), MAX_METRICS_PER_REQUEST):
+                cloudwatch_client.put_metric_data(
+                    MetricData=data[start : start + MAX_METRICS_PER_REQUEST],
+                    Namespace=namespace,
+                )
+    except Exception as exception:
+        print(f"Could not flush cloudwatch metrics: {str(exception)}")
+
+
+def flush_metrics_on_exit(lambda_handler: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator that flushes buffered metrics when the handler returns or raises"""
+
+    @functools.wraps(lambda_handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return lambda_handler(*args, **kwargs)
+        finally:
+            flush_metrics()
+
+    return wrapper
+
 
 class CloudWatchMetrics:
     namespace = "ASR"
+    send_cloudwatch_metrics_parm = "/Solutions/SO0111/sendCloudwatchMetrics"
 
     def __init__(self):
         try:
-            self.session = boto3.session.Session()
-            self.region = self.session.region_name
             self.ssm_client = self.init_ssm_client()
-            self.metrics_enabled = self.send_cloudwatch_metrics_enabled()
+            self.metrics_enabled = bool(
+                metrics_context.get_cached_value(
+                    self.send_cloudwatch_metrics_parm,
+                    self._read_send_cloudwatch_metrics,
+                )
+            )
             if not self.metrics_enabled:
                 return
 
@@ -42,10 +169,14 @@ class CloudWatchMetrics:
             LOGGER.error("Could not initialize metrics")
             raise
 
-    def send_cloudwatch_metrics_enabled(self):
+    def send_cloudwatch_metrics_enabled(self) -> bool:
+        return bool(self._read_send_cloudwatch_metrics())
+
+    def _read_send_cloudwatch_metrics(self) -> Optional[bool]:
+        """Whether the parameter enables metrics, or None if it could not be read"""
         is_enabled = False  # default value
         try:
-            ssm_parm = "/Solutions/SO0111/sendCloudwatchMetrics"
+            ssm_parm = self.send_cloudwatch_metrics_parm
             send_cloudwatch_metrics_from_ssm = (
                 self.ssm_client.get_parameter(Name=ssm_parm)  # type: ignore[union-attr]
                 .get("Parameter")
@@ -64,14 +195,13 @@ class CloudWatchMetrics:
 
         except Exception as e:
             print(e)
+            return None
 
         return is_enabled
 
     def init_ssm_client(self) -> SSMClient:
         try:
-            new_ssm_client = awsapi_cached_client.AWSCachedClient(
-                self.region
-            ).get_connection("ssm")
+            new_ssm_client = metrics_context.get_connection("ssm")
             return cast(SSMClient, new_ssm_client)
 
         except Exception as e:
@@ -80,9 +210,7 @@ class CloudWatchMetrics:
 
     def init_cloudwatch_client(self) -> CloudWatchClient:
         try:
-            new_cloudwatch_client = awsapi_cached_client.AWSCachedClient(
-                self.region
-            ).get_connection("cloudwatch")
+            new_cloudwatch_client = metrics_context.get_connection("cloudwatch")
             return cast(CloudWatchClient, new_cloudwatch_client)
         except Exception as e:
             print(f"Could not connect to cloudwatch: {str(e)}")
@@ -90,7 +218,16 @@ class CloudWatchMetrics:
 
     def send_metric(self, metric: Any) -> None:
         try:
-            if metric is None or not self.metrics_enabled or not self.cloudwatch_client:
+            if metric is None or not self.metrics_enabled:
+                return
+            mode = get_metrics_mode()
+            if mode == MODE_EMF:
+                emit_emf(metric, self.namespace)
+                return
+            if not self.cloudwatch_client:
+                return
+            if mode == MODE_BUFFERED:
+                buffer_metric(metric, self.namespace)
                 return
             self.cloudwatch_client.put_metric_data(
                 MetricData=[metric],
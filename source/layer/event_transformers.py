@@ -29,6 +29,7 @@ class GenerateTicket(TypedDict):
 class Event(TypedDict):
     Notification: Notification
     Finding: dict[str, Any]
+    ResolvedFinding: NotRequired[dict[str, Any]]
     EventType: NotRequired[str]
     GenerateTicket: NotRequired[GenerateTicket]
     CustomActionName: NotRequired[str]
@@ -0,0 +1,173 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Dedupe gate for re-emitted "Security Hub Findings - Imported" events.
+
+Security Hub re-emits a finding whenever any of its fields changes, and each event
+starts a new Orchestrator execution. The gate stores a hash of the fields that matter
+for remediation, keyed by finding ID, with a single conditional put. An event whose
+hash matches the unexpired stored hash of another Orchestrator execution is a
+duplicate. check_ssm_doc_state applies the gate before its other checks. The stored
+execution ID lets a Step Functions retry of that task through, and the hash is
+forgotten when the checks do not let the remediation go ahead.
+
+The hashed fields are dotted paths into the finding (list elements by index) and can
+be overridden with FINDING_DEDUPE_FIELDS. The gate is disabled when
+FINDING_DEDUPE_TABLE_NAME is not set, and fails open on any table error.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from botocore.exceptions import ClientError
+from layer.awsapi_cached_client import AWSCachedClient
+from layer.cloudwatch_metrics import CloudWatchMetrics
+from layer.powertools_logger import get_logger
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+logger = get_logger("finding_dedupe")
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+FINDING_ID_KEY = "findingId"
+
+DEFAULT_DEDUPE_FIELDS = (
+    "Compliance.Status,RecordState,Workflow.Status,Severity.Label,Resources.0.Id"
+)
+
+
+def get_table_name() -> str:
+    return os.getenv("FINDING_DEDUPE_TABLE_NAME", "")
+
+
+def is_enabled() -> bool:
+    return bool(get_table_name())
+
+
+def get_ttl_seconds() -> int:
+    return int(os.getenv("FINDING_DEDUPE_TTL_SECONDS", "3600"))
+
+
+def get_dedupe_fields() -> list[str]:
+    fields = os.getenv("FINDING_DEDUPE_FIELDS", "") or DEFAULT_DEDUPE_FIELDS
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def _get_field(finding: dict[str, Any], path: str) -> Any:
+    value: Any = finding
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def compute_finding_hash(finding: dict[str, Any], fields: list[str]) -> str:
+    relevant = {field: _get_field(finding, field) for field in fields}
+    serialized = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _get_dynamodb() -> "DynamoDBClient":
+    return AWSCachedClient(AWS_REGION).get_connection("dynamodb")  # type: ignore[no-any-return]
+
+
+def _send_dedupe_metric(is_duplicate: bool) -> None:
+    # Sent for every gated event, so the Average statistic is the dedupe rate
+    try:
+        CloudWatchMetrics().send_metric(
+            {
+                "MetricName": "DuplicateFindingEvents",
+                "Unit": "Count",
+                "Value": 1 if is_duplicate else 0,
+            }
+        )
+    except Exception:
+        logger.debug("Did not send dedupe metric")
+
+
+def is_duplicate(finding: dict[str, Any], execution_id: str = "") -> bool:
+    """
+    Record the finding's relevant-field hash and return True when the same hash was
+    already recorded for this finding within the TTL by another execution.
+    """
+    if not is_enabled():
+        return False
+
+    finding_id = finding.get("Id")
+    if not finding_id:
+        return False
+
+    finding_hash = compute_finding_hash(finding, get_dedupe_fields())
+    now = int(time.time())
+    item = {
+        FINDING_ID_KEY: {"S": finding_id},
+        "fieldHash": {"S": finding_hash},
+        "expireAt": {"N": str(now + get_ttl_seconds())},
+    }
+    # Expired items are not removed by TTL immediately, so check expireAt too
+    condition = (
+        "attribute_not_exists(findingId) OR fieldHash <> :hash OR expireAt < :now"
+    )
+    values = {":hash": {"S": finding_hash}, ":now": {"N": str(now)}}
+    if execution_id:
+        item["executionId"] = {"S": execution_id}
+        condition += " OR executionId = :execution"
+        values[":execution"] = {"S": execution_id}
+    try:
+        _get_dynamodb().put_item(
+            TableName=get_table_name(),
+            Item=item,
+            ConditionExpression=condition,
+            ExpressionAttributeValues=values,
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logger.warning(
+                "Dedupe check failed, allowing event",
+                findingId=finding_id,
+                error=str(e),
+            )
+            return False
+        logger.info("Dropping duplicate finding event", findingId=finding_id)
+        _send_dedupe_metric(True)
+        return True
+    except Exception as e:
+        logger.warning(
+            "Dedupe check failed, allowing event", findingId=finding_id, error=str(e)
+        )
+        return False
+
+    _send_dedupe_metric(False)
+    return False
+
+
+def forget(finding: dict[str, Any], execution_id: str) -> None:
+    """Remove the hash this execution recorded for the finding, if it is still there"""
+    if not is_enabled() or not finding.get("Id") or not execution_id:
+        return
+    try:
+        _get_dynamodb().delete_item(
+            TableName=get_table_name(),
+            Key={FINDING_ID_KEY: {"S": finding["Id"]}},
+            ConditionExpression="executionId = :execution",
+            ExpressionAttributeValues={":execution": {"S": execution_id}},
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logger.warning(
+                "Failed to forget finding hash", findingId=finding["Id"], error=str(e)
+            )
+    except Exception as e:
+        logger.warning(
+            "Failed to forget finding hash", findingId=finding["Id"], error=str(e)
+        )
@@ -0,0 +1,89 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Projection of a finding down to the fields a playbook's ParseInput step consumes.
+
+exec_ssm_doc passes the finding to the playbook as the Finding parameter, where
+parse_input re-parses it. Only the fields listed here are read, so the rest of the
+finding is dropped before start_automation_execution.
+
+Resources[0].Details is the largest part of most findings and is only passed through
+by parse_input. FINDING_DETAILS_MODE controls how it is sent:
+
+- full (default): sent unchanged
+- compressed: zlib-compressed and base64-encoded when larger than
+  FINDING_DETAILS_COMPRESS_BYTES, and decoded again by parse_input
+- omit: dropped
+"""
+import base64
+import json
+import os
+import zlib
+from typing import Any
+
+FINDING_FIELDS = ["Id", "ProductArn", "AwsAccountId", "testmode"]
+RESOURCE_FIELDS = ["Id", "Type", "Partition", "Region"]
+PRODUCT_FIELDS = ["RelatedAWSResources:0/type", "RelatedAWSResources:0/name"]
+
+DETAILS_MODE_FULL = "full"
+DETAILS_MODE_COMPRESSED = "compressed"
+DETAILS_MODE_OMIT = "omit"
+
+# Must match the encoding parse_input decodes
+DETAILS_ENCODING = "zlib+base64"
+
+
+def get_details_mode() -> str:
+    mode = os.getenv("FINDING_DETAILS_MODE", DETAILS_MODE_FULL).lower()
+    if mode not in (DETAILS_MODE_FULL, DETAILS_MODE_COMPRESSED, DETAILS_MODE_OMIT):
+        return DETAILS_MODE_FULL
+    return mode
+
+
+def get_compress_bytes() -> int:
+    return int(os.getenv("FINDING_DETAILS_COMPRESS_BYTES", "4096"))
+
+
+def encode_details(details: Any) -> str:
+    serialized = json.dumps(details, separators=(",", ":"), default=str)
+    return base64.b64encode(zlib.compress(serialized.encode("utf-8"))).decode("ascii")
+
+
+def _project_resource(resource: dict[str, Any], details_mode: str) -> dict[str, Any]:
+    projected = {
+        field: resource[field] for field in RESOURCE_FIELDS if field in resource
+    }
+    if "Details" not in resource or details_mode == DETAILS_MODE_OMIT:
+        return projected
+
+    details = resource["Details"]
+    if (
+        details_mode == DETAILS_MODE_COMPRESSED
+        and len(json.dumps(details, default=str)) > get_compress_bytes()
+    ):
+        projected["Details"] = encode_details(details)
+        projected["DetailsEncoding"] = DETAILS_ENCODING
+    else:
+        projected["Details"] = details
+    return projected
+
+
+def project_finding(finding: dict[str, Any], details_mode: str = "") -> dict[str, Any]:
+    """
+    Returns a copy of the finding with only the fields read by parse_input
+    """
+    details_mode = details_mode or get_details_mode()
+    projected = {field: finding[field] for field in FINDING_FIELDS if field in finding}
+
+    resources = finding.get("Resources", [])
+    if resources:
+        # parse_input only reads the first resource
+        projected["Resources"] = [_project_resource(resources[0], details_mode)]
+
+    product_fields = finding.get("ProductFields", {})
+    projected["ProductFields"] = {
+        field: product_fields[field]
+        for field in PRODUCT_FIELDS
+        if field in product_fields
+    }
+    return projected
@@ -1,16 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import functools
 import json
 import os
+import queue
+import threading
+import time
 import urllib.parse
 import uuid
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Optional, Tuple
-from urllib.request import Request, urlopen
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
 
-import boto3
 from botocore.exceptions import ClientError
-from layer import awsapi_cached_client
+from layer import metrics_context
 from layer.powertools_logger import get_logger
 
 if TYPE_CHECKING:
@@ -40,6 +42,113 @@ NORMALIZED_STATUS_REASON_MAPPING = {
 AWS_ACCOUNT_ID = os.getenv("AWS_ACCOUNT_ID", "unknown")
 STACK_ID = os.getenv("STACK_ID", "unknown")
 
+# Records queued by enqueue_metrics and delivered by a background thread. The thread
+# only runs while the execution environment is active, so handlers flush the queue
+# within a time budget before returning; records left over are delivered on a later
+# invocation.
+METRICS_QUEUE_SIZE = 100
+_metrics_queue: "queue.Queue[Tuple[Metrics, dict[str, Any]]]" = queue.Queue(
+    maxsize=METRICS_QUEUE_SIZE
+)
+_delivery_thread: Optional[threading.Thread] = None
+_dropped_records = 0
+_reported_dropped_records = 0
+_lock = threading.Lock()
+
+
+def get_timeout_seconds() -> float:
+    return float(os.getenv("METRICS_TIMEOUT_SECONDS", "2"))
+
+
+def get_flush_budget_seconds() -> float:
+    return float(os.getenv("METRICS_FLUSH_BUDGET_SECONDS", "1"))
+
+
+def get_dropped_count() -> int:
+    """Number of records dropped because the queue was full or delivery failed"""
+    return _dropped_records
+
+
+def _record_dropped() -> None:
+    global _dropped_records
+    with _lock:
+        _dropped_records += 1
+
+
+def _log_dropped_records() -> None:
+    """Log the records dropped since the last flush of the queue"""
+    global _reported_dropped_records
+    with _lock:
+        dropped = _dropped_records - _reported_dropped_records
+        _reported_dropped_records = _dropped_records
+    if dropped:
+        logger.warning(
+            "Dropped metrics records",
+            dropped=dropped,
+            total_dropped=get_dropped_count(),
+        )
+
+
+def _deliver_queued_metrics() -> None:
+    while True:
+        metrics, usage_data = _metrics_queue.get()
+        try:
+            metrics.post_metrics_to_api(usage_data)
+        except Exception as e:
+            _record_dropped()
+            logger.debug("Could not deliver metrics", error=str(e))
+        finally:
+            _metrics_queue.task_done()
+
+
+def _start_delivery_thread() -> None:
+    global _delivery_thread
+    with _lock:
+        if _delivery_thread is None or not _delivery_thread.is_alive():
+            _delivery_thread = threading.Thread(
+                target=_deliver_queued_metrics, name="metrics-delivery", daemon=True
+            )
+            _delivery_thread.start()
+
+
+def flush_metrics_queue(budget_seconds: Optional[float] = None) -> bool:
+    """
+    Wait up to budget_seconds for queued records to be delivered. Returns False when
+    records are still pending at the end of the budget. Records dropped since the
+    last flush are logged as a warning.
+    """
+    budget = get_flush_budget_seconds() if budget_seconds is None else budget_seconds
+    deadline = time.monotonic() + budget
+    try:
+        with _metrics_queue.all_tasks_done:
+            while _metrics_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.debug(
+                        "Metrics flush budget exceeded",
+                        pending=_metrics_queue.unfinished_tasks,
+                    )
+                    return False
+                _metrics_queue.all_tasks_done.wait(remaining)
+        return True
+    finally:
+        _log_dropped_records()
+
+
+def flush_metrics_queue_on_exit(
+    lambda_handler: Callable[..., Any],
+) -> Callable[..., Any]:
+    """Decorator that flushes queued metrics when the handler returns or raises"""
+
+    @functools.wraps(lambda_handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return lambda_handler(*args, **kwargs)
+        finally:
+            flush_metrics_queue()
+
+    return wrapper
+
 
 class Metrics(object):
     old_uuid_parameter_name = (
@@ -50,20 +159,25 @@ class Metrics(object):
     solution_version_parm = "/Solutions/SO0111/version"
 
     def __init__(self):
-        self.session = boto3.session.Session()
-        self.region: str = self.session.region_name
+        self.region: Optional[str] = None
+        try:
+            self.region = metrics_context.get_region()
+        except Exception as e:
+            print(f"Could not determine the region: {str(e)}")
 
         self.ssm_client: SSMClient = self.connect_to_ssm()
-        self.solution_uuid: str = self.__get_solution_uuid()
-        self.solution_version: str = self.__get_solution_version()
+        # The UUID is read, and migrated if needed, once per execution environment
+        self.solution_uuid: str = metrics_context.get_cached_value(
+            self.new_uuid_parameter_name, self.__get_solution_uuid, expires=False
+        )
+        self.solution_version: str = metrics_context.get_cached_value(
+            self.solution_version_parm, self.__get_solution_version
+        )
 
     def connect_to_ssm(self):
         try:
             if not self.ssm_client:
-                new_ssm_client = awsapi_cached_client.AWSCachedClient(
-                    self.region
-                ).get_connection("ssm")
-                return new_ssm_client
+                return metrics_context.get_connection("ssm")
         except Exception as e:
             print(f"Could not connect to ssm: {str(e)}")
 
@@ -176,18 +290,36 @@ class Metrics(object):
             print(excep)
             return {}
 
+    def get_usage_data(self, metrics_data):
+        return {
+            "Solution": "SO0111",
+            "UUID": self.solution_uuid,
+            "AccountId": AWS_ACCOUNT_ID,
+            "StackId": STACK_ID,
+            "TimeStamp": str(datetime.now(UTC).isoformat()),
+            "Data": metrics_data,
+            "Version": self.solution_version,
+        }
+
+    def enqueue_metrics(self, metrics_data: Optional[dict[str, Any]]) -> None:
+        """
+        Queue metrics for delivery by the background thread instead of posting them
+        on the caller's thread. Records are dropped when the queue is full.
+        """
+        if metrics_data is None:
+            return
+        try:
+            _metrics_queue.put_nowait((self, self.get_usage_data(metrics_data)))
+        except queue.Full:
+            _record_dropped()
+            logger.debug("Metrics queue full, dropping record")
+            return
+        _start_delivery_thread()
+
     def send_metrics(self, metrics_data):
         try:
             if metrics_data is not None:
-                usage_data = {
-                    "Solution": "SO0111",
-                    "UUID": self.solution_uuid,
-                    "AccountId": AWS_ACCOUNT_ID,
-                    "StackId": STACK_ID,
-                    "TimeStamp": str(datetime.now(UTC).isoformat()),
-                    "Data": metrics_data,
-                    "Version": self.solution_version,
-                }
+                usage_data = self.get_usage_data(metrics_data)
                 print(f"Sending metrics data {json.dumps(usage_data)}")
                 self.post_metrics_to_api(usage_data)
 
@@ -197,6 +329,9 @@ class Metrics(object):
             print(excep)
 
     def post_metrics_to_api(self, request_data):
+        # Only needed when metrics are sent, so not imported at cold start
+        from urllib.request import Request, urlopen
+
         url = "https://metrics.awssolutionsbuilder.com/generic"
         url_encoded_request_data = urllib.parse.quote(json.dumps(request_data))
         print(f"url_encoded_request_data: {url_encoded_request_data}")
@@ -206,7 +341,7 @@ class Metrics(object):
             data=bytes(url_encoded_request_data, encoding="utf8"),
             headers={"Content-Type": "application/json"},
         )
-        urlopen(req)  # nosec
+        urlopen(req, timeout=get_timeout_seconds())  # nosec
 
     @staticmethod
     def get_status_for_metrics(status_from_event: str) -> Tuple[str, str]:
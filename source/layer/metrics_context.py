@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Metrics context caching for Lambda functions.
+
+Metrics and CloudWatchMetrics are constructed for every notification, and each reads
+the solution UUID, solution version and sendCloudwatchMetrics SSM parameters. This
+module caches those values in global variables so they are read once per execution
+environment and shared by both classes.
+
+Values expire after METRICS_CONTEXT_TTL_SECONDS (default 300) so that a change to the
+version or sendCloudwatchMetrics parameters is picked up without a redeploy. The UUID
+does not change once created, so it is cached for the lifetime of the environment and
+the migration from the deprecated UUID parameter only runs when it is first read.
+Values that could not be read are not cached: loaders return None (or "unknown") on
+error, so a failed read is retried by the next instance instead of being kept for the
+whole TTL.
+
+Both classes also connect through get_connection, which reuses one AWSCachedClient per
+execution environment instead of creating a boto3 session and looking up the caller
+identity for every instance.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import boto3
+from layer import awsapi_cached_client
+
+UNKNOWN = "unknown"
+
+_metrics_context_cache: Dict[str, Tuple[Any, Optional[datetime]]] = {}
+
+# "client" -> the AWSCachedClient shared by Metrics and CloudWatchMetrics
+_shared_client: Dict[str, awsapi_cached_client.AWSCachedClient] = {}
+_shared_client_lock = threading.Lock()
+
+
+def get_ttl_seconds() -> int:
+    return int(os.getenv("METRICS_CONTEXT_TTL_SECONDS", "300"))
+
+
+def get_cached_value(name: str, loader: Callable[[], Any], expires: bool = True) -> Any:
+    """
+    Return the cached value for name, calling loader to read it when it is missing or
+    expired. Values that never expire are read once per execution environment.
+    """
+    now = datetime.now()
+
+    if name in _metrics_context_cache:
+        value, expiry = _metrics_context_cache[name]
+        if expiry is None or now < expiry:
+            return value
+
+    value = loader()
+    if value is None or value == UNKNOWN:
+        return value
+
+    expiry = now + timedelta(seconds=get_ttl_seconds()) if expires else None
+    _metrics_context_cache[name] = (value, expiry)
+
+    return value
+
+
+def _get_shared_client() -> awsapi_cached_client.AWSCachedClient:
+    with _shared_client_lock:
+        if "client" not in _shared_client:
+            _shared_client["client"] = awsapi_cached_client.AWSCachedClient(
+                boto3.session.Session().region_name
+            )
+        return _shared_client["client"]
+
+
+def get_region() -> Optional[str]:
+    """The Lambda's region, as read by the shared AWSCachedClient"""
+    return _get_shared_client().region
+
+
+def get_connection(service: str) -> Any:
+    """A client for service in the Lambda's region, from the shared AWSCachedClient"""
+    return _get_shared_client().get_connection(service)
+
+
+def clear_cache() -> None:
+    """Clear the cache"""
+    _metrics_context_cache.clear()
+    _shared_client.clear()
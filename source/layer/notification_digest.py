@@ -0,0 +1,263 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Digest mode for SNS remediation notifications.
+
+By default ASRNotification publishes one SNS message per remediation event. When
+SNS_DIGEST_WINDOW_SECONDS and NOTIFICATION_DIGEST_TABLE_NAME are set, notifications
+other than ERROR are instead added to a digest per severity and security standard.
+Once a digest's window has elapsed it is published as one compact message, with
+counts per control and outcome and up to SNS_DIGEST_SAMPLE_SIZE of the notifications.
+The digests that are due are published together with publish_batch. ERROR
+notifications are always published immediately.
+
+Digests are kept in a DynamoDB table, one item per severity and standard, so that
+they outlive the invocation and execution environment that added to them. Each
+notification is a single update_item, and a digest is taken for publishing with a
+conditional delete_item, so concurrent invocations neither lose nor repeat
+notifications. Due digests are published when a notification is added and when a
+handler decorated with flush_on_exit returns. A digest whose window elapses while no
+notifications arrive is published by the scheduled invocation of the notification
+Lambda that the administrator stack deploys with digest mode. Every notification is
+also written to the solution's CloudWatch Logs group.
+"""
+import functools
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, List
+
+from layer.awsapi_cached_client import AWSCachedClient
+from layer.powertools_logger import get_logger
+from layer.utils import partition_from_region
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+logger = get_logger("notification_digest")
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+TOPIC_NAME = "SO0111-ASR_Topic"
+IMMEDIATE_SEVERITIES = ["ERROR"]
+# SNS PublishBatch accepts at most 10 entries per request
+MAX_BATCH_ENTRIES = 10
+# Notification fields kept in a digest sample; the remediation output and finding
+# are left out to keep the digest under the SNS message size limit
+SAMPLE_FIELDS = [
+    "Remediation_Status",
+    "Severity",
+    "Account_Alias",
+    "Message",
+    "Finding_Link",
+    "Ticket_URL",
+    "StepFunctions_Execution_Id",
+]
+
+DIGEST_KEY = "digestKey"
+# Outcome counters are top-level attributes, since update_item cannot create a
+# nested map path: "outcome#<control>#<outcome>"
+OUTCOME_PREFIX = "outcome#"
+
+
+def get_table_name() -> str:
+    return os.getenv("NOTIFICATION_DIGEST_TABLE_NAME", "")
+
+
+def get_window_seconds() -> int:
+    return int(os.getenv("SNS_DIGEST_WINDOW_SECONDS", "0"))
+
+
+def get_sample_size() -> int:
+    return int(os.getenv("SNS_DIGEST_SAMPLE_SIZE", "5"))
+
+
+def is_enabled() -> bool:
+    return get_window_seconds() > 0 and bool(get_table_name())
+
+
+def is_digested(severity: str) -> bool:
+    return is_enabled() and severity not in IMMEDIATE_SEVERITIES
+
+
+def _get_dynamodb() -> "DynamoDBClient":
+    return AWSCachedClient(AWS_REGION).get_connection("dynamodb")  # type: ignore[no-any-return]
+
+
+def add(severity: str, standard: str, control: str, message: dict[str, Any]) -> bool:
+    """
+    Add a notification to the digest for its severity and standard. Returns False if
+    the digest could not be updated, in which case the caller publishes the
+    notification itself.
+    """
+    try:
+        _add_to_digest(severity, standard, control, message)
+    except Exception as e:
+        logger.error("Failed to add notification to digest", error=str(e))
+        return False
+
+    try:
+        flush()
+    except Exception as e:
+        logger.error("Failed to flush notification digests", error=str(e))
+    return True
+
+
+def _add_to_digest(
+    severity: str, standard: str, control: str, message: dict[str, Any]
+) -> None:
+    dynamodb = _get_dynamodb()
+    key = {DIGEST_KEY: {"S": f"{severity}#{standard}"}}
+    outcome = message.get("Remediation_Status") or "UNKNOWN"
+    response = dynamodb.update_item(
+        TableName=get_table_name(),
+        Key=key,
+        UpdateExpression="SET severity = :severity, standard = :standard, "
+        "startedAt = if_not_exists(startedAt, :now) ADD notificationCount :one, #outcome :one",
+        ExpressionAttributeNames={
+            "#outcome": f"{OUTCOME_PREFIX}{control or 'Unknown'}#{outcome}"
+        },
+        ExpressionAttributeValues={
+            ":severity": {"S": severity},
+            ":standard": {"S": standard},
+            ":now": {"N": str(time.time())},
+            ":one": {"N": "1"},
+        },
+        ReturnValues="ALL_NEW",
+    )
+    count = int(response["Attributes"]["notificationCount"]["N"])
+    if count <= get_sample_size():
+        sample = {field: message[field] for field in SAMPLE_FIELDS if field in message}
+        try:
+            # Conditional on startedAt, so that a digest taken for publishing since the
+            # first update is not recreated without it
+            dynamodb.update_item(
+                TableName=get_table_name(),
+                Key=key,
+                UpdateExpression="SET samples = list_append(if_not_exists(samples, :empty), :sample)",
+                ConditionExpression="startedAt = :started",
+                ExpressionAttributeValues={
+                    ":empty": {"L": []},
+                    ":sample": {"L": [{"S": json.dumps(sample, default=str)}]},
+                    ":started": response["Attributes"]["startedAt"],
+                },
+            )
+        except dynamodb.exceptions.ConditionalCheckFailedException:
+            # The notification is counted in the published digest, without a sample
+            pass
+
+
+def to_message(item: dict[str, Any]) -> str:
+    outcomes: dict[str, dict[str, int]] = {}
+    for name, value in item.items():
+        if name.startswith(OUTCOME_PREFIX):
+            control, outcome = name[len(OUTCOME_PREFIX) :].rsplit("#", 1)
+            outcomes.setdefault(control, {})[outcome] = int(value["N"])
+    return json.dumps(
+        {
+            "Digest": {
+                "Severity": item["severity"]["S"],
+                "Standard": item["standard"]["S"],
+                "WindowStart": int(float(item["startedAt"]["N"])),
+                "WindowEnd": int(time.time()),
+                "Count": int(item["notificationCount"]["N"]),
+                "Outcomes": outcomes,
+                "Samples": [
+                    json.loads(sample["S"])
+                    for sample in item.get("samples", {}).get("L", [])
+                ],
+            }
+        },
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def _take_due_digests(force: bool) -> List[str]:
+    dynamodb = _get_dynamodb()
+    due_before = time.time() - get_window_seconds()
+    messages = []
+    for page in dynamodb.get_paginator("scan").paginate(
+        TableName=get_table_name(),
+        ProjectionExpression=f"{DIGEST_KEY}, startedAt",
+    ):
+        for item in page.get("Items", []):
+            if "startedAt" not in item:
+                continue
+            if not force and float(item["startedAt"]["N"]) > due_before:
+                continue
+            try:
+                # Conditional on startedAt, so a digest started since the scan is kept
+                response = dynamodb.delete_item(
+                    TableName=get_table_name(),
+                    Key={DIGEST_KEY: item[DIGEST_KEY]},
+                    ConditionExpression="startedAt = :started",
+                    ExpressionAttributeValues={":started": item["startedAt"]},
+                    ReturnValues="ALL_OLD",
+                )
+            except dynamodb.exceptions.ConditionalCheckFailedException:
+                continue
+            if "Attributes" in response:
+                messages.append(to_message(response["Attributes"]))
+    return messages
+
+
+def flush(force: bool = False, region: str = "") -> int:
+    """
+    Publish the digests whose window has elapsed, or all digests when force is set.
+    Returns the number of digests published.
+    """
+    messages = _take_due_digests(force)
+    if not messages:
+        return 0
+
+    region = region or AWS_REGION
+    aws = AWSCachedClient(region)
+    topic_arn = (
+        f"arn:{partition_from_region(region)}:sns:{region}:{aws.account}:{TOPIC_NAME}"
+    )
+    published = 0
+    for start in range(0, len(messages), MAX_BATCH_ENTRIES):
+        entries = [
+            {"Id": str(index), "Message": message}
+            for index, message in enumerate(messages[start : start + MAX_BATCH_ENTRIES])
+        ]
+        try:
+            response = aws.get_connection("sns", region).publish_batch(
+                TopicArn=topic_arn, PublishBatchRequestEntries=entries
+            )
+        except Exception as e:
+            # The digests were already taken from the table, so log them in full
+            logger.error(
+                "Failed to publish notification digests",
+                count=len(entries),
+                error=str(e),
+                digests=[entry["Message"] for entry in entries],
+            )
+            continue
+        for failure in response.get("Failed", []):
+            logger.error(
+                "Failed to publish notification digest",
+                failure=failure,
+                digest=entries[int(failure["Id"])]["Message"],
+            )
+        published += len(response.get("Successful", []))
+    return published
+
+
+def flush_on_exit(lambda_handler: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator that publishes due digests when the Lambda handler returns or raises"""
+
+    @functools.wraps(lambda_handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return lambda_handler(*args, **kwargs)
+        finally:
+            if is_enabled():
+                try:
+                    flush()
+                except Exception as e:
+                    logger.error("Failed to flush notification digests", error=str(e))
+
+    return wrapper
@@ -1,12 +1,91 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-
+"""
+Structured logging for the solution's Lambda functions.
+
+Fields passed as keyword arguments are logged as structured keys. To keep large
+payloads out of the logs:
+
+- fields named in FIELD_PROJECTIONS are logged as a projection, e.g. a finding as its
+  ID, control and account
+- any other field whose serialized value is longer than LOG_MAX_FIELD_LENGTH
+  (default 2048) is logged as a truncated string ending with a truncation marker
+
+log_event logs a Lambda input with these projections. The full input is logged only
+when the logger is at debug level, or for a sample of the events when
+LOG_EVENT_SAMPLE_RATE (0.0 to 1.0) is set.
+"""
+import json
 import logging
 import os
-from typing import Any, Optional
+import random
+from typing import Any, Callable, Optional
 
 from aws_lambda_powertools import Logger
 
+TRUNCATION_MARKER = "...[truncated]"
+
+
+def _project_finding(finding: Any) -> Any:
+    if not isinstance(finding, dict):
+        return finding
+    product_fields = finding.get("ProductFields", {})
+    return {
+        "Id": finding.get("Id"),
+        "ControlId": finding.get("Compliance", {}).get("SecurityControlId")
+        or product_fields.get("ControlId")
+        or product_fields.get("RuleId"),
+        "AwsAccountId": finding.get("AwsAccountId"),
+    }
+
+
+def _project_findings(findings: Any) -> Any:
+    if not isinstance(findings, list):
+        return findings
+    return {
+        "Count": len(findings),
+        "Ids": [
+            finding.get("Id") for finding in findings[:10] if isinstance(finding, dict)
+        ],
+    }
+
+
+FIELD_PROJECTIONS: dict[str, Callable[[Any], Any]] = {
+    "Finding": _project_finding,
+    "Findings": _project_findings,
+}
+
+
+def get_max_field_length() -> int:
+    return int(os.getenv("LOG_MAX_FIELD_LENGTH", "2048"))
+
+
+def get_event_sample_rate() -> float:
+    return float(os.getenv("LOG_EVENT_SAMPLE_RATE", "0"))
+
+
+def cap_field(value: Any, max_length: int) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    serialized = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(serialized) <= max_length:
+        return value
+    return serialized[:max_length] + TRUNCATION_MARKER
+
+
+def project_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    """Apply FIELD_PROJECTIONS and the size cap to each field"""
+    max_length = get_max_field_length()
+    projected = {}
+    for key, value in fields.items():
+        if key == "extra" and isinstance(value, dict):
+            projected[key] = project_fields(value)
+            continue
+        if key in FIELD_PROJECTIONS:
+            value = FIELD_PROJECTIONS[key](value)
+        projected[key] = cap_field(value, max_length)
+    return projected
+
 
 class PowertoolsLogger:
     def __init__(self, service_name: Optional[str] = None, level: str = "info"):
@@ -15,41 +94,57 @@ class PowertoolsLogger:
         self.logger = Logger(service=self.service_name, level=self._level)
 
     def debug(self, message: str, **kwargs: Any) -> None:
+        if not self._is_debug_enabled():
+            return
         if kwargs:
-            self.logger.debug(message, extra=kwargs)
+            self.logger.debug(message, extra=project_fields(kwargs))
         else:
             self.logger.debug(message)
 
     def info(self, message: str, **kwargs: Any) -> None:
         if kwargs:
-            self.logger.info(message, extra=kwargs)
+            self.logger.info(message, extra=project_fields(kwargs))
         else:
             self.logger.info(message)
 
     def warning(self, message: str, **kwargs: Any) -> None:
         if kwargs:
-            self.logger.warning(message, extra=kwargs)
+            self.logger.warning(message, extra=project_fields(kwargs))
         else:
             self.logger.warning(message)
 
     def error(self, message: str, **kwargs: Any) -> None:
         if kwargs:
-            self.logger.error(message, extra=kwargs)
+            self.logger.error(message, extra=project_fields(kwargs))
         else:
             self.logger.error(message)
 
     def critical(self, message: str, **kwargs: Any) -> None:
         if kwargs:
-            self.logger.critical(message, extra=kwargs)
+            self.logger.critical(message, extra=project_fields(kwargs))
         else:
             self.logger.critical(message)
 
     def exception(self, message: str, **kwargs: Any) -> None:
         if kwargs:
-            self.logger.exception(message, extra=kwargs)
+            self.logger.exception(message, extra=project_fields(kwargs))
         else:
             self.logger.exception(message)
 
+    def _is_debug_enabled(self) -> bool:
+        return self.logger.log_level <= logging.DEBUG
+
+    def log_event(self, message: str, event: dict[str, Any]) -> None:
+        """
+        Log a Lambda input at info level with its large fields projected. The full
+        input is logged at debug level, or at info level for sampled events.
+        """
+        self.info(message, **event)
+        if self._is_debug_enabled():
+            self.logger.debug(message, extra={"event": event})
+        elif random.random() < get_event_sample_rate():  # nosec
+            self.logger.info(message, extra={"event": event, "sampled": True})
+
     def add_persistent_keys(self, **kwargs: Any) -> None:
         self.logger.append_keys(**kwargs)
 
@@ -77,7 +172,14 @@ class PowertoolsLogger:
         return self.logger
 
 
+_loggers: dict[tuple[Optional[str], str], PowertoolsLogger] = {}
+
+
 def get_logger(
     service_name: Optional[str] = None, level: str = "info"
 ) -> PowertoolsLogger:
-    return PowertoolsLogger(service_name, level)
+    """Return the logger for the service and level, shared by the modules using it"""
+    key = (service_name, level.lower())
+    if key not in _loggers:
+        _loggers[key] = PowertoolsLogger(service_name, level)
+    return _loggers[key]
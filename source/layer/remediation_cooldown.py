@@ -0,0 +1,140 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Cooldown index keyed by resourceId#control.
+
+send_notifications starts a cooldown when a remediation succeeds. While it is active,
+check_ssm_doc_state skips imported findings for the same resource and control, which
+Security Hub keeps re-emitting until it re-evaluates the resource.
+
+The window defaults to REMEDIATION_COOLDOWN_SECONDS, 0 (no cooldown) when unset, and
+can be set per control with REMEDIATION_COOLDOWN_CONTROL_SECONDS, a JSON object of
+control ID to seconds (0 disables the cooldown for that control). The administrator
+stack sets both from its RemediationCooldownSeconds and
+RemediationCooldownControlSeconds parameters. The index is disabled when
+REMEDIATION_COOLDOWN_TABLE_NAME is not set, and fails open on any table error.
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Optional
+
+from layer.awsapi_cached_client import AWSCachedClient
+from layer.powertools_logger import get_logger
+from layer.sechub_findings import extract_resource_id, extract_security_control_id
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+logger = get_logger("remediation_cooldown")
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+COOLDOWN_KEY = "cooldownKey"
+
+
+def get_table_name() -> str:
+    return os.getenv("REMEDIATION_COOLDOWN_TABLE_NAME", "")
+
+
+def is_enabled() -> bool:
+    return bool(get_table_name())
+
+
+def get_cooldown_seconds(control_id: str) -> int:
+    overrides = os.getenv("REMEDIATION_COOLDOWN_CONTROL_SECONDS", "")
+    if overrides:
+        try:
+            control_seconds = json.loads(overrides)
+            if control_id in control_seconds:
+                return int(control_seconds[control_id])
+        except (ValueError, TypeError, AttributeError):
+            logger.warning(
+                "Invalid REMEDIATION_COOLDOWN_CONTROL_SECONDS, using default window"
+            )
+    return int(os.getenv("REMEDIATION_COOLDOWN_SECONDS", "0") or "0")
+
+
+def cooldown_key_from_event(event: dict[str, Any]) -> Optional[str]:
+    resources = (event.get("Finding", {}).get("Resources") or [{}])[0]
+    resource_id = extract_resource_id(event, resources)
+    control_id = extract_security_control_id(event)
+    if not resource_id or not control_id:
+        return None
+    return f"{resource_id}#{control_id}"
+
+
+def _get_dynamodb() -> "DynamoDBClient":
+    return AWSCachedClient(AWS_REGION).get_connection("dynamodb")  # type: ignore[no-any-return]
+
+
+def start_cooldown(event: dict[str, Any]) -> None:
+    """
+    Start the cooldown for the resource and control of a successfully remediated
+    finding.
+    """
+    if not is_enabled():
+        return
+
+    key = cooldown_key_from_event(event)
+    if not key:
+        logger.debug("Could not derive cooldown key from event")
+        return
+
+    cooldown_seconds = get_cooldown_seconds(extract_security_control_id(event))
+    if cooldown_seconds <= 0:
+        return
+
+    now = int(time.time())
+    try:
+        _get_dynamodb().put_item(
+            TableName=get_table_name(),
+            Item={
+                COOLDOWN_KEY: {"S": key},
+                "remediatedAt": {"N": str(now)},
+                "expireAt": {"N": str(now + cooldown_seconds)},
+            },
+        )
+    except Exception as e:
+        logger.warning(
+            "Failed to start remediation cooldown", cooldownKey=key, error=str(e)
+        )
+
+
+def get_active_cooldown(event: dict[str, Any]) -> Optional[dict[str, str]]:
+    """
+    Returns the check_ssm_doc_state answer ({"status", "message"}) when the finding's
+    resource and control are cooling down, or None when the execution should proceed.
+    """
+    if not is_enabled():
+        return None
+
+    key = cooldown_key_from_event(event)
+    if not key:
+        return None
+
+    try:
+        item = (
+            _get_dynamodb()
+            .get_item(TableName=get_table_name(), Key={COOLDOWN_KEY: {"S": key}})
+            .get("Item")
+        )
+    except Exception as e:
+        logger.warning(
+            "Cooldown check failed, allowing execution", cooldownKey=key, error=str(e)
+        )
+        return None
+
+    # Expired items are not removed by TTL immediately
+    if not item or int(item["expireAt"]["N"]) <= int(time.time()):
+        return None
+
+    expires = datetime.fromtimestamp(int(item["expireAt"]["N"]), timezone.utc)
+    logger.info("Skipping remediation during cooldown", cooldownKey=key)
+    return {
+        "status": "COOLDOWN",
+        "message": f"Remediation cooldown active for {key} until {expires.isoformat()}",
+    }
@@ -7,6 +7,7 @@ import re
 from typing import Any, Optional, TypedDict, Union
 
 from botocore.exceptions import ClientError
+from layer import notification_digest
 from layer.awsapi_cached_client import AWSCachedClient
 from layer.powertools_logger import get_logger
 from layer.simple_validation import clean_ssm
@@ -53,6 +54,24 @@ class InvalidFindingJson(Exception):
     pass
 
 
+class ResolvedFinding(TypedDict):
+    """
+    Fields of a Finding that need SSM lookups to resolve. The first Orchestrator
+    Lambda emits them into the Step Functions state so later Lambdas can rehydrate
+    the Finding without repeating the lookups.
+    """
+
+    finding_id: str
+    standard_name: str
+    standard_shortname: str
+    standard_version: str
+    standard_control: str
+    remediation_control: str
+    playbook_enabled: str
+    account_id: str
+    resource_region: str
+
+
 class Finding(object):
     """
     Security Hub Finding class
@@ -74,7 +93,9 @@ class Finding(object):
     arn = ""
     uuid = ""
 
-    def __init__(self, finding_rec):
+    def __init__(
+        self, finding_rec: dict[str, Any], resolved: Optional[ResolvedFinding] = None
+    ) -> None:
         self.region = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
         self.aws_api_client = AWSCachedClient(self.region)
 
@@ -95,6 +116,9 @@ class Finding(object):
             self.details.get("Remediation", {}).get("Recommendation", {}).get("Url", "")
         )
 
+        if resolved and self._rehydrate(resolved):
+            return
+
         if (
             self.details.get("ProductFields").get("StandardsControlArn", None)
             is not None
@@ -113,6 +137,40 @@ class Finding(object):
         self._get_control_remap()
         self._set_playbook_enabled()
 
+    def _rehydrate(self, resolved: ResolvedFinding) -> bool:
+        """
+        Set the resolved fields from a summary emitted by an earlier Lambda. Returns
+        False, leaving the Finding to be fully resolved, when the summary does not
+        belong to this finding or is incomplete.
+        """
+        if resolved.get("finding_id") != self.arn or any(
+            field not in resolved for field in ResolvedFinding.__annotations__
+        ):
+            return False
+
+        self.standard_name = resolved["standard_name"]
+        self.standard_shortname = resolved["standard_shortname"]
+        self.standard_version = resolved["standard_version"]
+        self.standard_control = resolved["standard_control"]
+        self.remediation_control = resolved["remediation_control"]
+        self.playbook_enabled = resolved["playbook_enabled"]
+        self.account_id = resolved["account_id"]
+        self.resource_region = resolved["resource_region"]
+        return True
+
+    def to_resolved(self) -> ResolvedFinding:
+        return {
+            "finding_id": self.arn,
+            "standard_name": self.standard_name,
+            "standard_shortname": self.standard_shortname,
+            "standard_version": self.standard_version,
+            "standard_control": self.standard_control,
+            "remediation_control": self.remediation_control,
+            "playbook_enabled": self.playbook_enabled,
+            "account_id": self.account_id,
+            "resource_region": self.resource_region,
+        }
+
     def is_valid_finding_json(self):
         if self.generator_id == "error":
             return False
@@ -423,7 +481,7 @@ def extract_finding_info(
     if "Finding" not in event:
         return None, ""
 
-    finding = Finding(event["Finding"])
+    finding = Finding(event["Finding"], event.get("ResolvedFinding"))
     finding_info: FindingInfo = {
         "finding_id": finding.uuid or "",
         "finding_description": finding.description or "",
@@ -472,16 +530,15 @@ class ASRNotification(object):
 
     def _get_log_handler(self):
         """
-        Create a loghandler object
+        Get the loghandler object for the stream, shared by all notifications
         """
-        from layer.applogger import LogHandler
+        from layer.applogger import get_log_handler
 
         applogger_name = self.__security_standard
         if self.__controlid:
             applogger_name += "-" + self.__controlid
 
-        applogger = LogHandler(applogger_name)
-        return applogger
+        return get_log_handler(applogger_name)
 
     def __str__(self):
         return str(self.__class__) + ": " + str(self.__dict__)
@@ -504,7 +561,17 @@ class ASRNotification(object):
         if self.ticket_url:
             sns_notify_json["Ticket_URL"] = self.ticket_url
 
-        if self.send_to_sns:
+        digested = (
+            self.send_to_sns
+            and notification_digest.is_digested(self.severity)
+            and notification_digest.add(
+                self.severity,
+                self.__security_standard,
+                self.__controlid or "",
+                sns_notify_json,
+            )
+        )
+        if self.send_to_sns and not digested:
             topic = "SO0111-ASR_Topic"
             sent_id = publish_to_sns(
                 topic,
@@ -516,4 +583,5 @@ class ASRNotification(object):
         if self.logdata:
             for line in self.logdata:
                 self.applogger.add_message(line)
-        self.applogger.flush()
+        # Flushed with later notifications of the invocation, or when the handler exits
+        self.applogger.flush_if_due()
@@ -5,6 +5,7 @@ from unittest.mock import patch
 
 import boto3
 import pytest
+from layer import metrics_context
 from layer.awsapi_cached_client import AWSCachedClient
 
 
@@ -35,6 +36,14 @@ def mock_get_local_account_id():
     mock.stop()
 
 
+@pytest.fixture(autouse=True)
+def clear_metrics_context():
+    # Metrics parameters are cached per execution environment, i.e. across tests
+    metrics_context.clear_cache()
+    yield
+    metrics_context.clear_cache()
+
+
 def create_dynamodb_tables():
     dynamodb = boto3.client("dynamodb", region_name="us-east-1")
 
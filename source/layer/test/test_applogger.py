@@ -6,14 +6,17 @@ from datetime import date
 import boto3
 import pytest
 from botocore.stub import ANY, Stubber
+from layer import applogger as applogger_module
 from layer.applogger import (
     DEFAULT_LOG_GROUP,
     DEFAULT_REGION,
     LOG_ENTRY_ADDITIONAL,
+    LOG_MAX_BATCH_EVENTS,
     LOG_MAX_BATCH_SIZE,
     MAX_CREATE_STREAM_RETRIES,
     FailedToCreateLogGroup,
     LogHandler,
+    get_log_handler,
 )
 
 
@@ -34,6 +37,9 @@ class TestLogHandler:
 
         monkeypatch.setenv("AWS_DEFAULT_REGION", DEFAULT_REGION)
         monkeypatch.setenv("SOLUTION_LOGGROUP", DEFAULT_LOG_GROUP)
+        applogger_module.clear_log_handlers()
+        yield
+        applogger_module.clear_log_handlers()
 
     @pytest.fixture(scope="function")
     def mock_aws_client(self, mocker):
@@ -192,3 +198,73 @@ class TestLogHandler:
         applogger.clear()
         assert len(applogger._buffer) == 0
         assert applogger._buffer_size == 0
+
+    def test_get_log_handler_is_shared(self):
+        assert get_log_handler("mystream") is get_log_handler("MyStream")
+        assert get_log_handler("mystream") is not get_log_handler("otherstream")
+
+    def test_known_stream_is_not_created_again(self, mock_aws_client):
+        stream = f"MYSTREAM-{date.today()}"
+        put_log_events = {
+            "logGroupName": DEFAULT_LOG_GROUP,
+            "logStreamName": stream,
+            "logEvents": ANY,
+        }
+
+        stubber = Stubber(mock_aws_client.logs_client)
+        stubber.add_client_error(
+            "create_log_stream",
+            "ResourceAlreadyExistsException",
+            "Log stream already exists",
+            expected_params={
+                "logGroupName": DEFAULT_LOG_GROUP,
+                "logStreamName": stream,
+            },
+        )
+        stubber.add_response("put_log_events", {}, put_log_events)
+        stubber.add_response("put_log_events", {}, put_log_events)
+
+        with stubber:
+            for _ in range(2):
+                # A new handler, as in a later invocation of the environment
+                applogger = LogHandler("mystream")
+                applogger.add_message("test message")
+                applogger.flush()
+
+        stubber.assert_no_pending_responses()
+
+    def test_flush_if_due(self, mocker, monkeypatch):
+        applogger = LogHandler("mystream")
+        mock_flush = mocker.patch.object(applogger, "flush")
+
+        applogger.add_message("first notification")
+        applogger.flush_if_due()
+        assert not mock_flush.called
+
+        monkeypatch.setenv("LOG_FLUSH_INTERVAL_SECONDS", "0")
+        applogger.flush_if_due()
+        mock_flush.assert_called_once()
+
+    def test_event_count_limit(self, mocker):
+        applogger = LogHandler("mystream")
+        mock_flush = mocker.patch.object(applogger, "flush")
+        for _ in range(LOG_MAX_BATCH_EVENTS):
+            applogger.add_message("x")
+        assert not mock_flush.called
+
+        applogger.add_message("x")
+        mock_flush.assert_called_once()
+
+    def test_flush_on_exit(self, mocker):
+        applogger = get_log_handler("mystream")
+        mock_flush = mocker.patch.object(applogger, "flush")
+
+        @applogger_module.flush_on_exit
+        def handler(_event, _context):
+            applogger.add_message("test message")
+            raise RuntimeError("failed")
+
+        with pytest.raises(RuntimeError):
+            handler({}, None)
+
+        mock_flush.assert_called_once()
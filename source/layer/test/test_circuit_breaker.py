@@ -0,0 +1,212 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import os
+
+import boto3
+import pytest
+from layer import circuit_breaker
+from moto import mock_aws
+
+TABLE_NAME = "test-circuit-breaker-table"
+KEY = "111111111111#us-east-1#S3.1"
+
+
+def failure_event(state="ASSUME_ROLE_FAILURE"):
+    return {
+        "Notification": {"State": state, "Message": "Unable to assume role"},
+        "AccountId": "111111111111",
+        "ControlId": "S3.1",
+        "Finding": {
+            "AwsAccountId": "111111111111",
+            "Resources": [{"Region": "us-east-1", "Id": "arn:aws:s3:::bucket"}],
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def breaker_environment():
+    os.environ["CIRCUIT_BREAKER_TABLE_NAME"] = TABLE_NAME
+    os.environ["CIRCUIT_BREAKER_FAILURE_THRESHOLD"] = "3"
+    yield
+    del os.environ["CIRCUIT_BREAKER_TABLE_NAME"]
+    del os.environ["CIRCUIT_BREAKER_FAILURE_THRESHOLD"]
+
+
+def setup_table(mocker):
+    dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+    dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "breakerKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "breakerKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    mocker.patch(
+        "layer.circuit_breaker.AWSCachedClient"
+    ).return_value.get_connection.return_value = dynamodb
+    mocker.patch("layer.circuit_breaker.CloudWatchMetrics")
+    return dynamodb
+
+
+def get_item(dynamodb):
+    return dynamodb.get_item(TableName=TABLE_NAME, Key={"breakerKey": {"S": KEY}})[
+        "Item"
+    ]
+
+
+def test_breaker_key_from_event():
+    assert circuit_breaker.breaker_key_from_event(failure_event()) == KEY
+
+
+def test_breaker_key_from_queued_event():
+    event = {
+        "Notification": {"State": "QUEUED"},
+        "Finding": {"AwsAccountId": "111111111111", "Resources": [{}]},
+        "AutomationDocument": {
+            "AccountId": "111111111111",
+            "ControlId": "S3.1",
+            "ResourceRegion": "us-east-1",
+        },
+    }
+    assert circuit_breaker.breaker_key_from_event(event) == KEY
+
+
+def test_breaker_key_missing_control():
+    event = failure_event()
+    del event["ControlId"]
+    assert circuit_breaker.breaker_key_from_event(event) is None
+
+
+def test_disabled_without_table(mocker):
+    del os.environ["CIRCUIT_BREAKER_TABLE_NAME"]
+    mock_client = mocker.patch("layer.circuit_breaker.AWSCachedClient")
+
+    circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+
+    assert circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1") is None
+    mock_client.assert_not_called()
+    os.environ["CIRCUIT_BREAKER_TABLE_NAME"] = TABLE_NAME
+
+
+@mock_aws
+def test_opens_after_threshold(mocker):
+    dynamodb = setup_table(mocker)
+
+    for _ in range(2):
+        circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+    assert circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1") is None
+
+    circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+
+    assert get_item(dynamodb)["breakerState"]["S"] == "OPEN"
+    verdict = circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1")
+    assert verdict is not None
+    assert verdict["status"] == "ACCESSDENIED"
+    assert "Unable to assume role" in verdict["message"]
+
+
+@mock_aws
+def test_ignores_unrelated_states(mocker):
+    dynamodb = setup_table(mocker)
+
+    circuit_breaker.record_outcome(failure_event("FAILED"), "FAILED")
+    circuit_breaker.record_outcome(failure_event("NOT_NEW"), "NOT_NEW")
+
+    assert "Item" not in dynamodb.get_item(
+        TableName=TABLE_NAME, Key={"breakerKey": {"S": KEY}}
+    )
+
+
+@mock_aws
+def test_success_closes_breaker(mocker):
+    dynamodb = setup_table(mocker)
+    for _ in range(3):
+        circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+
+    circuit_breaker.record_outcome(failure_event("SUCCESS"), "SUCCESS")
+
+    item = get_item(dynamodb)
+    assert item["breakerState"]["S"] == "CLOSED"
+    assert item["failureCount"]["N"] == "0"
+    assert circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1") is None
+
+
+@mock_aws
+def test_half_open_allows_single_probe(mocker):
+    dynamodb = setup_table(mocker)
+    for _ in range(3):
+        circuit_breaker.record_outcome(failure_event(), "NO_RUNBOOK")
+    dynamodb.update_item(
+        TableName=TABLE_NAME,
+        Key={"breakerKey": {"S": KEY}},
+        UpdateExpression="SET openedAt = :old",
+        ExpressionAttributeValues={":old": {"N": "0"}},
+    )
+
+    first = circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1")
+    second = circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1")
+
+    assert first is None
+    assert get_item(dynamodb)["breakerState"]["S"] == "HALF_OPEN"
+    assert second is not None
+    assert second["status"] == "NOTFOUND"
+
+
+@mock_aws
+def test_failed_probe_reopens_breaker(mocker):
+    dynamodb = setup_table(mocker)
+    for _ in range(3):
+        circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+    dynamodb.update_item(
+        TableName=TABLE_NAME,
+        Key={"breakerKey": {"S": KEY}},
+        UpdateExpression="SET breakerState = :half, probeStartedAt = :now",
+        ExpressionAttributeValues={":half": {"S": "HALF_OPEN"}, ":now": {"N": "1"}},
+    )
+
+    circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+
+    item = get_item(dynamodb)
+    assert item["breakerState"]["S"] == "OPEN"
+    assert "probeStartedAt" not in item
+
+
+@mock_aws
+def test_failed_remediation_probe_reopens_breaker(mocker):
+    dynamodb = setup_table(mocker)
+    for _ in range(3):
+        circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+    dynamodb.update_item(
+        TableName=TABLE_NAME,
+        Key={"breakerKey": {"S": KEY}},
+        UpdateExpression="SET breakerState = :half, probeStartedAt = :now",
+        ExpressionAttributeValues={":half": {"S": "HALF_OPEN"}, ":now": {"N": "1"}},
+    )
+
+    circuit_breaker.record_outcome(failure_event("FAILED"), "FAILED")
+
+    item = get_item(dynamodb)
+    assert item["breakerState"]["S"] == "OPEN"
+    assert "probeStartedAt" not in item
+    verdict = circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1")
+    assert verdict is not None
+    assert verdict["status"] == "ACCESSDENIED"
+
+
+@mock_aws
+def test_failed_remediation_does_not_change_closed_breaker(mocker):
+    dynamodb = setup_table(mocker)
+    circuit_breaker.record_outcome(failure_event(), "ASSUME_ROLE_FAILURE")
+
+    circuit_breaker.record_outcome(failure_event("FAILED"), "FAILED")
+
+    item = get_item(dynamodb)
+    assert item.get("breakerState", {"S": "CLOSED"})["S"] == "CLOSED"
+    assert item["failureCount"]["N"] == "1"
+
+
+def test_check_fails_open_on_error(mocker):
+    mocker.patch(
+        "layer.circuit_breaker.AWSCachedClient"
+    ).return_value.get_connection.return_value.get_item.side_effect = Exception("boom")
+
+    assert circuit_breaker.get_open_verdict("111111111111", "us-east-1", "S3.1") is None
@@ -0,0 +1,128 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import os
+from typing import Any
+
+import boto3
+import pytest
+from layer import claim_check
+from moto import mock_aws
+
+TABLE_NAME = "test-claim-check-table"
+EXECUTION_ID = "arn:aws:states:us-east-1:111111111111:execution:orchestrator:1"
+
+FINDING: dict[str, Any] = {
+    "Id": "arn:aws:securityhub:us-east-1:111111111111:security-control/S3.1/finding/1",
+    "GeneratorId": "security-control/S3.1",
+    "AwsAccountId": "111111111111",
+    "Compliance": {"SecurityControlId": "S3.1", "Status": "FAILED"},
+    "Workflow": {"Status": "NEW"},
+    "ProductFields": {
+        "aws/securityhub/ProductName": "Security Hub",
+        "RelatedAWSResources:0/name": "x" * 2000,
+    },
+    "Resources": [
+        {
+            "Id": "arn:aws:s3:::bucket",
+            "Type": "AwsS3Bucket",
+            "Region": "us-east-1",
+            "Details": {"AwsS3Bucket": {"Owner": "y" * 2000}},
+        }
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def claim_check_environment():
+    os.environ["CLAIM_CHECK_TABLE_NAME"] = TABLE_NAME
+    os.environ["CLAIM_CHECK_THRESHOLD_BYTES"] = "1024"
+    yield
+    os.environ.pop("CLAIM_CHECK_TABLE_NAME", None)
+    os.environ.pop("CLAIM_CHECK_THRESHOLD_BYTES", None)
+
+
+def setup_table(mocker):
+    dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+    dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "claimKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "claimKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    mocker.patch(
+        "layer.claim_check.AWSCachedClient"
+    ).return_value.get_connection.return_value = dynamodb
+    return dynamodb
+
+
+def test_compact_finding():
+    compact = claim_check.compact_finding(FINDING)
+
+    assert compact["Id"] == FINDING["Id"]
+    assert compact["Compliance"] == FINDING["Compliance"]
+    assert compact["ProductFields"] == {"aws/securityhub/ProductName": "Security Hub"}
+    assert compact["Resources"] == [
+        {"Id": "arn:aws:s3:::bucket", "Type": "AwsS3Bucket", "Region": "us-east-1"}
+    ]
+
+
+def test_disabled_without_table(mocker):
+    del os.environ["CLAIM_CHECK_TABLE_NAME"]
+    mock_client = mocker.patch("layer.claim_check.AWSCachedClient")
+    event = {"Finding": FINDING, "ExecutionId": EXECUTION_ID}
+
+    assert claim_check.check_out_finding(event) is FINDING
+    assert claim_check.check_out("key", "z" * 4096) == "z" * 4096
+    mock_client.assert_not_called()
+
+
+def test_small_values_are_not_stored(mocker):
+    mock_client = mocker.patch("layer.claim_check.AWSCachedClient")
+
+    assert claim_check.check_out("key", "small") == "small"
+    mock_client.assert_not_called()
+
+
+@mock_aws
+def test_finding_round_trip(mocker):
+    setup_table(mocker)
+    compact = claim_check.check_out_finding(
+        {"Finding": FINDING, "ExecutionId": EXECUTION_ID}
+    )
+
+    assert claim_check.is_reference(compact[claim_check.CLAIM_CHECK_FIELD])
+    assert "Details" not in compact["Resources"][0]
+
+    event = {"Finding": compact}
+    assert claim_check.resolve_finding(event) == FINDING
+    assert event["Finding"] == FINDING
+
+
+@mock_aws
+def test_output_round_trip(mocker):
+    setup_table(mocker)
+    logdata = '["' + "line " * 1000 + '"]'
+
+    reference = claim_check.check_out("exec-1#LogData", logdata)
+
+    assert claim_check.is_reference(reference)
+    assert claim_check.resolve(reference) == logdata
+
+
+def test_store_failure_passes_full_value(mocker):
+    mocker.patch(
+        "layer.claim_check.AWSCachedClient"
+    ).return_value.get_connection.return_value.put_item.side_effect = Exception("boom")
+
+    assert (
+        claim_check.check_out_finding({"Finding": FINDING, "ExecutionId": EXECUTION_ID})
+        is FINDING
+    )
+
+
+@mock_aws
+def test_missing_claim_check_raises(mocker):
+    setup_table(mocker)
+
+    with pytest.raises(KeyError):
+        claim_check.resolve(claim_check.REFERENCE_PREFIX + "missing")
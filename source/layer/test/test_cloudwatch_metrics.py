@@ -1,9 +1,12 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import json
 import os
+import threading
 
 import boto3
 from botocore.stub import Stubber
+from layer import cloudwatch_metrics
 from layer.cloudwatch_metrics import CloudWatchMetrics
 
 test_data = "test/test_json_data/"
@@ -133,3 +136,130 @@ def test_send_metrics(mocker):
 
     metrics.send_metric(metric_data)
     cloudwatch_s.assert_no_pending_responses()
+
+
+def outcome_metric(outcome):
+    return {
+        "MetricName": "RemediationOutcome",
+        "Dimensions": [{"Name": "Outcome", "Value": outcome}],
+        "Unit": "Count",
+        "Value": 1,
+    }
+
+
+def enabled_metrics(mocker, cloudwatch):
+    ssmc = boto3.client("ssm", region_name=get_region())
+    ssmc_s = Stubber(ssmc)
+    ssmc_s.add_response(
+        "get_parameter", mock_ssm_get_parameter_send_cloudwatch_metrics_yes
+    )
+    ssmc_s.activate()
+    mocker.patch(
+        "layer.cloudwatch_metrics.CloudWatchMetrics.init_ssm_client", return_value=ssmc
+    )
+    mocker.patch(
+        "layer.cloudwatch_metrics.CloudWatchMetrics.init_cloudwatch_client",
+        return_value=cloudwatch,
+    )
+    return CloudWatchMetrics()
+
+
+# ------------------------------------------------------------------------------
+# This test verifies that EMF mode writes metrics to the log without API calls
+# ------------------------------------------------------------------------------
+def test_send_metric_emf(mocker, capsys):
+    mocker.patch.dict(os.environ, {"CLOUDWATCH_METRICS_MODE": "emf"})
+    cloudwatch = boto3.client("cloudwatch")
+    cloudwatch_s = Stubber(cloudwatch)
+    cloudwatch_s.activate()
+    metrics = enabled_metrics(mocker, cloudwatch)
+
+    metrics.send_metric(outcome_metric("SUCCESS"))
+
+    record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert record["_aws"]["CloudWatchMetrics"] == [
+        {
+            "Namespace": "ASR",
+            "Dimensions": [["Outcome"]],
+            "Metrics": [{"Name": "RemediationOutcome", "Unit": "Count"}],
+        }
+    ]
+    assert record["Outcome"] == "SUCCESS"
+    assert record["RemediationOutcome"] == [1]
+    cloudwatch_s.assert_no_pending_responses()
+
+
+# ------------------------------------------------------------------------------
+# This test verifies that buffered mode aggregates metrics into one request
+# ------------------------------------------------------------------------------
+def test_send_metric_buffered(mocker):
+    mocker.patch.dict(os.environ, {"CLOUDWATCH_METRICS_MODE": "buffered"})
+    cloudwatch = boto3.client("cloudwatch")
+    cloudwatch_s = Stubber(cloudwatch)
+    cloudwatch_s.add_response(
+        "put_metric_data",
+        {},
+        {
+            "Namespace": "ASR",
+            "MetricData": [
+                {
+                    "MetricName": "RemediationOutcome",
+                    "Dimensions": [{"Name": "Outcome", "Value": "SUCCESS"}],
+                    "Unit": "Count",
+                    "StatisticValues": {
+                        "SampleCount": 2,
+                        "Sum": 2,
+                        "Minimum": 1,
+                        "Maximum": 1,
+                    },
+                },
+            ],
+        },
+    )
+    cloudwatch_s.activate()
+    metrics = enabled_metrics(mocker, cloudwatch)
+    mocker.patch(
+        "layer.awsapi_cached_client.AWSCachedClient"
+    ).return_value.get_connection.return_value = cloudwatch
+
+    metrics.send_metric(outcome_metric("SUCCESS"))
+    metrics.send_metric(outcome_metric("SUCCESS"))
+    cloudwatch_metrics.flush_metrics()
+
+    cloudwatch_s.assert_no_pending_responses()
+
+
+# ------------------------------------------------------------------------------
+# This test verifies that metrics buffered from concurrent threads are all flushed
+# ------------------------------------------------------------------------------
+def test_buffer_metric_from_threads(mocker):
+    cloudwatch = mocker.patch(
+        "layer.cloudwatch_metrics.metrics_context.get_connection"
+    ).return_value
+
+    def buffer_outcomes():
+        for _ in range(100):
+            cloudwatch_metrics.buffer_metric(outcome_metric("SUCCESS"), "ASR")
+
+    threads = [threading.Thread(target=buffer_outcomes) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cloudwatch_metrics.flush_metrics()
+    cloudwatch_metrics.flush_metrics()
+
+    cloudwatch.put_metric_data.assert_called_once()
+    metric_data = cloudwatch.put_metric_data.call_args.kwargs["MetricData"]
+    assert metric_data[0]["StatisticValues"]["SampleCount"] == 800
+
+
+def test_flush_metrics_on_exit(mocker):
+    flush = mocker.patch("layer.cloudwatch_metrics.flush_metrics")
+
+    @cloudwatch_metrics.flush_metrics_on_exit
+    def handler(event, _):
+        return event
+
+    assert handler({"a": 1}, None) == {"a": 1}
+    flush.assert_called_once()
@@ -0,0 +1,149 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import copy
+import os
+from typing import Any
+
+import boto3
+import pytest
+from layer import finding_dedupe
+from moto import mock_aws
+
+TABLE_NAME = "test-finding-dedupe-table"
+
+FINDING: dict[str, Any] = {
+    "Id": "arn:aws:securityhub:us-east-1:111111111111:subscription/aws-foundational-security-best-practices/v/1.0.0/S3.1/finding/1",
+    "Compliance": {"Status": "FAILED"},
+    "RecordState": "ACTIVE",
+    "Workflow": {"Status": "NEW"},
+    "Severity": {"Label": "MEDIUM"},
+    "Resources": [{"Id": "arn:aws:s3:::bucket", "Region": "us-east-1"}],
+    "UpdatedAt": "2024-08-01T15:22:14.000Z",
+}
+
+
+@pytest.fixture(autouse=True)
+def dedupe_environment():
+    os.environ["FINDING_DEDUPE_TABLE_NAME"] = TABLE_NAME
+    yield
+    os.environ.pop("FINDING_DEDUPE_TABLE_NAME", None)
+    os.environ.pop("FINDING_DEDUPE_FIELDS", None)
+
+
+def setup_table(mocker):
+    dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+    dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "findingId", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "findingId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    mocker.patch(
+        "layer.finding_dedupe.AWSCachedClient"
+    ).return_value.get_connection.return_value = dynamodb
+    return dynamodb
+
+
+def test_hash_ignores_irrelevant_fields():
+    fields = finding_dedupe.get_dedupe_fields()
+    updated = copy.deepcopy(FINDING)
+    updated["UpdatedAt"] = "2024-08-02T15:22:14.000Z"
+
+    assert finding_dedupe.compute_finding_hash(
+        FINDING, fields
+    ) == finding_dedupe.compute_finding_hash(updated, fields)
+
+
+def test_hash_includes_configured_fields():
+    os.environ["FINDING_DEDUPE_FIELDS"] = "UpdatedAt"
+    fields = finding_dedupe.get_dedupe_fields()
+    updated = copy.deepcopy(FINDING)
+    updated["UpdatedAt"] = "2024-08-02T15:22:14.000Z"
+
+    assert fields == ["UpdatedAt"]
+    assert finding_dedupe.compute_finding_hash(
+        FINDING, fields
+    ) != finding_dedupe.compute_finding_hash(updated, fields)
+
+
+def test_disabled_without_table(mocker):
+    del os.environ["FINDING_DEDUPE_TABLE_NAME"]
+    mock_client = mocker.patch("layer.finding_dedupe.AWSCachedClient")
+
+    assert finding_dedupe.is_duplicate(FINDING) is False
+    mock_client.assert_not_called()
+
+
+@mock_aws
+def test_drops_duplicate_event(mocker):
+    setup_table(mocker)
+    mock_metrics = mocker.patch("layer.finding_dedupe.CloudWatchMetrics")
+    updated = copy.deepcopy(FINDING)
+    updated["UpdatedAt"] = "2024-08-02T15:22:14.000Z"
+
+    assert finding_dedupe.is_duplicate(FINDING) is False
+    assert finding_dedupe.is_duplicate(updated) is True
+
+    sent = [
+        c.args[0]["Value"] for c in mock_metrics.return_value.send_metric.call_args_list
+    ]
+    assert sent == [0, 1]
+
+
+@mock_aws
+def test_passes_state_change(mocker):
+    setup_table(mocker)
+    mocker.patch("layer.finding_dedupe.CloudWatchMetrics")
+    changed = copy.deepcopy(FINDING)
+    changed["Compliance"]["Status"] = "PASSED"
+
+    assert finding_dedupe.is_duplicate(FINDING) is False
+    assert finding_dedupe.is_duplicate(changed) is False
+    assert finding_dedupe.is_duplicate(FINDING) is False
+
+
+@mock_aws
+def test_passes_after_expiry(mocker):
+    dynamodb = setup_table(mocker)
+    mocker.patch("layer.finding_dedupe.CloudWatchMetrics")
+    finding_dedupe.is_duplicate(FINDING)
+    dynamodb.update_item(
+        TableName=TABLE_NAME,
+        Key={"findingId": {"S": FINDING["Id"]}},
+        UpdateExpression="SET expireAt = :old",
+        ExpressionAttributeValues={":old": {"N": "0"}},
+    )
+
+    assert finding_dedupe.is_duplicate(FINDING) is False
+
+
+@mock_aws
+def test_passes_retry_in_the_same_execution(mocker):
+    setup_table(mocker)
+    mocker.patch("layer.finding_dedupe.CloudWatchMetrics")
+
+    assert finding_dedupe.is_duplicate(FINDING, "execution-1") is False
+    assert finding_dedupe.is_duplicate(FINDING, "execution-1") is False
+    assert finding_dedupe.is_duplicate(FINDING, "execution-2") is True
+
+
+@mock_aws
+def test_forget_removes_only_own_hash(mocker):
+    setup_table(mocker)
+    mocker.patch("layer.finding_dedupe.CloudWatchMetrics")
+    finding_dedupe.is_duplicate(FINDING, "execution-1")
+
+    finding_dedupe.forget(FINDING, "execution-2")
+    assert finding_dedupe.is_duplicate(FINDING, "execution-3") is True
+
+    finding_dedupe.forget(FINDING, "execution-3")
+    finding_dedupe.forget(FINDING, "execution-1")
+    assert finding_dedupe.is_duplicate(FINDING, "execution-4") is False
+
+
+def test_fails_open_on_error(mocker):
+    mocker.patch(
+        "layer.finding_dedupe.AWSCachedClient"
+    ).return_value.get_connection.return_value.put_item.side_effect = Exception("boom")
+
+    assert finding_dedupe.is_duplicate(FINDING) is False
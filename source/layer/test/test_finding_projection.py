@@ -0,0 +1,98 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import base64
+import json
+import os
+import zlib
+from typing import Any
+
+import pytest
+from layer import finding_projection
+
+DETAILS = {"AwsEc2SecurityGroup": {"IpPermissions": [{"FromPort": 22}] * 500}}
+
+FINDING: dict[str, Any] = {
+    "Id": "arn:aws:securityhub:us-east-1:111111111111:security-control/EC2.19/finding/1",
+    "ProductArn": "arn:aws:securityhub:us-east-1::product/aws/securityhub",
+    "AwsAccountId": "111111111111",
+    "Title": "EC2.19 Security groups should not allow unrestricted access",
+    "Compliance": {"SecurityControlId": "EC2.19", "Status": "FAILED"},
+    "ProductFields": {
+        "RelatedAWSResources:0/type": "AWS::Config::ConfigRule",
+        "RelatedAWSResources:0/name": "securityhub-restricted-common-ports",
+        "aws/securityhub/annotation": "annotation",
+    },
+    "Resources": [
+        {
+            "Id": "arn:aws:ec2:us-east-1:111111111111:security-group/sg-1",
+            "Type": "AwsEc2SecurityGroup",
+            "Partition": "aws",
+            "Region": "us-east-1",
+            "Tags": {"Owner": "team"},
+            "Details": DETAILS,
+        },
+        {"Id": "arn:aws:ec2:us-east-1:111111111111:vpc/vpc-1", "Type": "AwsEc2Vpc"},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def projection_environment():
+    yield
+    os.environ.pop("FINDING_DETAILS_MODE", None)
+    os.environ.pop("FINDING_DETAILS_COMPRESS_BYTES", None)
+
+
+def test_project_finding():
+    projected = finding_projection.project_finding(FINDING)
+
+    assert projected == {
+        "Id": FINDING["Id"],
+        "ProductArn": FINDING["ProductArn"],
+        "AwsAccountId": "111111111111",
+        "ProductFields": {
+            "RelatedAWSResources:0/type": "AWS::Config::ConfigRule",
+            "RelatedAWSResources:0/name": "securityhub-restricted-common-ports",
+        },
+        "Resources": [
+            {
+                "Id": "arn:aws:ec2:us-east-1:111111111111:security-group/sg-1",
+                "Type": "AwsEc2SecurityGroup",
+                "Partition": "aws",
+                "Region": "us-east-1",
+                "Details": DETAILS,
+            }
+        ],
+    }
+
+
+def test_omit_details():
+    os.environ["FINDING_DETAILS_MODE"] = "omit"
+
+    projected = finding_projection.project_finding(FINDING)
+
+    assert "Details" not in projected["Resources"][0]
+
+
+def test_compress_large_details():
+    os.environ["FINDING_DETAILS_MODE"] = "compressed"
+
+    resource = finding_projection.project_finding(FINDING)["Resources"][0]
+
+    assert resource["DetailsEncoding"] == "zlib+base64"
+    assert json.loads(zlib.decompress(base64.b64decode(resource["Details"]))) == DETAILS
+
+
+def test_small_details_are_not_compressed():
+    os.environ["FINDING_DETAILS_COMPRESS_BYTES"] = str(1024 * 1024)
+
+    resource = finding_projection.project_finding(FINDING, "compressed")["Resources"][0]
+
+    assert resource["Details"] == DETAILS
+    assert "DetailsEncoding" not in resource
+
+
+def test_unknown_mode_sends_details():
+    os.environ["FINDING_DETAILS_MODE"] = "gzip"
+
+    assert finding_projection.get_details_mode() == "full"
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 import os
+import threading
 import urllib.parse
 from unittest.mock import MagicMock, patch
 from urllib.error import HTTPError, URLError
@@ -16,6 +17,7 @@ os.environ["STACK_ID"] = MOCK_STACK_ID
 
 import boto3
 import pytest
+from layer import metrics as metrics_module
 from layer.metrics import Metrics
 from moto import mock_aws
 
@@ -355,8 +357,8 @@ def test_post_metrics_to_api_success():
     metrics = Metrics()
     request_data = {"test": "data"}
 
-    with patch("layer.metrics.urlopen") as mock_urlopen, patch(
-        "layer.metrics.Request"
+    with patch("urllib.request.urlopen") as mock_urlopen, patch(
+        "urllib.request.Request"
     ) as mock_request:
 
         # ACT
@@ -381,7 +383,7 @@ def test_post_metrics_to_api_http_error():
     metrics = Metrics()
     mock_data = {"Solution": "SO0111", "UUID": "test-uuid", "Data": {}}
 
-    with patch("layer.metrics.urlopen") as mock_urlopen:
+    with patch("urllib.request.urlopen") as mock_urlopen:
         mock_urlopen.side_effect = HTTPError(
             url="test_url", code=404, msg="Not Found", hdrs={}, fp=None  # type: ignore
         )
@@ -397,7 +399,7 @@ def test_post_metrics_to_api_url_error():
     metrics = Metrics()
     mock_data = {"Solution": "SO0111", "UUID": "test-uuid", "Data": {}}
 
-    with patch("layer.metrics.urlopen") as mock_urlopen:
+    with patch("urllib.request.urlopen") as mock_urlopen:
         mock_urlopen.side_effect = URLError("Test URL Error")
 
         # ACT & ASSERT
@@ -465,3 +467,79 @@ def test_get_status_for_metrics_unknown_failure():
     status, reason = Metrics.get_status_for_metrics("UNKNOWN_STATUS")
     assert status == "FAILED"
     assert reason == "UNKNOWN"
+
+
+@mock_aws
+def test_enqueue_metrics_delivers_in_background():
+    """Test queued metrics are posted by the delivery thread"""
+    # ARRANGE
+    metrics = Metrics()
+
+    with patch.object(metrics, "post_metrics_to_api") as mock_post:
+        # ACT
+        metrics.enqueue_metrics({"test": "data"})
+        delivered = metrics_module.flush_metrics_queue(5)
+
+        # ASSERT
+        assert delivered is True
+        mock_post.assert_called_once()
+        assert mock_post.call_args[0][0]["Data"] == {"test": "data"}
+
+
+@mock_aws
+def test_flush_metrics_queue_respects_budget():
+    """Test flushing returns when delivery takes longer than the budget"""
+    # ARRANGE
+    metrics = Metrics()
+    release = threading.Event()
+
+    with patch.object(
+        metrics, "post_metrics_to_api", side_effect=lambda _: release.wait(5)
+    ):
+        # ACT
+        metrics.enqueue_metrics({"test": "data"})
+        delivered = metrics_module.flush_metrics_queue(0.05)
+
+        # ASSERT
+        assert delivered is False
+        release.set()
+        assert metrics_module.flush_metrics_queue(5) is True
+
+
+@mock_aws
+def test_enqueue_metrics_counts_dropped_records():
+    """Test records are counted as dropped when delivery fails"""
+    # ARRANGE
+    metrics = Metrics()
+    dropped = metrics_module.get_dropped_count()
+
+    with patch.object(
+        metrics, "post_metrics_to_api", side_effect=Exception("timed out")
+    ):
+        # ACT
+        metrics.enqueue_metrics({"test": "data"})
+        metrics_module.flush_metrics_queue(5)
+
+    # ASSERT
+    assert metrics_module.get_dropped_count() == dropped + 1
+
+
+@mock_aws
+def test_flush_metrics_queue_logs_dropped_records():
+    """Test the records dropped since the last flush are logged once"""
+    # ARRANGE
+    metrics = Metrics()
+    metrics_module.flush_metrics_queue(5)
+
+    with patch.object(
+        metrics, "post_metrics_to_api", side_effect=Exception("timed out")
+    ), patch.object(metrics_module, "logger") as mock_logger:
+        # ACT
+        metrics.enqueue_metrics({"test": "data"})
+        metrics.enqueue_metrics({"test": "data"})
+        metrics_module.flush_metrics_queue(5)
+        metrics_module.flush_metrics_queue(5)
+
+    # ASSERT
+    mock_logger.warning.assert_called_once()
+    assert mock_logger.warning.call_args.kwargs["dropped"] == 2
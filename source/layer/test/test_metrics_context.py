@@ -0,0 +1,103 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import os
+from unittest.mock import MagicMock
+
+import boto3
+from layer import metrics_context
+from layer.cloudwatch_metrics import CloudWatchMetrics
+from layer.metrics import Metrics
+from moto import mock_aws
+
+
+def test_value_is_cached():
+    loader = MagicMock(return_value="v1.2.0")
+
+    assert metrics_context.get_cached_value("version", loader) == "v1.2.0"
+    assert metrics_context.get_cached_value("version", loader) == "v1.2.0"
+    loader.assert_called_once()
+
+
+def test_value_expires_after_ttl():
+    os.environ["METRICS_CONTEXT_TTL_SECONDS"] = "0"
+    loader = MagicMock(side_effect=["v1.2.0", "v1.3.0"])
+
+    try:
+        assert metrics_context.get_cached_value("version", loader) == "v1.2.0"
+        assert metrics_context.get_cached_value("version", loader) == "v1.3.0"
+    finally:
+        del os.environ["METRICS_CONTEXT_TTL_SECONDS"]
+
+
+def test_non_expiring_value_ignores_ttl():
+    os.environ["METRICS_CONTEXT_TTL_SECONDS"] = "0"
+    loader = MagicMock(return_value="uuid")
+
+    try:
+        metrics_context.get_cached_value("uuid", loader, expires=False)
+        metrics_context.get_cached_value("uuid", loader, expires=False)
+    finally:
+        del os.environ["METRICS_CONTEXT_TTL_SECONDS"]
+    loader.assert_called_once()
+
+
+def test_unknown_value_is_not_cached():
+    loader = MagicMock(side_effect=["unknown", "uuid"])
+
+    assert metrics_context.get_cached_value("uuid", loader) == "unknown"
+    assert metrics_context.get_cached_value("uuid", loader) == "uuid"
+
+
+@mock_aws
+def test_parameters_are_read_once_per_environment(mocker):
+    ssm = boto3.client("ssm", region_name="us-east-1")
+    ssm.put_parameter(
+        Name="/Solutions/SO0111/version", Value="v1.2.0TEST", Type="String"
+    )
+    ssm.put_parameter(
+        Name="/Solutions/SO0111/sendCloudwatchMetrics", Value="No", Type="String"
+    )
+    get_parameter = mocker.spy(ssm, "get_parameter")
+    put_parameter = mocker.spy(ssm, "put_parameter")
+    mocker.patch(
+        "layer.awsapi_cached_client.AWSCachedClient"
+    ).return_value.get_connection.return_value = ssm
+
+    first = Metrics()
+    second = Metrics()
+    CloudWatchMetrics()
+    CloudWatchMetrics()
+
+    assert first.solution_uuid == second.solution_uuid
+    assert second.solution_version == "v1.2.0TEST"
+    # UUID (not found), deprecated UUID, version and sendCloudwatchMetrics
+    assert get_parameter.call_count == 4
+    put_parameter.assert_called_once()
+
+
+@mock_aws
+def test_failed_read_of_send_cloudwatch_metrics_is_not_cached(mocker):
+    ssm = boto3.client("ssm", region_name="us-east-1")
+    mocker.patch(
+        "layer.awsapi_cached_client.AWSCachedClient"
+    ).return_value.get_connection.return_value = ssm
+
+    assert CloudWatchMetrics().metrics_enabled is False
+
+    ssm.put_parameter(
+        Name="/Solutions/SO0111/sendCloudwatchMetrics", Value="Yes", Type="String"
+    )
+    assert CloudWatchMetrics().metrics_enabled is True
+
+
+@mock_aws
+def test_clients_are_shared_per_environment(mocker):
+    ssm = boto3.client("ssm", region_name="us-east-1")
+    cached_client = mocker.patch("layer.awsapi_cached_client.AWSCachedClient")
+    cached_client.return_value.get_connection.return_value = ssm
+
+    Metrics()
+    Metrics()
+    CloudWatchMetrics()
+
+    cached_client.assert_called_once()
@@ -0,0 +1,210 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import json
+import os
+
+import boto3
+import pytest
+from layer import notification_digest, sechub_findings
+from moto import mock_aws
+
+TABLE_NAME = "test-notification-digest-table"
+
+
+@pytest.fixture(autouse=True)
+def digest_environment():
+    os.environ["SNS_DIGEST_WINDOW_SECONDS"] = "300"
+    os.environ["NOTIFICATION_DIGEST_TABLE_NAME"] = TABLE_NAME
+    yield
+    os.environ.pop("SNS_DIGEST_WINDOW_SECONDS", None)
+    os.environ.pop("SNS_DIGEST_SAMPLE_SIZE", None)
+    os.environ.pop("NOTIFICATION_DIGEST_TABLE_NAME", None)
+
+
+@pytest.fixture
+def dynamodb():
+    with mock_aws():
+        dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+        dynamodb.create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[{"AttributeName": "digestKey", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "digestKey", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield dynamodb
+
+
+@pytest.fixture
+def sns(mocker, dynamodb):
+    sns_client = mocker.Mock()
+    sns_client.publish_batch.side_effect = lambda **kwargs: {
+        "Successful": [
+            {"Id": entry["Id"]} for entry in kwargs["PublishBatchRequestEntries"]
+        ]
+    }
+    aws = mocker.patch("layer.notification_digest.AWSCachedClient").return_value
+    aws.account = "111111111111"
+    aws.get_connection.side_effect = lambda service, *_: (
+        dynamodb if service == "dynamodb" else sns_client
+    )
+    return sns_client
+
+
+def notification(status, message="Remediation succeeded"):
+    return {
+        "Remediation_Status": status,
+        "Severity": "INFO",
+        "Message": message,
+        "Remediation_Output": "x" * 1000,
+        "Finding": {"finding_id": "finding-1"},
+    }
+
+
+def digest_keys(dynamodb):
+    items = dynamodb.scan(TableName=TABLE_NAME)["Items"]
+    return [item["digestKey"]["S"] for item in items]
+
+
+def test_is_digested():
+    assert notification_digest.is_digested("INFO")
+    assert not notification_digest.is_digested("ERROR")
+
+    del os.environ["NOTIFICATION_DIGEST_TABLE_NAME"]
+    assert not notification_digest.is_digested("INFO")
+
+    os.environ["NOTIFICATION_DIGEST_TABLE_NAME"] = TABLE_NAME
+    del os.environ["SNS_DIGEST_WINDOW_SECONDS"]
+    assert not notification_digest.is_digested("INFO")
+
+
+def test_digest_is_held_for_window(sns, dynamodb):
+    assert notification_digest.add("INFO", "AFSBP", "S3.1", notification("SUCCESS"))
+
+    sns.publish_batch.assert_not_called()
+    assert digest_keys(dynamodb) == ["INFO#AFSBP"]
+
+
+def test_flush_publishes_aggregate(sns, dynamodb):
+    os.environ["SNS_DIGEST_SAMPLE_SIZE"] = "2"
+    for status in ["SUCCESS", "SUCCESS", "FAILED"]:
+        notification_digest.add("INFO", "AFSBP", "S3.1", notification(status))
+    notification_digest.add("INFO", "AFSBP", "EC2.19", notification("SUCCESS"))
+
+    assert notification_digest.flush(force=True) == 1
+
+    entries = sns.publish_batch.call_args.kwargs["PublishBatchRequestEntries"]
+    digest = json.loads(entries[0]["Message"])["Digest"]
+    assert digest["Severity"] == "INFO"
+    assert digest["Standard"] == "AFSBP"
+    assert digest["Count"] == 4
+    assert digest["Outcomes"] == {
+        "S3.1": {"SUCCESS": 2, "FAILED": 1},
+        "EC2.19": {"SUCCESS": 1},
+    }
+    assert len(digest["Samples"]) == 2
+    assert "Remediation_Output" not in digest["Samples"][0]
+    assert digest_keys(dynamodb) == []
+
+
+def test_digest_outlives_the_invocation(sns, dynamodb):
+    @notification_digest.flush_on_exit
+    def handler(status):
+        notification_digest.add("INFO", "AFSBP", "S3.1", notification(status))
+
+    handler("SUCCESS")
+    handler("FAILED")
+    sns.publish_batch.assert_not_called()
+
+    os.environ["SNS_DIGEST_WINDOW_SECONDS"] = "1"
+    dynamodb.update_item(
+        TableName=TABLE_NAME,
+        Key={"digestKey": {"S": "INFO#AFSBP"}},
+        UpdateExpression="SET startedAt = :started",
+        ExpressionAttributeValues={":started": {"N": "0"}},
+    )
+    handler("SUCCESS")
+
+    entries = sns.publish_batch.call_args.kwargs["PublishBatchRequestEntries"]
+    assert json.loads(entries[0]["Message"])["Digest"]["Count"] == 3
+
+
+def test_due_digests_are_published_in_batches(sns, dynamodb):
+    os.environ["SNS_DIGEST_WINDOW_SECONDS"] = "1"
+    for index in range(12):
+        dynamodb.put_item(
+            TableName=TABLE_NAME,
+            Item={
+                "digestKey": {"S": f"INFO#standard-{index}"},
+                "severity": {"S": "INFO"},
+                "standard": {"S": f"standard-{index}"},
+                "startedAt": {"N": "0"},
+                "notificationCount": {"N": "1"},
+            },
+        )
+
+    assert notification_digest.flush() == 12
+    assert sns.publish_batch.call_count == 2
+    assert digest_keys(dynamodb) == []
+
+
+def test_digest_taken_during_add_is_not_recreated(mocker, sns, dynamodb):
+    update_item = dynamodb.update_item
+
+    def update_then_take(**kwargs):
+        response = update_item(**kwargs)
+        # Another invocation takes the digest between the count and sample updates
+        dynamodb.delete_item(TableName=TABLE_NAME, Key=kwargs["Key"])
+        return response
+
+    mocker.patch.object(dynamodb, "update_item", side_effect=update_then_take)
+
+    assert notification_digest.add("INFO", "AFSBP", "S3.1", notification("SUCCESS"))
+    assert digest_keys(dynamodb) == []
+
+
+def test_digest_without_start_is_skipped(sns, dynamodb):
+    dynamodb.put_item(
+        TableName=TABLE_NAME,
+        Item={
+            "digestKey": {"S": "INFO#AFSBP"},
+            "samples": {"L": [{"S": "{}"}]},
+        },
+    )
+
+    assert notification_digest.flush(force=True) == 0
+    sns.publish_batch.assert_not_called()
+
+
+def test_error_notifications_are_published_immediately(mocker, sns, dynamodb):
+    mocker.patch("layer.sechub_findings.publish_to_sns", return_value="message-id")
+    mocker.patch("layer.applogger.get_log_handler")
+
+    for severity in ["INFO", "ERROR"]:
+        asr_notification = sechub_findings.ASRNotification(
+            "AFSBP", "us-east-1", "execution-id", "S3.1"
+        )
+        asr_notification.severity = severity
+        asr_notification.send_to_sns = True
+        asr_notification.notify()
+
+    sechub_findings.publish_to_sns.assert_called_once()  # type: ignore[attr-defined]
+    assert digest_keys(dynamodb) == ["INFO#AFSBP"]
+
+
+def test_notification_is_published_when_digest_fails(mocker):
+    mocker.patch("layer.sechub_findings.publish_to_sns", return_value="message-id")
+    mocker.patch("layer.applogger.get_log_handler")
+    mocker.patch(
+        "layer.notification_digest.AWSCachedClient"
+    ).return_value.get_connection.return_value.update_item.side_effect = Exception(
+        "table unavailable"
+    )
+
+    asr_notification = sechub_findings.ASRNotification(
+        "AFSBP", "us-east-1", "execution-id", "S3.1"
+    )
+    asr_notification.severity = "INFO"
+    asr_notification.send_to_sns = True
+    asr_notification.notify()
+
+    sechub_findings.publish_to_sns.assert_called_once()  # type: ignore[attr-defined]
@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import os
+from typing import Any
+
+import boto3
+import pytest
+from layer import remediation_cooldown
+from moto import mock_aws
+
+TABLE_NAME = "test-remediation-cooldown-table"
+KEY = "arn:aws:s3:::bucket#S3.1"
+
+EVENT: dict[str, Any] = {
+    "Notification": {"State": "SUCCESS"},
+    "Finding": {
+        "Compliance": {"SecurityControlId": "S3.1"},
+        "Resources": [{"Id": "arn:aws:s3:::bucket", "Region": "us-east-1"}],
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def cooldown_environment():
+    os.environ["REMEDIATION_COOLDOWN_TABLE_NAME"] = TABLE_NAME
+    os.environ["REMEDIATION_COOLDOWN_SECONDS"] = "3600"
+    yield
+    os.environ.pop("REMEDIATION_COOLDOWN_TABLE_NAME", None)
+    os.environ.pop("REMEDIATION_COOLDOWN_SECONDS", None)
+    os.environ.pop("REMEDIATION_COOLDOWN_CONTROL_SECONDS", None)
+
+
+def setup_table(mocker):
+    dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+    dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "cooldownKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "cooldownKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    mocker.patch(
+        "layer.remediation_cooldown.AWSCachedClient"
+    ).return_value.get_connection.return_value = dynamodb
+    return dynamodb
+
+
+def test_cooldown_key_from_event():
+    assert remediation_cooldown.cooldown_key_from_event(EVENT) == KEY
+
+
+def test_cooldown_seconds_per_control():
+    os.environ["REMEDIATION_COOLDOWN_CONTROL_SECONDS"] = '{"S3.1": 600, "S3.2": 0}'
+
+    assert remediation_cooldown.get_cooldown_seconds("S3.1") == 600
+    assert remediation_cooldown.get_cooldown_seconds("S3.2") == 0
+    assert remediation_cooldown.get_cooldown_seconds("S3.5") == 3600
+
+
+def test_no_cooldown_by_default():
+    del os.environ["REMEDIATION_COOLDOWN_SECONDS"]
+
+    assert remediation_cooldown.get_cooldown_seconds("S3.1") == 0
+
+
+def test_invalid_control_seconds_uses_default():
+    os.environ["REMEDIATION_COOLDOWN_CONTROL_SECONDS"] = "S3.1=600"
+
+    assert remediation_cooldown.get_cooldown_seconds("S3.1") == 3600
+
+
+def test_disabled_without_table(mocker):
+    del os.environ["REMEDIATION_COOLDOWN_TABLE_NAME"]
+    mock_client = mocker.patch("layer.remediation_cooldown.AWSCachedClient")
+
+    remediation_cooldown.start_cooldown(EVENT)
+
+    assert remediation_cooldown.get_active_cooldown(EVENT) is None
+    mock_client.assert_not_called()
+
+
+@mock_aws
+def test_cooldown_after_success(mocker):
+    setup_table(mocker)
+    assert remediation_cooldown.get_active_cooldown(EVENT) is None
+
+    remediation_cooldown.start_cooldown(EVENT)
+
+    cooldown = remediation_cooldown.get_active_cooldown(EVENT)
+    assert cooldown is not None
+    assert cooldown["status"] == "COOLDOWN"
+    assert KEY in cooldown["message"]
+
+
+@mock_aws
+def test_expired_cooldown_allows_execution(mocker):
+    dynamodb = setup_table(mocker)
+    remediation_cooldown.start_cooldown(EVENT)
+    dynamodb.update_item(
+        TableName=TABLE_NAME,
+        Key={"cooldownKey": {"S": KEY}},
+        UpdateExpression="SET expireAt = :old",
+        ExpressionAttributeValues={":old": {"N": "0"}},
+    )
+
+    assert remediation_cooldown.get_active_cooldown(EVENT) is None
+
+
+@mock_aws
+def test_control_without_cooldown(mocker):
+    dynamodb = setup_table(mocker)
+    os.environ["REMEDIATION_COOLDOWN_CONTROL_SECONDS"] = '{"S3.1": 0}'
+
+    remediation_cooldown.start_cooldown(EVENT)
+
+    assert dynamodb.scan(TableName=TABLE_NAME)["Count"] == 0
+
+
+def test_check_fails_open_on_error(mocker):
+    mocker.patch(
+        "layer.remediation_cooldown.AWSCachedClient"
+    ).return_value.get_connection.return_value.get_item.side_effect = Exception("boom")
+
+    assert remediation_cooldown.get_active_cooldown(EVENT) is None
@@ -439,6 +439,46 @@ def test_security_control(mocker):
     assert finding.standard_control == "EC2.7"
 
 
+def resolved_finding(finding_id):
+    return {
+        "finding_id": finding_id,
+        "standard_name": "aws-foundational-security-best-practices",
+        "standard_shortname": "AFSBP",
+        "standard_version": "1.0.0",
+        "standard_control": "EC2.7",
+        "remediation_control": "EC2.7",
+        "playbook_enabled": "True",
+        "account_id": "111111111111",
+        "resource_region": "us-east-1",
+    }
+
+
+def test_rehydrate_resolved_finding(mocker):
+    test_data_in = open(test_data + "afsbp-ec2.7.json")
+    finding_json = json.loads(test_data_in.read())["detail"]["findings"][0]
+    test_data_in.close()
+    mock_ssm = mocker.patch("layer.sechub_findings.get_ssm_connection")
+    resolved = resolved_finding(finding_json["Id"])
+
+    finding = findings.Finding(finding_json, resolved)
+
+    mock_ssm.assert_not_called()
+    assert finding.standard_shortname == "AFSBP"
+    assert finding.playbook_enabled == "True"
+    assert finding.to_resolved() == resolved
+
+
+def test_resolved_finding_for_other_finding_is_ignored(mocker):
+    test_data_in = open(test_data + "afsbp-ec2.7.json")
+    finding_json = json.loads(test_data_in.read())["detail"]["findings"][0]
+    test_data_in.close()
+    mock_ssm = mocker.patch("layer.sechub_findings.get_ssm_connection")
+
+    findings.Finding(finding_json, resolved_finding("other-finding"))
+
+    assert mock_ssm.call_count == 3
+
+
 def test_update_text_and_status_productv2_arn_replacement(mocker):
     """Test that ProductArn is converted from 'product' to 'productv2' for v2 API and kept as 'product' for v1 API"""
     os.environ["SECURITY_HUB_V2_ENABLED"] = "true"
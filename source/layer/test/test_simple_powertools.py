@@ -1,11 +1,17 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 import os
 from unittest.mock import MagicMock, patch
 
 import pytest
-from layer.powertools_logger import PowertoolsLogger, get_logger
+from layer.powertools_logger import (
+    TRUNCATION_MARKER,
+    PowertoolsLogger,
+    get_logger,
+    project_fields,
+)
 from layer.tracer_utils import PowertoolsTracer, get_tracer, init_tracer, tracer
 
 
@@ -18,6 +24,7 @@ class TestSimplePowertoolsLogger:
 
         logger2 = get_logger("test_service", "debug")
         assert logger2.service_name == "test_service"
+        assert get_logger("test_service", "DEBUG") is logger2
 
     def test_all_logging_methods(self):
         logger = get_logger("test_service", "debug")
@@ -262,3 +269,52 @@ class TestIntegration:
         assert tracer_instance is not None
         assert logger.service_name == "compat_test"
         assert tracer_instance.service_name == "compat_test"
+
+
+class TestLogProjection:
+
+    finding = {
+        "Id": "arn:aws:securityhub:us-east-1:111111111111:security-control/S3.1/finding/1",
+        "AwsAccountId": "111111111111",
+        "Compliance": {"SecurityControlId": "S3.1"},
+        "Resources": [{"Details": {"Large": "x" * 10000}}],
+    }
+
+    def test_finding_is_projected(self):
+        fields = project_fields({"Finding": self.finding, "EventType": "Imported"})
+
+        assert fields == {
+            "Finding": {
+                "Id": self.finding["Id"],
+                "ControlId": "S3.1",
+                "AwsAccountId": "111111111111",
+            },
+            "EventType": "Imported",
+        }
+
+    def test_large_field_is_truncated(self):
+        with patch.dict(os.environ, {"LOG_MAX_FIELD_LENGTH": "100"}):
+            fields = project_fields(
+                {"extra": {"output": "y" * 1000}, "details": {"a": "z" * 1000}}
+            )
+
+        assert fields["extra"]["output"] == "y" * 100 + TRUNCATION_MARKER
+        assert fields["details"].endswith(TRUNCATION_MARKER)
+        assert len(fields["details"]) == 100 + len(TRUNCATION_MARKER)
+
+    def test_log_event_samples_full_event(self):
+        logger = get_logger("sample_test", "info")
+        logger.logger = MagicMock()
+        logger.logger.log_level = logging.INFO
+        event = {"Finding": self.finding}
+
+        with patch.dict(os.environ, {"LOG_EVENT_SAMPLE_RATE": "0"}):
+            logger.log_event("Processing", event)
+        assert logger.logger.info.call_count == 1
+
+        with patch.dict(os.environ, {"LOG_EVENT_SAMPLE_RATE": "1"}):
+            logger.log_event("Processing", event)
+        assert logger.logger.info.call_args.kwargs["extra"] == {
+            "event": event,
+            "sampled": True,
+        }
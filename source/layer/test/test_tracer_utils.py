@@ -39,6 +39,33 @@ class TestTracerInitialization:
         assert isinstance(tracer_instance, PowertoolsTracer)
 
 
+class TestDeferredTracer:
+    def test_init_tracer_returns_shared_instance(self):
+        assert init_tracer("SHARED_SERVICE") is init_tracer("SHARED_SERVICE")
+        assert init_tracer("SHARED_SERVICE") is not init_tracer("OTHER_SERVICE")
+
+    @patch("layer.tracer_utils.Tracer")
+    def test_tracer_is_created_on_first_invocation(self, mock_tracer_class):
+        tracer_instance = PowertoolsTracer("deferred_service")
+        mock_tracer = mock_tracer_class.return_value
+        mock_tracer.capture_lambda_handler.side_effect = lambda handler: handler
+
+        @tracer_instance.capture_lambda_handler
+        def test_handler(event, context):
+            return event
+
+        mock_tracer_class.assert_not_called()
+
+        assert test_handler({"a": 1}, Mock()) == {"a": 1}
+        assert test_handler({"a": 2}, Mock()) == {"a": 2}
+
+        mock_tracer_class.assert_called_once_with(
+            service="deferred_service", auto_patch=False
+        )
+        mock_tracer.patch.assert_called_once_with(["botocore"])
+        mock_tracer.capture_lambda_handler.assert_called_once()
+
+
 class TestPowertoolsTracerClass:
 
     def test_tracer_class_initialization(self):
@@ -1,16 +1,41 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+"""
+X-Ray tracing for the solution's Lambda functions.
+
+Creating a Powertools Tracer imports the X-Ray SDK, and auto-patching imports and
+patches every library the SDK supports. Both are deferred until a tracer is first
+used, usually the first invocation of a handler decorated with
+capture_lambda_handler, and only botocore is patched. init_tracer returns one
+PowertoolsTracer per service name.
+"""
+import functools
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from aws_lambda_powertools import Tracer
 
+PATCH_MODULES = ["botocore"]
+
+_tracers: Dict[str, "PowertoolsTracer"] = {}
+
 
 class PowertoolsTracer:
 
     def __init__(self, service_name: Optional[str] = None):
         self.service_name = service_name or os.getenv("POWERTOOLS_SERVICE_NAME", "ASR")
-        self.tracer = Tracer(service=self.service_name, auto_patch=True)
+        self._tracer: Optional[Tracer] = None
+
+    @property
+    def tracer(self) -> Tracer:
+        if self._tracer is None:
+            self._tracer = Tracer(service=self.service_name, auto_patch=False)
+            self._tracer.patch(PATCH_MODULES)
+        return self._tracer
+
+    @tracer.setter
+    def tracer(self, value: Tracer) -> None:
+        self._tracer = value
 
     def put_annotation(self, key: str, value: str) -> None:
         try:
@@ -58,8 +83,19 @@ class PowertoolsTracer:
         except Exception:
             pass
 
-    def capture_lambda_handler(self, lambda_handler):
-        return self.tracer.capture_lambda_handler(lambda_handler)
+    def capture_lambda_handler(
+        self, lambda_handler: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        traced_handler: Optional[Callable[..., Any]] = None
+
+        @functools.wraps(lambda_handler)
+        def wrapper(event: Any, context: Any) -> Any:
+            nonlocal traced_handler
+            if traced_handler is None:
+                traced_handler = self.tracer.capture_lambda_handler(lambda_handler)
+            return traced_handler(event, context)
+
+        return wrapper
 
     @property
     def trace(self) -> Tracer:
@@ -67,7 +103,10 @@ class PowertoolsTracer:
 
 
 def init_tracer(service_name: Optional[str] = None) -> PowertoolsTracer:
-    return PowertoolsTracer(service_name)
+    name = service_name or os.getenv("POWERTOOLS_SERVICE_NAME") or "ASR"
+    if name not in _tracers:
+        _tracers[name] = PowertoolsTracer(name)
+    return _tracers[name]
 
 
 def get_tracer() -> PowertoolsTracer:
@@ -96,4 +135,8 @@ def add_remediation_context(
     tracer_instance.add_remediation_context(remediation)
 
 
-tracer = init_tracer()
+def __getattr__(name: str) -> Any:
+    # The module-level tracer is created on first access
+    if name == "tracer":
+        return init_tracer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -38,6 +38,8 @@ properties = [
     "workflow_data",
     "executionaccount",
     "executionregion",
+    "finding",
+    "resolved_finding",
 ]
 
 
@@ -64,6 +66,8 @@ class StepFunctionLambdaAnswer:
     workflowaccount = ""
     eventtype = ""
     resourceregion = ""
+    finding: dict[str, Any] = {}
+    resolved_finding: dict[str, Any] = {}
     workflow_data: dict[str, str] = (
         {}
     )  # Hash for workflow data so that it can be modified in
@@ -145,7 +149,7 @@ def publish_to_sns(topic_name, message, region=""):
         region = AWS_REGION
     partition = partition_from_region(region)
     AWS = AWSCachedClient(region)  # cached client object
-    account = boto3.client("sts").get_caller_identity()["Account"]
+    account = AWS.account
 
     topic_arn = f"arn:{partition}:sns:{region}:{account}:{topic_name}"
 
@@ -12,6 +12,7 @@ import {
   Role,
   ServicePrincipal,
 } from 'aws-cdk-lib/aws-iam';
+import * as events from 'aws-cdk-lib/aws-events';
 import * as kms from 'aws-cdk-lib/aws-kms';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
 import { Tracing } from 'aws-cdk-lib/aws-lambda';
@@ -27,6 +28,7 @@ import { ActionLog } from './action-log';
 import { AdminPlaybook } from './admin-playbook';
 import { addCfnGuardSuppression } from './cdk-helper/add-cfn-guard-suppression';
 import MetricResources from './cdk-helper/metric-resources';
+import setCondition from './cdk-helper/set-condition';
 import { CloudWatchMetrics } from './cloudwatch_metrics';
 import { OrchestratorConstruct } from './common-orchestrator-construct';
 import { ASRParameters } from './constants/parameters';
@@ -343,6 +345,75 @@ export class AdministratorStack extends cdk.Stack {
       sortKey: { name: 'lastUpdatedTime#findingId', type: AttributeType.STRING },
     });
 
+    // Circuit Breaker Table - Tracks repeated remediation failures per account/region/control
+    //
+    const circuitBreakerTable = new Table(this, 'CircuitBreakerTable', {
+      partitionKey: { name: 'breakerKey', type: AttributeType.STRING },
+      billingMode: BillingMode.PAY_PER_REQUEST,
+      encryption: TableEncryption.CUSTOMER_MANAGED,
+      encryptionKey: kmsKey,
+      pointInTimeRecoverySpecification: {
+        pointInTimeRecoveryEnabled: true,
+      },
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      timeToLiveAttribute: 'expireAt',
+    });
+
+    // Finding Dedupe Table - Relevant-field hash of the last imported event per finding
+    //
+    const findingDedupeTable = new Table(this, 'FindingDedupeTable', {
+      partitionKey: { name: 'findingId', type: AttributeType.STRING },
+      billingMode: BillingMode.PAY_PER_REQUEST,
+      encryption: TableEncryption.CUSTOMER_MANAGED,
+      encryptionKey: kmsKey,
+      pointInTimeRecoverySpecification: {
+        pointInTimeRecoveryEnabled: true,
+      },
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      timeToLiveAttribute: 'expireAt',
+    });
+
+    // Remediation Cooldown Table - Resource/control pairs that were recently remediated
+    //
+    const remediationCooldownTable = new Table(this, 'RemediationCooldownTable', {
+      partitionKey: { name: 'cooldownKey', type: AttributeType.STRING },
+      billingMode: BillingMode.PAY_PER_REQUEST,
+      encryption: TableEncryption.CUSTOMER_MANAGED,
+      encryptionKey: kmsKey,
+      pointInTimeRecoverySpecification: {
+        pointInTimeRecoveryEnabled: true,
+      },
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      timeToLiveAttribute: 'expireAt',
+    });
+
+    // Notification Digest Table - SNS notifications buffered per severity and standard until published
+    //
+    const notificationDigestTable = new Table(this, 'NotificationDigestTable', {
+      partitionKey: { name: 'digestKey', type: AttributeType.STRING },
+      billingMode: BillingMode.PAY_PER_REQUEST,
+      encryption: TableEncryption.CUSTOMER_MANAGED,
+      encryptionKey: kmsKey,
+      pointInTimeRecoverySpecification: {
+        pointInTimeRecoveryEnabled: true,
+      },
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // Claim Check Table - Large findings and runbook outputs referenced from Step Functions state
+    //
+    const claimCheckTable = new Table(this, 'ClaimCheckTable', {
+      partitionKey: { name: 'claimKey', type: AttributeType.STRING },
+      billingMode: BillingMode.PAY_PER_REQUEST,
+      encryption: TableEncryption.CUSTOMER_MANAGED,
+      encryptionKey: kmsKey,
+      pointInTimeRecoverySpecification: {
+        pointInTimeRecoveryEnabled: true,
+      },
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      timeToLiveAttribute: 'expireAt',
+    });
+
     const asrLambdaLayer = new lambda.LayerVersion(this, 'ASRLambdaLayer', {
       compatibleRuntimes: [props.runtimePython],
       description: 'SO0111 ASR Common functions used by the solution',
@@ -428,6 +499,37 @@ export class AdministratorStack extends cdk.Stack {
     }
     addCfnGuardSuppression(orchestratorRole, 'IAM_NO_INLINE_POLICY_CHECK');
 
+    const notificationDigestWindow = new cdk.CfnParameter(this, 'NotificationDigestWindowSeconds', {
+      type: 'Number',
+      description:
+        'Number of seconds to collect SNS remediation notifications, other than errors, into one digest message per severity and security standard. Set to 0 to publish every notification immediately.',
+      default: 0,
+      minValue: 0,
+    });
+
+    const remediationCooldownWindow = new cdk.CfnParameter(this, 'RemediationCooldownSeconds', {
+      type: 'Number',
+      description:
+        'Number of seconds after a successful remediation during which imported findings for the same resource and control are not remediated again. Set to 0 to disable the cooldown.',
+      default: 0,
+      minValue: 0,
+    });
+
+    const remediationCooldownControlWindows = new cdk.CfnParameter(this, 'RemediationCooldownControlSeconds', {
+      type: 'String',
+      description:
+        '(Optional) JSON object of control ID to cooldown seconds that overrides RemediationCooldownSeconds for those controls, for example {"S3.1": 600}. A value of 0 disables the cooldown for that control.',
+      default: '',
+    });
+
+    // Read by the Orchestrator Lambda functions that send CloudWatch metrics (layer/cloudwatch_metrics.py)
+    const cloudWatchMetricsMode = new cdk.CfnParameter(this, 'CloudWatchMetricsMode', {
+      type: 'String',
+      description: `How the Orchestrator sends CloudWatch metrics: 'api' calls PutMetricData for each metric, 'emf' writes them to the function logs in Embedded Metric Format, and 'buffered' aggregates them and calls PutMetricData once per invocation.`,
+      default: 'api',
+      allowedValues: ['api', 'emf', 'buffered'],
+    });
+
     const checkSSMDocumentState = new lambda.Function(this, 'checkSSMDocumentState', {
       functionName: RESOURCE_NAME_PREFIX + '-ASR-checkSSMDocumentState',
       handler: 'check_ssm_doc_state.lambda_handler',
@@ -440,6 +542,10 @@ export class AdministratorStack extends cdk.Stack {
         SOLUTION_ID: props.solutionId,
         SOLUTION_VERSION: props.solutionVersion,
         SOLUTION_TMN: props.solutionTMN,
+        CIRCUIT_BREAKER_TABLE_NAME: circuitBreakerTable.tableName,
+        FINDING_DEDUPE_TABLE_NAME: findingDedupeTable.tableName,
+        REMEDIATION_COOLDOWN_TABLE_NAME: remediationCooldownTable.tableName,
+        CLOUDWATCH_METRICS_MODE: cloudWatchMetricsMode.valueAsString,
         POWERTOOLS_SERVICE_NAME: 'check_ssm_doc_state',
         POWERTOOLS_LOG_LEVEL: 'INFO',
         POWERTOOLS_LOGGER_LOG_EVENT: 'false',
@@ -495,6 +601,7 @@ export class AdministratorStack extends cdk.Stack {
         SOLUTION_VERSION: props.solutionVersion,
         WORKFLOW_RUNBOOK: '',
         SOLUTION_TMN: props.solutionTMN,
+        CLAIM_CHECK_TABLE_NAME: claimCheckTable.tableName,
         POWERTOOLS_SERVICE_NAME: 'get_approval_requirement',
         POWERTOOLS_LOG_LEVEL: 'INFO',
         POWERTOOLS_LOGGER_LOG_EVENT: 'false',
@@ -549,6 +656,7 @@ export class AdministratorStack extends cdk.Stack {
         SOLUTION_ID: props.solutionId,
         SOLUTION_VERSION: props.solutionVersion,
         SOLUTION_TMN: props.solutionTMN,
+        CLAIM_CHECK_TABLE_NAME: claimCheckTable.tableName,
         POWERTOOLS_SERVICE_NAME: 'exec_ssm_doc',
         POWERTOOLS_LOG_LEVEL: 'INFO',
         POWERTOOLS_LOGGER_LOG_EVENT: 'false',
@@ -603,6 +711,7 @@ export class AdministratorStack extends cdk.Stack {
         SOLUTION_ID: props.solutionId,
         SOLUTION_VERSION: props.solutionVersion,
         SOLUTION_TMN: props.solutionTMN,
+        CLAIM_CHECK_TABLE_NAME: claimCheckTable.tableName,
         POWERTOOLS_SERVICE_NAME: 'check_ssm_execution',
         POWERTOOLS_LOG_LEVEL: 'INFO',
         POWERTOOLS_LOGGER_LOG_EVENT: 'false',
@@ -678,7 +787,18 @@ export class AdministratorStack extends cdk.Stack {
         }),
         new PolicyStatement({
           actions: ['dynamodb:UpdateItem', 'dynamodb:PutItem', 'dynamodb:GetItem'],
-          resources: [asrFindingsTable.tableArn, remediationHistoryTable.tableArn],
+          resources: [
+            asrFindingsTable.tableArn,
+            remediationHistoryTable.tableArn,
+            circuitBreakerTable.tableArn,
+            findingDedupeTable.tableArn,
+            remediationCooldownTable.tableArn,
+            claimCheckTable.tableArn,
+          ],
+        }),
+        new PolicyStatement({
+          actions: ['dynamodb:UpdateItem', 'dynamodb:DeleteItem', 'dynamodb:Scan'],
+          resources: [notificationDigestTable.tableArn],
         }),
       ],
     });
@@ -808,6 +928,14 @@ export class AdministratorStack extends cdk.Stack {
         FINDINGS_TABLE_NAME: asrFindingsTable.tableName,
         HISTORY_TABLE_NAME: remediationHistoryTable.tableName,
         HISTORY_TTL_DAYS: historyTTL,
+        CIRCUIT_BREAKER_TABLE_NAME: circuitBreakerTable.tableName,
+        REMEDIATION_COOLDOWN_TABLE_NAME: remediationCooldownTable.tableName,
+        REMEDIATION_COOLDOWN_SECONDS: remediationCooldownWindow.valueAsString,
+        REMEDIATION_COOLDOWN_CONTROL_SECONDS: remediationCooldownControlWindows.valueAsString,
+        CLAIM_CHECK_TABLE_NAME: claimCheckTable.tableName,
+        NOTIFICATION_DIGEST_TABLE_NAME: notificationDigestTable.tableName,
+        SNS_DIGEST_WINDOW_SECONDS: notificationDigestWindow.valueAsString,
+        CLOUDWATCH_METRICS_MODE: cloudWatchMetricsMode.valueAsString,
         POWERTOOLS_SERVICE_NAME: 'send_notifications',
         POWERTOOLS_LOG_LEVEL: 'INFO',
         POWERTOOLS_LOGGER_LOG_EVENT: 'false',
@@ -1015,6 +1143,37 @@ export class AdministratorStack extends cdk.Stack {
       sourceArn: orchestrator.executionFailureRuleArn,
     });
 
+    //-------------------------------------------------------------------------
+    // Scheduled flush of the notification digests whose window elapsed while no
+    // notifications arrived. Only deployed when digest mode is on.
+    //
+    const notificationDigestEnabled = new cdk.CfnCondition(this, 'notificationDigestEnabled', {
+      expression: Fn.conditionNot(Fn.conditionEquals(notificationDigestWindow.valueAsString, '0')),
+    });
+
+    const notificationDigestFlushRule = new events.CfnRule(this, 'NotificationDigestFlushRule', {
+      name: RESOURCE_NAME_PREFIX + '-ASR-NotificationDigestFlushRule',
+      description: 'Publishes the ASR notification digests whose window has elapsed',
+      scheduleExpression: 'rate(1 minute)',
+      state: 'ENABLED',
+      targets: [
+        {
+          id: 'sendNotifications',
+          arn: sendNotifications.functionArn,
+          input: JSON.stringify({ source: 'aws.events', 'detail-type': 'Scheduled Event', detail: {} }),
+        },
+      ],
+    });
+    setCondition(notificationDigestFlushRule, notificationDigestEnabled);
+
+    const notificationDigestFlushPermission = new lambda.CfnPermission(this, 'NotificationDigestFlushRuleInvoke', {
+      action: 'lambda:InvokeFunction',
+      functionName: sendNotifications.functionArn,
+      principal: 'events.amazonaws.com',
+      sourceArn: notificationDigestFlushRule.attrArn,
+    });
+    setCondition(notificationDigestFlushPermission, notificationDigestEnabled);
+
     const orchStateMachine = orchestrator.node.findChild('StateMachine') as StateMachine;
     const stateMachineConstruct = orchStateMachine.node.defaultChild as CfnStateMachine;
     const orchArnParm = orchestrator.node.findChild('SHARR_Orchestrator_Arn') as StringParameter;
@@ -1478,7 +1637,12 @@ export class AdministratorStack extends cdk.Stack {
           },
           {
             Label: { default: 'Orchestrator Configuration' },
-            Parameters: ['ReuseOrchestratorLogGroup'],
+            Parameters: [
+              'ReuseOrchestratorLogGroup',
+              notificationDigestWindow.logicalId,
+              remediationCooldownWindow.logicalId,
+              remediationCooldownControlWindows.logicalId,
+            ],
           },
           {
             Label: { default: 'Web UI Configuration' },
@@ -1486,7 +1650,7 @@ export class AdministratorStack extends cdk.Stack {
           },
           {
             Label: { default: 'CloudWatch Metrics' },
-            Parameters: [...cloudWatchMetrics.getStandardParameterIds()],
+            Parameters: [...cloudWatchMetrics.getStandardParameterIds(), cloudWatchMetricsMode.logicalId],
           },
           {
             Label: { default: '(Optional) Enhanced CloudWatch Metrics' },
@@ -156,6 +156,8 @@ export class OrchestratorConstruct extends Construct {
         'WorkflowAccount.$': '$.Payload.workflowaccount',
         'WorkflowRole.$': '$.Payload.workflowrole',
         'WorkflowConfig.$': '$.Payload.workflow_data',
+        'Finding.$': '$.Payload.finding',
+        'ResolvedFinding.$': '$.Payload.resolved_finding',
       },
       resultPath: '$.Workflow',
     });
@@ -163,6 +165,24 @@ export class OrchestratorConstruct extends Construct {
       resultPath: '$.ErrorInfo',
     });
 
+    // Large findings continue as a compact copy with a claim check reference
+    const checkOutFinding = new sfn.Pass(this, 'Check Out Finding', {
+      comment: 'Replace the finding with the copy returned by the approval requirement',
+      parameters: {
+        'EventType.$': '$.EventType',
+        'CustomActionName.$': '$.CustomActionName',
+        'ExecutionId.$': '$$.Execution.Id',
+        'Finding.$': '$.Workflow.Finding',
+        'ResolvedFinding.$': '$.Workflow.ResolvedFinding',
+        Workflow: {
+          'WorkflowDocument.$': '$.Workflow.WorkflowDocument',
+          'WorkflowAccount.$': '$.Workflow.WorkflowAccount',
+          'WorkflowRole.$': '$.Workflow.WorkflowRole',
+          'WorkflowConfig.$': '$.Workflow.WorkflowConfig',
+        },
+      },
+    });
+
     const remediationWait = new sfn.Wait(this, 'Remediation Wait', {
       comment: 'Waiting for remediation',
       time: sfn.WaitTime.timestampPath('$.PlannedTimestamp'),
@@ -299,6 +319,7 @@ export class OrchestratorConstruct extends Construct {
         'Finding.$': '$$.Map.Item.Value',
         'EventType.$': '$.EventType',
         'CustomActionName.$': '$.CustomActionName',
+        'ExecutionId.$': '$$.Execution.Id',
       },
       itemsPath: '$.Findings',
     });
@@ -333,6 +354,7 @@ export class OrchestratorConstruct extends Construct {
         },
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'AccountId.$': '$.AutomationDocument.AccountId',
         'AutomationDocId.$': '$.AutomationDocument.AutomationDocId',
         'RemediationRole.$': '$.AutomationDocument.RemediationRole',
@@ -353,6 +375,7 @@ export class OrchestratorConstruct extends Construct {
         },
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'AccountId.$': '$.AutomationDocument.AccountId',
         'AutomationDocId.$': '$.AutomationDocument.AutomationDocId',
         'RemediationRole.$': '$.AutomationDocument.RemediationRole',
@@ -372,6 +395,7 @@ export class OrchestratorConstruct extends Construct {
         },
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'AccountId.$': '$.AutomationDocument.AccountId',
         'AutomationDocId.$': '$.AutomationDocument.AutomationDocId',
         'RemediationRole.$': '$.AutomationDocument.RemediationRole',
@@ -392,6 +416,7 @@ export class OrchestratorConstruct extends Construct {
         },
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'AccountId.$': '$.AutomationDocument.AccountId',
         'AutomationDocId.$': '$.AutomationDocument.AutomationDocId',
         'RemediationRole.$': '$.AutomationDocument.RemediationRole',
@@ -410,9 +435,18 @@ export class OrchestratorConstruct extends Construct {
         },
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
       },
     });
 
+    const duplicateFinding = new sfn.Pass(this, 'Duplicate Finding Event', {
+      comment: 'Finding was already processed with the same remediation-relevant fields',
+    });
+
+    const remediationCooldown = new sfn.Pass(this, 'Remediation Cooldown Active', {
+      comment: 'Resource was recently remediated for this control',
+    });
+
     const isDone = new sfn.Choice(this, 'Remediation completed?');
 
     const waitForRemediation = new sfn.Wait(this, 'Wait for Remediation', {
@@ -424,6 +458,7 @@ export class OrchestratorConstruct extends Construct {
       parameters: {
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'SSMExecution.$': '$.SSMExecution',
         'AutomationDocument.$': '$.AutomationDocument',
         Notification: {
@@ -444,6 +479,7 @@ export class OrchestratorConstruct extends Construct {
       parameters: {
         'EventType.$': '$.EventType',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'CustomActionName.$': '$.CustomActionName',
         'AccountId.$': '$.AutomationDocument.AccountId',
         'AutomationDocId.$': '$.AutomationDocument.AutomationDocId',
@@ -470,6 +506,7 @@ export class OrchestratorConstruct extends Construct {
         'EventType.$': '$.EventType',
         'CustomActionName.$': '$.CustomActionName',
         'Finding.$': '$.Finding',
+        'ResolvedFinding.$': '$.ResolvedFinding',
         'AutomationDocument.$': '$.AutomationDocument',
         'SSMExecution.$': '$.SSMExecution',
         Notification: {
@@ -503,13 +540,17 @@ export class OrchestratorConstruct extends Construct {
     // Call Lambda to get status of the automation document in the target account
     getDocState.next(checkDocState);
 
-    getApprovalRequirement.next(getDocState);
+    getApprovalRequirement.next(checkOutFinding);
+
+    checkOutFinding.next(getDocState);
 
     checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'ACTIVE'), sendTaskToken);
     checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'NOTACTIVE'), docStateNotActive);
     checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'NOTENABLED'), playbookNotEnabled);
     checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'NOTFOUND'), controlNoRemediation);
     checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'ACCESSDENIED'), assumeRoleFailure);
+    checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'DUPLICATE'), duplicateFinding);
+    checkDocState.when(sfn.Condition.stringEquals('$.AutomationDocument.DocState', 'COOLDOWN'), remediationCooldown);
     checkDocState.otherwise(docStateError);
 
     docStateNotActive.next(notify);
@@ -459,6 +459,13 @@ export class RemediationRunbookStack extends cdk.Stack {
         configPerms.addResources(`*`);
         inlinePolicy.addStatements(configPerms);
       }
+      {
+        const describeRegionsPerms = new PolicyStatement();
+        describeRegionsPerms.addActions('ec2:DescribeRegions');
+        describeRegionsPerms.effect = Effect.ALLOW;
+        describeRegionsPerms.addResources('*');
+        inlinePolicy.addStatements(describeRegionsPerms);
+      }
 
       const s3Perms = new PolicyStatement();
       s3Perms.addActions(
@@ -690,11 +697,16 @@ export class RemediationRunbookStack extends cdk.Stack {
       const inlinePolicy = new Policy(props.roleStack, `ASR-Remediation-Policy-${remediationName}`);
       inlinePolicy.addStatements(
         new PolicyStatement({
-          actions: ['s3:PutEncryptionConfiguration', 'kms:GenerateDataKey'],
+          actions: ['s3:PutEncryptionConfiguration', 's3:GetEncryptionConfiguration', 'kms:GenerateDataKey'],
           resources: ['*'],
           effect: Effect.ALLOW,
         }),
       );
+      const listBucketsPerms = new PolicyStatement();
+      listBucketsPerms.addActions('s3:ListAllMyBuckets');
+      listBucketsPerms.effect = Effect.ALLOW;
+      listBucketsPerms.addResources('*');
+      inlinePolicy.addStatements(listBucketsPerms);
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -1084,6 +1096,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       configPerms.addResources('*');
       inlinePolicy.addStatements(configPerms);
 
+      const credentialReportPerms = new PolicyStatement();
+      credentialReportPerms.addActions('iam:GenerateCredentialReport', 'iam:GetCredentialReport');
+      credentialReportPerms.effect = Effect.ALLOW;
+      credentialReportPerms.addResources('*');
+      inlinePolicy.addStatements(credentialReportPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -1130,6 +1148,12 @@ export class RemediationRunbookStack extends cdk.Stack {
         inlinePolicy.addStatements(remediationPerms);
       }
 
+      const listBucketsPerms = new PolicyStatement();
+      listBucketsPerms.addActions('s3:ListAllMyBuckets');
+      listBucketsPerms.effect = Effect.ALLOW;
+      listBucketsPerms.addResources('*');
+      inlinePolicy.addStatements(listBucketsPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -1813,6 +1837,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       remediationPolicy.addResources(`arn:${this.partition}:s3:::*`);
       inlinePolicy.addStatements(remediationPolicy);
 
+      const listBucketsPerms = new PolicyStatement();
+      listBucketsPerms.addActions('s3:ListAllMyBuckets');
+      listBucketsPerms.effect = Effect.ALLOW;
+      listBucketsPerms.addResources('*');
+      inlinePolicy.addStatements(listBucketsPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -1856,6 +1886,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       remediationPolicy.addResources('*');
       inlinePolicy.addStatements(remediationPolicy);
 
+      const describeRegionsPerms = new PolicyStatement();
+      describeRegionsPerms.addActions('ec2:DescribeRegions');
+      describeRegionsPerms.effect = Effect.ALLOW;
+      describeRegionsPerms.addResources('*');
+      inlinePolicy.addStatements(describeRegionsPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -1938,7 +1974,7 @@ export class RemediationRunbookStack extends cdk.Stack {
       const remediationName = 'EnableEbsEncryptionByDefault';
       const inlinePolicy = new Policy(props.roleStack, `ASR-Remediation-Policy-${remediationName}`);
       const ec2Perms = new PolicyStatement();
-      ec2Perms.addActions('ec2:EnableEBSEncryptionByDefault', 'ec2:GetEbsEncryptionByDefault');
+      ec2Perms.addActions('ec2:EnableEBSEncryptionByDefault', 'ec2:GetEbsEncryptionByDefault', 'ec2:DescribeRegions');
       ec2Perms.effect = Effect.ALLOW;
       ec2Perms.addResources('*');
       inlinePolicy.addStatements(ec2Perms);
@@ -2412,6 +2448,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       cfgPerms.addResources('*');
       inlinePolicy.addStatements(cfgPerms);
 
+      const credentialReportPerms = new PolicyStatement();
+      credentialReportPerms.addActions('iam:GenerateCredentialReport', 'iam:GetCredentialReport');
+      credentialReportPerms.effect = Effect.ALLOW;
+      credentialReportPerms.addResources('*');
+      inlinePolicy.addStatements(credentialReportPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -2943,6 +2985,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       );
       inlinePolicy.addStatements(remediationPolicy);
 
+      const describeRegionsPerms = new PolicyStatement();
+      describeRegionsPerms.addActions('ec2:DescribeRegions');
+      describeRegionsPerms.effect = Effect.ALLOW;
+      describeRegionsPerms.addResources('*');
+      inlinePolicy.addStatements(describeRegionsPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -2960,6 +3008,18 @@ export class RemediationRunbookStack extends cdk.Stack {
         solutionId: props.solutionId,
         namespace: namespace,
       });
+
+      const childToMod = inlinePolicy.node.findChild('Resource') as CfnPolicy;
+      childToMod.cfnOptions.metadata = {
+        cfn_nag: {
+          rules_to_suppress: [
+            {
+              id: 'W12',
+              reason: 'Resource * is required for ec2:DescribeRegions to list the regions enabled for the account.',
+            },
+          ],
+        },
+      };
     }
 
     //-----------------------
@@ -3172,6 +3232,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       remediationPolicy.addResources(`arn:${this.partition}:sns:*:${this.account}:*`, `arn:${this.partition}:s3:::*`);
       inlinePolicy.addStatements(remediationPolicy);
 
+      const listBucketsPerms = new PolicyStatement();
+      listBucketsPerms.addActions('s3:ListAllMyBuckets');
+      listBucketsPerms.effect = Effect.ALLOW;
+      listBucketsPerms.addResources('*');
+      inlinePolicy.addStatements(listBucketsPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -3615,6 +3681,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       remediationPolicy.addResources(`arn:${this.partition}:s3:::*`);
       inlinePolicy.addStatements(remediationPolicy);
 
+      const listBucketsPerms = new PolicyStatement();
+      listBucketsPerms.addActions('s3:ListAllMyBuckets');
+      listBucketsPerms.effect = Effect.ALLOW;
+      listBucketsPerms.addResources('*');
+      inlinePolicy.addStatements(listBucketsPerms);
+
       new SsmRole(props.roleStack, 'RemediationRole ' + remediationName, {
         solutionId: props.solutionId,
         ssmDocName: remediationName,
@@ -3768,6 +3840,12 @@ export class RemediationRunbookStack extends cdk.Stack {
       );
       inlinePolicy.addStatements(guardDutyServiceLinkedRolePerms);
 
+      const describeRegionsPerms = new PolicyStatement();
+      describeRegionsPerms.addActions('ec2:DescribeRegions');
+      describeRegionsPerms.effect = Effect.ALLOW;
+      describeRegionsPerms.addResources('*');
+      inlinePolicy.addStatements(describeRegionsPerms);
+
       // Add protection against permission mutation on own role
       const denyPermissionMutation = new PolicyStatement();
       denyPermissionMutation.addActions(...PRIVILEGE_ESCALATION_ACTIONS);
@@ -11,6 +11,7 @@ import {
   ExecuteScriptStep,
   HardCodedString,
   Input,
+  MapListVariable,
   Output,
   ScriptCode,
   ScriptLanguage,
@@ -60,6 +61,12 @@ export class CreateLogMetricFilterAndAlarmDocument extends ControlRunbookDocumen
         defaultValue: `{{ssm:/Solutions/${props.solutionId}/CMK_REMEDIATION_ARN}}`,
         allowedPattern: String.raw`^arn:(?:aws|aws-us-gov|aws-cn):kms:(?:[a-z]{2}(?:-gov)?-[a-z]+-\d):\d{12}:(?:(?:^(alias\/)[a-zA-Z0-9:/_-]+$)|(?:key\/(?:[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12})))$`,
       }),
+      Input.ofTypeString('RemediationScope', {
+        description:
+          "Control creates the metric filter and alarm for the finding's control. AllControls creates them for every control of the standard.",
+        defaultValue: 'Control',
+        allowedValues: ['Control', 'AllControls'],
+      }),
     ];
 
     const snsTopicName = getSNSTopicName(props.solutionId, props.solutionAcronym);
@@ -140,7 +147,25 @@ export class CreateLogMetricFilterAndAlarmDocument extends ControlRunbookDocumen
       ],
     });
 
-    return [getMetricFilterAndAlarmInputValueStep];
+    const getAllMetricFiltersAndAlarmsStep = new ExecuteScriptStep(this, 'GetAllMetricFiltersAndAlarms', {
+      language: ScriptLanguage.fromRuntime(this.runtimePython.name, 'get_all_filters'),
+      code: ScriptCode.fromFile(
+        fs.realpathSync(path.join(__dirname, '..', '..', 'common', 'cloudwatch_get_input_values.py')),
+      ),
+      inputPayload: {
+        StandardLongName: HardCodedString.of(this.standardLongName),
+        StandardVersion: HardCodedString.of(this.standardVersion),
+      },
+      outputs: [
+        {
+          name: 'Filters',
+          outputType: DataTypeEnum.MAP_LIST,
+          selector: '$.Payload.filters',
+        },
+      ],
+    });
+
+    return [getMetricFilterAndAlarmInputValueStep, getAllMetricFiltersAndAlarmsStep];
   }
 
   protected override getRemediationParams(): Record<string, any> {
@@ -157,6 +182,8 @@ export class CreateLogMetricFilterAndAlarmDocument extends ControlRunbookDocumen
     params.LogGroupName = StringVariable.of('LogGroupName');
     params.SNSTopicName = getSNSTopicName(this.solutionId, 'ASR');
     params.KMSKeyArn = StringVariable.of('KMSKeyArn');
+    params.RemediationScope = StringVariable.of('RemediationScope');
+    params.Filters = MapListVariable.of('GetAllMetricFiltersAndAlarms.Filters');
 
     return params;
   }
@@ -205,3 +205,32 @@ def verify(event, _):
         exit(
             f"ERROR: Could not find associated metric filter. Missing parameter: {str(ex)}"
         )
+
+
+def get_all_filters(event, _):
+    """
+    Returns the metric filter and alarm definitions for every control of the standard,
+    in the form taken by the Filters parameter of ASR-CreateLogMetricFilterAndAlarm
+    """
+    try:
+        standard_mapping = Cloudwatch_mappings[event["StandardLongName"]][
+            event["StandardVersion"]
+        ]
+    except KeyError as ex:
+        exit(
+            f"ERROR: Could not find associated metric filters. Missing parameter: {str(ex)}"
+        )
+    return {
+        "filters": [
+            {
+                "FilterName": metric_filter["filter_name"],
+                "FilterPattern": metric_filter["filter_pattern"],
+                "MetricName": metric_filter["metric_name"],
+                "MetricValue": metric_filter["metric_value"],
+                "AlarmName": metric_filter["alarm_name"],
+                "AlarmDesc": metric_filter["alarm_desc"],
+                "AlarmThreshold": metric_filter["alarm_threshold"],
+            }
+            for metric_filter in standard_mapping.values()
+        ]
+    }
@@ -1,7 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import base64
 import json
 import re
+import zlib
 from typing import Any
 
 import boto3
@@ -66,6 +68,21 @@ def get_config_rule(rule_name):
     return config_rule
 
 
+def decode_details(resource):
+    """
+    Resources[0].Details may arrive zlib-compressed and base64-encoded from the
+    Orchestrator's finding projection
+    """
+    details = resource.get("Details", {})
+    if resource.get("DetailsEncoding") == "zlib+base64":
+        details = json.loads(zlib.decompress(base64.b64decode(details)))
+        resource = {
+            key: value for key, value in resource.items() if key != "DetailsEncoding"
+        }
+        resource["Details"] = details
+    return resource
+
+
 class FindingEvent:
     """
     Finding object returns the parse fields from an input finding json object
@@ -174,6 +191,9 @@ class FindingEvent:
         ):
             self.valid_finding = False
             self.invalid_finding_reason = f"ProductArn is invalid: {self.product_arn}"
+        self.finding_json["Resources"][0] = decode_details(
+            self.finding_json["Resources"][0]
+        )
         self.details = self.finding_json["Resources"][0].get("Details", {})
         # Test mode is used with fabricated finding data to tell the
         # remediation runbook to run in test more (where supported)
@@ -1,5 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import base64
+import json
+import zlib
+
 import botocore.session
 import pytest
 from botocore.config import Config
@@ -170,6 +174,21 @@ def test_parse_event(mocker):
     assert parsed_event == expected_result
 
 
+def test_parse_event_compressed_details(mocker):
+    details = {"AwsAutoScalingAutoScalingGroupDetails": {"HealthCheckType": "EC2"}}
+    test_event = event()
+    test_event["Finding"]["Resources"][0]["Details"] = base64.b64encode(
+        zlib.compress(json.dumps(details).encode("utf-8"))
+    ).decode("ascii")
+    test_event["Finding"]["Resources"][0]["DetailsEncoding"] = "zlib+base64"
+
+    parsed_event = parse_event(test_event, {})
+
+    assert parsed_event["details"] == details
+    assert parsed_event["resource"]["Details"] == details
+    assert "DetailsEncoding" not in parsed_event["resource"]
+
+
 def test_parse_event_multimatch(mocker):
     expected_result = expected()
     expected_result["finding"] = event().get("Finding")
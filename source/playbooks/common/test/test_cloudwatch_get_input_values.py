@@ -1,7 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import pytest
-from cloudwatch_get_input_values import routeTableChangesFilter, verify
+from cloudwatch_get_input_values import get_all_filters, routeTableChangesFilter, verify
 
 
 def expected():
@@ -58,3 +58,34 @@ def test_failNoStandard():
         response.value.code
         == "ERROR: Could not find associated metric filter. Missing parameter: 'StandardLongName'"
     )
+
+
+def test_get_all_filters():
+    filters = get_all_filters(
+        {
+            "StandardLongName": "cis-aws-foundations-benchmark",
+            "StandardVersion": "1.4.0",
+        },
+        {},
+    )["filters"]
+
+    assert len(filters) == 12
+    assert {
+        "FilterName": "RouteTableChanges",
+        "FilterPattern": routeTableChangesFilter["filter_pattern"],
+        "MetricName": "RouteTableChanges",
+        "MetricValue": 1,
+        "AlarmName": "RouteTableChanges",
+        "AlarmDesc": "Alarm for RouteTableChanges > 0",
+        "AlarmThreshold": 1,
+    } in filters
+
+
+def test_get_all_filters_no_standard():
+    with pytest.raises(SystemExit) as response:
+        get_all_filters({"StandardVersion": "1.4.0"}, {})
+
+    assert (
+        response.value.code
+        == "ERROR: Could not find associated metric filters. Missing parameter: 'StandardLongName'"
+    )
@@ -2,20 +2,25 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import Optional
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 SSM_MANAGED_POLICY_ARN = "arn:aws:iam::aws:policy/AmazonSSMManagedInstanceCore"
 
 boto_config = Config(retries={"mode": "standard"})
 
 
 def connect_to_iam():
-    return boto3.client("iam", config=boto_config)
+    return get_client("iam", config=boto_config)
 
 
 def connect_to_ec2():
-    return boto3.client("ec2", config=boto_config)
+    return get_client("ec2", config=boto_config)
 
 
 def lambda_handler(event, _):
@@ -2,14 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import List, Optional, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
 def connect_to_ec2():
-    return boto3.client("ec2", config=boto_config)
+    return get_client("ec2", config=boto_config)
 
 
 class Event(TypedDict):
@@ -3,9 +3,32 @@
 from time import sleep
 from typing import Optional, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import WaiterTimeoutError, wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from multi_region import apply_in_regions, summarize_regions
+except ImportError:
+    # multi_region.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from s3_bucket_sweep import sweep_buckets
+except ImportError:
+    # s3_bucket_sweep.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
@@ -38,6 +61,14 @@ class AccountEvent(TypedDict):
     BlockPublicPolicy: bool
 
 
+class SweepEvent(TypedDict):
+    AccountId: str
+    RestrictPublicBuckets: bool
+    BlockPublicAcls: bool
+    IgnorePublicAcls: bool
+    BlockPublicPolicy: bool
+
+
 class HandlerResponse(TypedDict):
     Message: str
     Status: str
@@ -45,7 +76,7 @@ class HandlerResponse(TypedDict):
 
 
 def connect_to_service(service):
-    return boto3.client(service, config=boto_config)
+    return get_client(service, config=boto_config)
 
 
 def handle_account(event: AccountEvent, _) -> HandlerResponse:
@@ -87,6 +118,45 @@ def handle_account(event: AccountEvent, _) -> HandlerResponse:
         )
 
 
+def handle_account_all_regions(event: AccountEvent, _):
+    """
+    Configures the S3 account-level public access block, and verifies that it has
+    reached every enabled region. The setting applies to the account in all regions,
+    so it is put once and only the verification is made per region.
+    """
+    account_id = event["AccountId"]
+    public_access_block_config: PublicAccessConfiguration = {
+        "BlockPublicAcls": bool(event["BlockPublicAcls"]),
+        "IgnorePublicAcls": bool(event["IgnorePublicAcls"]),
+        "BlockPublicPolicy": bool(event["BlockPublicPolicy"]),
+        "RestrictPublicBuckets": bool(event["RestrictPublicBuckets"]),
+    }
+    try:
+        put_account_public_access_block(account_id, public_access_block_config)
+    except Exception as e:
+        raise RuntimeError(
+            f"Encountered error configuring public access block for account: {str(e)}"
+        )
+
+    def validate_in_region(region: str) -> PublicAccessConfiguration:
+        validation = validate_account_public_access_block(
+            account_id, public_access_block_config, region
+        )
+        if not validation["Valid"]:
+            raise RuntimeError(validation["Message"])
+        return validation["PublicAccessConfig"]
+
+    results = apply_in_regions(validate_in_region, ["s3control"])
+
+    return {
+        "Message": summarize_regions(
+            results, f"Account {account_id} public access block verified"
+        ),
+        "Status": "Success",
+        "Regions": results,
+    }
+
+
 def handle_s3_bucket(event: BucketEvent, _) -> HandlerResponse:
     """
     Configures the public access block for an S3 bucket.
@@ -127,6 +197,43 @@ def handle_s3_bucket(event: BucketEvent, _) -> HandlerResponse:
         )
 
 
+def sweep_s3_buckets(event: SweepEvent, _):
+    """
+    Configures the public access block for every S3 bucket in the account that does
+    not already have the given configuration.
+    """
+    account_id = event["AccountId"]
+    public_access_block_config: PublicAccessConfiguration = {
+        "BlockPublicAcls": bool(event["BlockPublicAcls"]),
+        "IgnorePublicAcls": bool(event["IgnorePublicAcls"]),
+        "BlockPublicPolicy": bool(event["BlockPublicPolicy"]),
+        "RestrictPublicBuckets": bool(event["RestrictPublicBuckets"]),
+    }
+
+    def is_compliant(s3_client, bucket_name: str, expected_owner: str) -> bool:
+        try:
+            configuration = s3_client.get_public_access_block(
+                Bucket=bucket_name, ExpectedBucketOwner=expected_owner
+            )["PublicAccessBlockConfiguration"]
+        except s3_client.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchPublicAccessBlockConfiguration":
+                return False
+            raise
+        return all(
+            configuration.get(config_name) == config_value
+            for config_name, config_value in public_access_block_config.items()
+        )
+
+    def remediate(s3_client, bucket_name: str, expected_owner: str) -> None:
+        s3_client.put_public_access_block(
+            Bucket=bucket_name,
+            PublicAccessBlockConfiguration=public_access_block_config,
+            ExpectedBucketOwner=expected_owner,
+        )
+
+    return sweep_buckets(account_id, is_compliant, remediate)
+
+
 def put_account_public_access_block(
     account_id: str,
     public_access_block_config: PublicAccessConfiguration,
@@ -162,30 +269,41 @@ def put_s3_bucket_public_access_block(
 def validate_account_public_access_block(
     account_id,
     expected_public_access_block_config,
+    region_name: Optional[str] = None,
 ) -> ValidateBucketPublicAccessBlockResponse:
-    s3control_client = boto3.client("s3control")
+    s3control_client = get_client("s3control", region_name)
     wait_time = 30
     max_time = 480
     max_retries = max_time // wait_time
-    try:
-        for _ in range(max_retries):
-            sleep(wait_time)
 
-            configuration = s3control_client.get_public_access_block(
-                AccountId=account_id
-            )["PublicAccessBlockConfiguration"]
+    def get_expected_configuration():
+        configuration = s3control_client.get_public_access_block(AccountId=account_id)[
+            "PublicAccessBlockConfiguration"
+        ]
 
-            config_matches_expected = all(
-                configuration.get(config_name)
-                == expected_public_access_block_config.get(config_name)
-                for config_name in expected_public_access_block_config
-            )
-            if config_matches_expected:
-                return {
-                    "Message": "Account public access block configuration successfully set.",
-                    "Valid": True,
-                    "PublicAccessConfig": configuration,
-                }
+        config_matches_expected = all(
+            configuration.get(config_name)
+            == expected_public_access_block_config.get(config_name)
+            for config_name in expected_public_access_block_config
+        )
+        return configuration if config_matches_expected else None
+
+    try:
+        configuration = wait_until(
+            get_expected_configuration,
+            f"public access block on account {account_id}",
+            initial_delay=5,
+            max_delay=wait_time,
+            timeout_seconds=max_time,
+            max_attempts=max_retries,
+            sleep=sleep,
+        )
+        return {
+            "Message": "Account public access block configuration successfully set.",
+            "Valid": True,
+            "PublicAccessConfig": configuration,
+        }
+    except WaiterTimeoutError:
         return {
             "Message": "Account public access block configuration does not match expected configuration.",
             "Valid": False,
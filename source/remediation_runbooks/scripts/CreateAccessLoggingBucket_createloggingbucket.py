@@ -3,10 +3,15 @@
 import json
 from typing import TYPE_CHECKING, TypedDict, cast
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
     from mypy_boto3_s3.client import S3Client
@@ -20,7 +25,7 @@ else:
 
 
 def connect_to_s3(boto_config: Config) -> S3Client:
-    s3: S3Client = boto3.client("s3", config=boto_config)
+    s3: S3Client = get_client("s3", config=boto_config)
     return s3
 
 
@@ -3,17 +3,22 @@
 
 from typing import TYPE_CHECKING, Dict, TypedDict
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 if TYPE_CHECKING:
     from mypy_boto3_apigateway import AutoScalingClient
 else:
     AutoScalingClient = object
 
-import boto3
 from botocore.config import Config
 
 
 def connect_to_auto_scaling(boto_config: Config) -> AutoScalingClient:
-    return boto3.client("autoscaling", config=boto_config)
+    return get_client("autoscaling", config=boto_config)
 
 
 class Event(TypedDict):
@@ -1,12 +1,17 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 
 def connect_to_s3(boto_config):
-    return boto3.client("s3", config=boto_config)
+    return get_client("s3", config=boto_config)
 
 
 def create_encrypted_bucket(event, _):
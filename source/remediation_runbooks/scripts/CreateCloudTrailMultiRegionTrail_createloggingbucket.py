@@ -2,10 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TYPE_CHECKING, Dict, Literal, TypedDict, cast
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
     from mypy_boto3_s3.client import S3Client
@@ -19,7 +24,7 @@ else:
 
 
 def connect_to_s3() -> S3Client:
-    s3: S3Client = boto3.client("s3", config=Config(retries={"mode": "standard"}))
+    s3: S3Client = get_client("s3", config=Config(retries={"mode": "standard"}))
     return s3
 
 
@@ -3,9 +3,14 @@
 import json
 from typing import Dict, Final, List, Literal, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 BOTO_CONFIG = Config(retries={"mode": "standard"})
 
 
@@ -20,18 +25,16 @@ responses: Dict[Literal["CreateIAMRoleResponse"], List[Response]] = {
 
 
 def connect_to_iam(boto_config):
-    return boto3.client("iam", config=boto_config)
+    return get_client("iam", config=boto_config)
 
 
 def get_account(boto_config):
-    return boto3.client("sts", config=boto_config).get_caller_identity()["Account"]
+    return get_client("sts", config=boto_config).get_caller_identity()["Account"]
 
 
 def get_partition(boto_config):
     return (
-        boto3.client("sts", config=boto_config)
-        .get_caller_identity()["Arn"]
-        .split(":")[1]
+        get_client("sts", config=boto_config).get_caller_identity()["Arn"].split(":")[1]
     )
 
 
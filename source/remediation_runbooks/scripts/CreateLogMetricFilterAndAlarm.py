@@ -1,11 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 
 class LogGroupCreationError(Exception):
     pass
@@ -29,6 +36,20 @@ class RemediationError(Exception):
 
 boto_config = Config(retries={"max_attempts": 10, "mode": "standard"})
 
+# PutMetricFilter is limited to 5 transactions per second per account and Region, so
+# a batch runs a few filters at a time and relies on the client's retries for the rest
+MAX_WORKERS = 5
+
+FILTER_PARAMS = [
+    "FilterName",
+    "FilterPattern",
+    "MetricName",
+    "MetricValue",
+    "AlarmName",
+    "AlarmDesc",
+    "AlarmThreshold",
+]
+
 log = logging.getLogger()
 LOG_LEVEL = str(os.getenv("LogLevel", "INFO"))
 log.setLevel(LOG_LEVEL)
@@ -41,7 +62,7 @@ def get_service_client(service_name):
     :return: service client
     """
     log.debug("Getting the service client for service: {}".format(service_name))
-    return boto3.client(service_name, config=boto_config)
+    return get_client(service_name, config=boto_config)
 
 
 def _get_error_code(exception):
@@ -147,6 +168,36 @@ def put_metric_filter(
     else:
         log.info(f"Using existing log group {cw_log_group}")
 
+    create_metric_filter(
+        logs_client,
+        cw_log_group,
+        filter_name,
+        filter_pattern,
+        metric_name,
+        metric_namespace,
+        metric_value,
+    )
+
+
+def create_metric_filter(
+    logs_client,
+    cw_log_group,
+    filter_name,
+    filter_pattern,
+    metric_name,
+    metric_namespace,
+    metric_value,
+):
+    """
+    Puts the metric filter on a CloudWatch log group that is known to exist
+    :param logs_client: CloudWatch Logs client
+    :param cw_log_group: Name of the CloudWatch log group
+    :param filter_name: Name of the filter
+    :param filter_pattern: Pattern for the filter
+    :param metric_name: Name of the metric
+    :param metric_namespace: Namespace where metric is logged
+    :param metric_value: Value to be logged for the metric
+    """
     try:
         logs_client.put_metric_filter(
             logGroupName=cw_log_group,
@@ -286,3 +337,101 @@ def verify(event, _):
         error_message = f"Failed to create metric filter and alarm: {str(e)}"
         log.error(error_message)
         raise RemediationError(error_message)
+
+
+def put_filter_and_alarm(cw_log_group, metric_namespace, topic_arn, definition):
+    """
+    Creates the metric filter and alarm for one filter definition of a batch
+    :return: the result for the filter, with the error if either could not be created
+    """
+    result = {
+        "FilterName": definition["FilterName"],
+        "AlarmName": definition["AlarmName"],
+    }
+    try:
+        create_metric_filter(
+            get_service_client("logs"),
+            cw_log_group,
+            definition["FilterName"],
+            definition["FilterPattern"],
+            definition["MetricName"],
+            metric_namespace,
+            definition["MetricValue"],
+        )
+        put_metric_alarm(
+            definition["AlarmName"],
+            definition["AlarmDesc"],
+            definition["AlarmThreshold"],
+            definition["MetricName"],
+            metric_namespace,
+            topic_arn,
+        )
+        result["Status"] = "Success"
+    except (MetricFilterCreationError, MetricAlarmCreationError) as e:
+        result["Status"] = "Failed"
+        result["Error"] = str(e)
+    return result
+
+
+def verify_batch(event, _):
+    """
+    Creates the metric filters and alarms for every filter definition in event["Filters"]
+    on one log group. The log group is ensured once, and the filters and alarms are then
+    created concurrently. The SNS topic is created once by the runbook's CreateTopic step.
+    :return: the per-filter results; raises RemediationError if no filter succeeded
+    """
+    log.info("Starting CreateLogMetricFilterAndAlarm batch remediation")
+    log.debug(f"Event parameters: {event}")
+
+    for param in ["LogGroupName", "MetricNamespace", "TopicArn", "Filters"]:
+        if param not in event:
+            raise ValueError(f"Missing required parameter: {param}")
+    definitions = event["Filters"]
+    if not definitions:
+        raise ValueError("No filter definitions were provided")
+    for definition in definitions:
+        for param in FILTER_PARAMS:
+            if param not in definition:
+                raise ValueError(
+                    f"Missing required parameter {param} in filter definition: {definition}"
+                )
+
+    cw_log_group = event["LogGroupName"]
+    metric_namespace = event["MetricNamespace"]
+    topic_arn = event["TopicArn"]
+
+    # Create the clients before starting the workers so that they share them
+    logs_client = get_service_client("logs")
+    get_service_client("cloudwatch")
+
+    ensure_log_group_exists(logs_client, cw_log_group)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(
+            executor.map(
+                lambda definition: put_filter_and_alarm(
+                    cw_log_group, metric_namespace, topic_arn, definition
+                ),
+                definitions,
+            )
+        )
+
+    failed = [result for result in results if result["Status"] != "Success"]
+    message = (
+        f"Created {len(results) - len(failed)} of {len(results)} metric filters "
+        f"and alarms for log group '{cw_log_group}'"
+    )
+    log.info(message)
+    if len(failed) == len(results):
+        raise RemediationError(f"{message}: {json.dumps(failed)}")
+
+    return {
+        "response": {
+            "message": message,
+            "status": "Success" if not failed else "PartialSuccess",
+            "logGroupName": cw_log_group,
+            "succeededCount": str(len(results) - len(failed)),
+            "failedCount": str(len(failed)),
+            "results": json.dumps(results),
+        }
+    }
@@ -2,9 +2,26 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from security_group_rule_engine import (
+        PROTOCOLS,
+        has_open_access,
+        is_all_traffic_rule,
+        is_range_overlapping,
+        revoke_ingress_rules,
+    )
+except ImportError:
+    # security_group_rule_engine.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard", "max_attempts": 10})
 
 # List of high risk ports to check for unrestricted access
@@ -34,14 +51,11 @@ PORTS_TO_CHECK = {
     9200,
     9300,
 }
-# IPV4 and IPV6 open access
-OPENIPV4 = "0.0.0.0/0"
-OPENIPV6 = "::/0"
-PROTOCOLS = {"tcp", "udp", "-1"}
+SORTED_PORTS_TO_CHECK = sorted(PORTS_TO_CHECK)
 
 
 def connect_to_ec2():
-    return boto3.client("ec2", config=boto_config)
+    return get_client("ec2", config=boto_config)
 
 
 class Event(TypedDict):
@@ -98,21 +112,12 @@ def get_security_group_rules(security_group_id: str) -> list:
 def delete_rules_with_access_to_high_risk_ports(
     security_group_id: str, security_group_rules: list
 ):
-    ec2 = connect_to_ec2()
-    rules_deleted = []
-    for rule in security_group_rules:
-        if rule_has_access_to_high_risk_ports(rule) and is_open_cidr(rule):
-            try:
-                ec2.revoke_security_group_ingress(
-                    GroupId=security_group_id,
-                    SecurityGroupRuleIds=[
-                        rule["SecurityGroupRuleId"],
-                    ],
-                )
-                rules_deleted.append(rule["SecurityGroupRuleId"])
-            except Exception as e:
-                print(f"Failed to delete rule {rule['SecurityGroupRuleId']}: {str(e)}")
-    return rules_deleted
+    rule_ids = [
+        rule["SecurityGroupRuleId"]
+        for rule in security_group_rules
+        if rule_has_access_to_high_risk_ports(rule) and is_open_cidr(rule)
+    ]
+    return revoke_ingress_rules(connect_to_ec2(), security_group_id, rule_ids)
 
 
 def rule_has_access_to_high_risk_ports(rule: dict) -> bool:
@@ -120,16 +125,13 @@ def rule_has_access_to_high_risk_ports(rule: dict) -> bool:
         rule["IpProtocol"] in PROTOCOLS
         and not rule["IsEgress"]
         and (
-            any(
-                port in range(rule["FromPort"], rule["ToPort"] + 1)
-                for port in PORTS_TO_CHECK
+            is_range_overlapping(
+                rule["FromPort"], rule["ToPort"], SORTED_PORTS_TO_CHECK
             )
-            or (rule["FromPort"] == rule["ToPort"] == -1)
+            or is_all_traffic_rule(rule)
         )
     )
 
 
 def is_open_cidr(rule: dict) -> bool:
-    return ("CidrIpv4" in rule and rule["CidrIpv4"] == OPENIPV4) or (
-        "CidrIpv6" in rule and rule["CidrIpv6"] == OPENIPV6
-    )
+    return has_open_access(rule)
@@ -3,17 +3,22 @@
 
 from typing import TYPE_CHECKING, TypedDict
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 if TYPE_CHECKING:
     from mypy_boto3_apigateway import APIGatewayClient
 else:
     APIGatewayClient = object
 
-import boto3
 from botocore.config import Config
 
 
 def connect_to_apigateway(boto_config: Config) -> APIGatewayClient:
-    return boto3.client("apigateway", config=boto_config)
+    return get_client("apigateway", config=boto_config)
 
 
 class MethodSettings(TypedDict):
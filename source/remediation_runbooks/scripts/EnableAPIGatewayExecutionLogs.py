@@ -5,15 +5,20 @@ import re
 import traceback
 from typing import Any, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 logger = logging.getLogger()
 boto_config = Config(retries={"mode": "standard"})
 
 
 def connect_to_service(client: str) -> Any:
-    return boto3.client(client, config=boto_config)
+    return get_client(client, config=boto_config)
 
 
 class Event(TypedDict):
@@ -2,15 +2,20 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
 def connect_to_s3(boto_config):
-    return boto3.client("s3", config=boto_config)
+    return get_client("s3", config=boto_config)
 
 
 def create_bucket(bucket_name, aws_region):
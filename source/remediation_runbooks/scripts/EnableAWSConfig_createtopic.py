@@ -2,19 +2,24 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
 def connect_to_sns():
-    return boto3.client("sns", config=boto_config)
+    return get_client("sns", config=boto_config)
 
 
 def connect_to_ssm():
-    return boto3.client("ssm", config=boto_config)
+    return get_client("ssm", config=boto_config)
 
 
 def create_encrypted_topic(event, _):
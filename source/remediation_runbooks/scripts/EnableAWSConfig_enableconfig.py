@@ -2,11 +2,22 @@
 # SPDX-License-Identifier: Apache-2.0
 import logging
 import traceback
-from typing import Any, TypedDict
+from typing import Any, Optional, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from multi_region import apply_in_regions, summarize_regions
+except ImportError:
+    # multi_region.py is inlined ahead of this script in the runbook
+    pass
+
 logger = logging.getLogger()
 
 DEFAULT_CHANNEL_NAME = DEFAULT_RECORDER_NAME = "default"
@@ -22,6 +33,10 @@ class Event(TypedDict):
     topic_arn: str
 
 
+class AllRegionsEvent(Event, total=False):
+    remediation_scope: str
+
+
 class Response(TypedDict):
     Message: str
 
@@ -31,40 +46,80 @@ class ExistingRecorderDetails(TypedDict):
     recording: bool
 
 
-def connect_to_config() -> Any:
-    return boto3.client("config", config=boto_config)
+def connect_to_config(region_name: Optional[str] = None) -> Any:
+    return get_client("config", region_name, boto_config)
+
+
+def enable_config(event: AllRegionsEvent, _: Any):
+    if event.get("remediation_scope") == "AllRegions":
+        return enable_config_all_regions(event, _)
+    return {"Message": enable_config_in_region(event)}
+
+
+def enable_config_all_regions(event: Event, _: Any):
+    """
+    Enables AWS Config in every enabled region of the account. Global resource types
+    such as IAM are recorded only in the region the runbook runs in, so that they are
+    not recorded once per region. The delivery channels in the other regions deliver
+    to the same bucket, but not to the topic, which Config requires to be in the
+    channel's region.
+    """
+    home_region = connect_to_config().meta.region_name
+
+    def enable_config_in(region: str) -> str:
+        if region == home_region:
+            return enable_config_in_region(event, region)
+        return enable_config_in_region(
+            {**event, "topic_arn": ""}, region, include_global_resource_types=False
+        )
+
+    results = apply_in_regions(enable_config_in, ["config"], boto_config)
 
+    return {
+        "Message": summarize_regions(results, "Config recorder set up"),
+        "Regions": results,
+    }
 
-def enable_config(event: Event, _: Any):
+
+def enable_config_in_region(
+    event: Event,
+    region_name: Optional[str] = None,
+    include_global_resource_types: bool = True,
+) -> str:
     aws_account = event["account"]
     aws_partition = event["partition"]
     aws_service_role = event["aws_service_role"]
     config_bucket = event["config_bucket"]
     topic_arn = event["topic_arn"]
 
-    existing_recorder_details = get_existing_config_recorder()
+    existing_recorder_details = get_existing_config_recorder(region_name)
     existing_recorder = existing_recorder_details["name"]
     existing_recorder_is_recording = existing_recorder_details["recording"]
 
     create_or_update_config_recorder(
-        aws_partition, aws_account, aws_service_role, existing_recorder
+        aws_partition,
+        aws_account,
+        aws_service_role,
+        existing_recorder,
+        region_name,
+        include_global_resource_types,
     )
 
-    if not has_existing_delivery_channel():
-        create_delivery_channel(config_bucket, aws_account, topic_arn)
+    if not has_existing_delivery_channel(region_name):
+        create_delivery_channel(config_bucket, aws_account, topic_arn, region_name)
 
     if (not existing_recorder) or (
         existing_recorder and not existing_recorder_is_recording
     ):
-        start_recorder(existing_recorder)
+        start_recorder(existing_recorder, region_name)
 
-    return {
-        "Message": f"Successfully completed setting up recorder {existing_recorder or DEFAULT_RECORDER_NAME}"
-    }
+    return f"Successfully completed setting up recorder {existing_recorder or DEFAULT_RECORDER_NAME}"
 
 
-def get_existing_config_recorder() -> ExistingRecorderDetails:
-    config_client = connect_to_config()
+def get_existing_config_recorder(
+    region_name: Optional[str] = None,
+) -> ExistingRecorderDetails:
+    config_client = connect_to_config(region_name)
     try:
         recorder_name = ""
         recording = False
@@ -106,11 +161,13 @@ def create_or_update_config_recorder(
     aws_account: str,
     aws_service_role: str,
     recorder_name: str,
+    region_name: Optional[str] = None,
+    include_global_resource_types: bool = True,
 ) -> None:
     if not recorder_name:
         recorder_name = DEFAULT_RECORDER_NAME
 
-    config_client = connect_to_config()
+    config_client = connect_to_config(region_name)
     try:
         config_service_role_arn = (
             "arn:"
@@ -126,7 +183,7 @@ def create_or_update_config_recorder(
                 "roleARN": config_service_role_arn,
                 "recordingGroup": {
                     "allSupported": True,
-                    "includeGlobalResourceTypes": True,
+                    "includeGlobalResourceTypes": include_global_resource_types,
                 },
             }
         )
@@ -136,8 +193,8 @@ def create_or_update_config_recorder(
         )
 
 
-def has_existing_delivery_channel() -> bool:
-    config_client = connect_to_config()
+def has_existing_delivery_channel(region_name: Optional[str] = None) -> bool:
+    config_client = connect_to_config(region_name)
     try:
         response = config_client.describe_delivery_channels()
         if response and "DeliveryChannels" in response:
@@ -153,31 +210,32 @@ def has_existing_delivery_channel() -> bool:
 
 
 def create_delivery_channel(
-    config_bucket: str, aws_account: str, topic_arn: str
+    config_bucket: str,
+    aws_account: str,
+    topic_arn: str,
+    region_name: Optional[str] = None,
 ) -> None:
-    config_client = connect_to_config()
+    config_client = connect_to_config(region_name)
     try:
-        config_client.put_delivery_channel(
-            DeliveryChannel={
-                "name": DEFAULT_CHANNEL_NAME,
-                "s3BucketName": config_bucket,
-                "s3KeyPrefix": aws_account,
-                "snsTopicARN": topic_arn,
-                "configSnapshotDeliveryProperties": {
-                    "deliveryFrequency": "Twelve_Hours"
-                },
-            }
-        )
+        delivery_channel = {
+            "name": DEFAULT_CHANNEL_NAME,
+            "s3BucketName": config_bucket,
+            "s3KeyPrefix": aws_account,
+            "configSnapshotDeliveryProperties": {"deliveryFrequency": "Twelve_Hours"},
+        }
+        if topic_arn:
+            delivery_channel["snsTopicARN"] = topic_arn
+        config_client.put_delivery_channel(DeliveryChannel=delivery_channel)
     except Exception as e:
         raise RuntimeError(
             f"Encountered an error creating delivery channel 'default': {str(e)} \n\n{traceback.format_exc()}"
         )
 
 
-def start_recorder(recorder_name: str) -> None:
+def start_recorder(recorder_name: str, region_name: Optional[str] = None) -> None:
     if not recorder_name:
         recorder_name = DEFAULT_RECORDER_NAME
-    config_client = connect_to_config()
+    config_client = connect_to_config(region_name)
     try:
         config_client.start_configuration_recorder(
             ConfigurationRecorderName=recorder_name
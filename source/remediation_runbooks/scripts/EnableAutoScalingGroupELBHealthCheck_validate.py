@@ -2,12 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 
 def connect_to_autoscaling(boto_config):
-    return boto3.client("autoscaling", config=boto_config)
+    return get_client("autoscaling", config=boto_config)
 
 
 def verify(event, _):
@@ -1,14 +1,19 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_secretsmanager():
-    return boto3.client("secretsmanager", config=BOTO_CONFIG)
+    return get_client("secretsmanager", config=BOTO_CONFIG)
 
 
 # Check if secret rotation is enabled on the secet.
@@ -1,11 +1,16 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 
 def connect_to_cloudtrail(region, boto_config):
-    return boto3.client("cloudtrail", region_name=region, config=boto_config)
+    return get_client("cloudtrail", region_name=region, config=boto_config)
 
 
 def enable_trail_encryption(event, _):
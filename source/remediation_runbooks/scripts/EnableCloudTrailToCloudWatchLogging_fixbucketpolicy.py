@@ -1,13 +1,23 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import json
-import time
 from typing import Any, Dict
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
 
 def create_cloudtrail_bucket_policy(bucket, trail_arn, partition, account):
     return {
@@ -71,8 +81,8 @@ def merge_bucket_policies(
 
 def fix_cloudtrail_bucket_policy_for_logging(event, _):
     boto_config = Config(retries={"mode": "standard", "max_attempts": 5})
-    s3 = boto3.client("s3", config=boto_config)
-    cloudtrail = boto3.client("cloudtrail", config=boto_config)
+    s3 = get_client("s3", config=boto_config)
+    cloudtrail = get_client("cloudtrail", config=boto_config)
 
     trail_name = event["trail_name"]
     aws_partition = event["partition"]
@@ -104,18 +114,17 @@ def fix_cloudtrail_bucket_policy_for_logging(event, _):
             else cloudtrail_policy
         )
 
-        for attempt in range(3):
-            try:
-                s3.put_bucket_policy(Bucket=bucket, Policy=json.dumps(final_policy))
-                break
-            except ClientError as e:
-                if attempt < 2 and e.response["Error"]["Code"] in [
-                    "ServiceUnavailable",
-                    "SlowDown",
-                ]:
-                    time.sleep(2**attempt)
-                    continue
-                raise
+        def put_bucket_policy():
+            s3.put_bucket_policy(Bucket=bucket, Policy=json.dumps(final_policy))
+            return True
+
+        wait_until(
+            put_bucket_policy,
+            f"bucket policy update of {bucket}",
+            max_attempts=3,
+            retry_if=lambda e: isinstance(e, ClientError)
+            and e.response["Error"]["Code"] in ["ServiceUnavailable", "SlowDown"],
+        )
 
         return {
             "output": {
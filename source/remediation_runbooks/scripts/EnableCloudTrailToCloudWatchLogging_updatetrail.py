@@ -1,15 +1,30 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import time
-
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
+RETRYABLE_ERRORS = [
+    "InsufficientS3BucketPolicyException",
+    "ServiceUnavailable",
+    "Throttling",
+]
+
 
 def update_trail_with_error_handling(event, _):
     boto_config = Config(retries={"mode": "standard", "max_attempts": 5})
-    cloudtrail = boto3.client("cloudtrail", config=boto_config)
+    cloudtrail = get_client("cloudtrail", config=boto_config)
 
     trail_name = event["trail_name"]
     log_group_arn = event["log_group_arn"]
@@ -18,43 +33,34 @@ def update_trail_with_error_handling(event, _):
 
     try:
         last_error = None
-        for attempt in range(3):
-            try:
-                response = cloudtrail.update_trail(
+        try:
+            response = wait_until(
+                lambda: cloudtrail.update_trail(
                     Name=trail_name,
                     CloudWatchLogsLogGroupArn=log_group_arn,
                     CloudWatchLogsRoleArn=cloudwatch_role_arn,
-                )
+                ),
+                f"CloudTrail {trail_name} update",
+                initial_delay=5,
+                max_attempts=3,
+                retry_if=lambda e: isinstance(e, ClientError)
+                and e.response["Error"]["Code"] in RETRYABLE_ERRORS,
+            )
 
-                return {
-                    "output": {
-                        "Message": f"Successfully enabled CloudWatch logging for CloudTrail: {trail_name}",
-                        "TrailName": trail_name,
-                        "LogGroupArn": log_group_arn,
-                        "CloudWatchRoleArn": cloudwatch_role_arn,
-                        "TrailArn": response.get("TrailARN"),
-                        "Success": True,
-                        "ValidationWarning": not validation_result.get("Valid", True),
-                    }
+            return {
+                "output": {
+                    "Message": f"Successfully enabled CloudWatch logging for CloudTrail: {trail_name}",
+                    "TrailName": trail_name,
+                    "LogGroupArn": log_group_arn,
+                    "CloudWatchRoleArn": cloudwatch_role_arn,
+                    "TrailArn": response.get("TrailARN"),
+                    "Success": True,
+                    "ValidationWarning": not validation_result.get("Valid", True),
                 }
+            }
 
-            except ClientError as e:
-                last_error = e
-                error_code = e.response["Error"]["Code"]
-
-                if error_code == "InsufficientS3BucketPolicyException" and attempt < 2:
-                    time.sleep(5 * (attempt + 1))
-                    continue
-                elif error_code in [
-                    "InvalidCloudWatchLogsLogGroupArnException",
-                    "InvalidCloudWatchLogsRoleArnException",
-                ]:
-                    break
-                elif attempt < 2 and error_code in ["ServiceUnavailable", "Throttling"]:
-                    time.sleep(2**attempt)
-                    continue
-                else:
-                    break
+        except ClientError as e:
+            last_error = e
 
         return {
             "output": {
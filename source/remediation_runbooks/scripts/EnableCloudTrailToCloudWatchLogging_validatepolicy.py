@@ -1,13 +1,23 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import json
-import time
 from typing import Any, Dict
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
 
 def _validate_policy_statement(
     stmt: Dict[str, Any], trail_arn: str, checks: Dict[str, bool]
@@ -73,8 +83,8 @@ def validate_cloudtrail_policy_statements(
 
 def validate_cloudtrail_bucket_policy(event, _):
     boto_config = Config(retries={"mode": "standard", "max_attempts": 3})
-    s3 = boto3.client("s3", config=boto_config)
-    cloudtrail = boto3.client("cloudtrail", config=boto_config)
+    s3 = get_client("s3", config=boto_config)
+    cloudtrail = get_client("cloudtrail", config=boto_config)
 
     trail_name = event["trail_name"]
 
@@ -87,27 +97,27 @@ def validate_cloudtrail_bucket_policy(event, _):
         if not bucket or not trail_arn:
             raise ValueError(f"Trail {trail_name} missing S3 bucket or ARN")
 
-        current_policy = None
-        for attempt in range(3):
-            try:
-                policy_response = s3.get_bucket_policy(Bucket=bucket)
-                current_policy = json.loads(policy_response["Policy"])
-                break
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchBucketPolicy":
-                    return {
-                        "output": {
-                            "Valid": False,
-                            "Message": f"No bucket policy found for {bucket}",
-                            "BucketName": bucket,
-                            "TrailArn": trail_arn,
-                        }
-                    }
-                elif attempt < 2:
-                    time.sleep(2)
-                    continue
-                else:
-                    raise
+        try:
+            policy_response = wait_until(
+                lambda: s3.get_bucket_policy(Bucket=bucket),
+                f"bucket policy of {bucket}",
+                initial_delay=2,
+                max_attempts=3,
+                retry_if=lambda e: isinstance(e, ClientError)
+                and e.response["Error"]["Code"] != "NoSuchBucketPolicy",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchBucketPolicy":
+                raise
+            return {
+                "output": {
+                    "Valid": False,
+                    "Message": f"No bucket policy found for {bucket}",
+                    "BucketName": bucket,
+                    "TrailArn": trail_arn,
+                }
+            }
+        current_policy = json.loads(policy_response["Policy"])
 
         validation_result = validate_cloudtrail_policy_statements(
             current_policy, trail_arn
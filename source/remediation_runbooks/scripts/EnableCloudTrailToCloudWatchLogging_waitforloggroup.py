@@ -2,10 +2,21 @@
 # SPDX-License-Identifier: Apache-2.0
 import time
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import WaiterTimeoutError, wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
 
 class LogGroupOperationError(Exception):
     pass
@@ -16,11 +27,11 @@ class LogGroupNotFoundError(LogGroupOperationError):
 
 
 def connect_to_logs(boto_config):
-    return boto3.client("logs", config=boto_config)
+    return get_client("logs", config=boto_config)
 
 
-def sleep_between_attempts():
-    time.sleep(2)
+def sleep_between_attempts(seconds):
+    time.sleep(seconds)
 
 
 def _find_existing_log_group(cwl_client, log_group_name):
@@ -61,33 +72,32 @@ def _create_log_group(cwl_client, log_group_name):
 
 
 def _wait_for_log_group_creation(cwl_client, log_group_name, max_retries=3):
-    attempts = 0
-    while attempts < max_retries:
-        try:
-            describe_group = cwl_client.describe_log_groups(
-                logGroupNamePrefix=log_group_name
-            )
-            print(f"Found {len(describe_group['logGroups'])} log groups")
-            for group in describe_group["logGroups"]:
-                if group["logGroupName"] == log_group_name:
-                    return str(group["arn"])
-
-            # Log group not found yet, wait and retry
-            sleep_between_attempts()
-            attempts += 1
-
-        except ClientError as err:
-            print(f"Error describing log groups: {str(err)}")
-            if attempts >= max_retries - 1:
-                raise LogGroupNotFoundError(
-                    f"Failed to find Log Group {log_group_name}: {str(err)}"
-                )
-            sleep_between_attempts()
-            attempts += 1
+    def find_log_group():
+        describe_group = cwl_client.describe_log_groups(
+            logGroupNamePrefix=log_group_name
+        )
+        print(f"Found {len(describe_group['logGroups'])} log groups")
+        for group in describe_group["logGroups"]:
+            if group["logGroupName"] == log_group_name:
+                return str(group["arn"])
+        return None
 
-    raise LogGroupNotFoundError(
-        f"Failed to find Log Group {log_group_name}: Timed out after {max_retries} attempts"
-    )
+    try:
+        return wait_until(
+            find_log_group,
+            f"log group {log_group_name}",
+            max_attempts=max_retries,
+            retry_if=lambda e: isinstance(e, ClientError),
+            sleep=sleep_between_attempts,
+        )
+    except ClientError as err:
+        raise LogGroupNotFoundError(
+            f"Failed to find Log Group {log_group_name}: {str(err)}"
+        )
+    except WaiterTimeoutError:
+        raise LogGroupNotFoundError(
+            f"Failed to find Log Group {log_group_name}: Timed out after {max_retries} attempts"
+        )
 
 
 def create_or_get_loggroup(event, _):
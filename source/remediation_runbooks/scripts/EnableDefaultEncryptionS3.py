@@ -0,0 +1,78 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Configure default encryption for every bucket in an account that does not have it.
+The runbook itself encrypts one bucket with the PutBucketEncryption API.
+"""
+from botocore.exceptions import ClientError
+
+try:
+    from s3_bucket_sweep import sweep_buckets
+except ImportError:
+    # s3_bucket_sweep.py is inlined ahead of this script in the runbook
+    pass
+
+# The KmsKeyAlias value that selects AES-256 rather than a customer managed key
+DEFAULT_KMS_KEY_ALIAS = "default-s3-encryption"
+
+
+def get_encryption_configuration(kms_key_alias):
+    if kms_key_alias == DEFAULT_KMS_KEY_ALIAS:
+        encryption_by_default = {"SSEAlgorithm": "AES256"}
+    else:
+        encryption_by_default = {
+            "SSEAlgorithm": "aws:kms",
+            "KMSMasterKeyID": kms_key_alias,
+        }
+    return {
+        "Rules": [
+            {
+                "ApplyServerSideEncryptionByDefault": encryption_by_default,
+                "BucketKeyEnabled": True,
+            }
+        ]
+    }
+
+
+def get_sse_algorithm(s3, bucket_name, account_id):
+    """The bucket's default encryption algorithm, or None if it has none"""
+    try:
+        rules = s3.get_bucket_encryption(
+            Bucket=bucket_name, ExpectedBucketOwner=account_id
+        )["ServerSideEncryptionConfiguration"]["Rules"]
+    except ClientError as ex:
+        if (
+            ex.response["Error"]["Code"]
+            == "ServerSideEncryptionConfigurationNotFoundError"
+        ):
+            return None
+        raise
+    for rule in rules:
+        encryption_by_default = rule.get("ApplyServerSideEncryptionByDefault", {})
+        if encryption_by_default.get("SSEAlgorithm"):
+            return encryption_by_default["SSEAlgorithm"]
+    return None
+
+
+def sweep_handler(event, _):
+    """
+    Sets default encryption on every bucket in the account that is not encrypted,
+    or, when a customer managed key is given, not encrypted with KMS
+    """
+    kms_key_alias = event.get("KmsKeyAlias") or DEFAULT_KMS_KEY_ALIAS
+    encryption_configuration = get_encryption_configuration(kms_key_alias)
+
+    def is_compliant(s3, bucket_name, account_id):
+        sse_algorithm = get_sse_algorithm(s3, bucket_name, account_id)
+        if kms_key_alias == DEFAULT_KMS_KEY_ALIAS:
+            return sse_algorithm is not None
+        return sse_algorithm in ["aws:kms", "aws:kms:dsse"]
+
+    def remediate(s3, bucket_name, account_id):
+        s3.put_bucket_encryption(
+            Bucket=bucket_name,
+            ServerSideEncryptionConfiguration=encryption_configuration,
+            ExpectedBucketOwner=account_id,
+        )
+
+    return sweep_buckets(event["AccountId"], is_compliant, remediate)
@@ -0,0 +1,54 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from botocore.config import Config
+
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from multi_region import apply_in_regions, summarize_regions
+except ImportError:
+    # multi_region.py is inlined ahead of this script in the runbook
+    pass
+
+BOTO_CONFIG = Config(retries={"mode": "standard"})
+
+
+def connect_to_ec2(region_name=None):
+    return get_client("ec2", region_name, BOTO_CONFIG)
+
+
+def lambda_handler(_, __):
+    return {"output": {"Message": enable_ebs_encryption_by_default(connect_to_ec2())}}
+
+
+def all_regions_handler(_, __):
+    """
+    Enables EBS encryption by default in every enabled region of the account
+    """
+    results = apply_in_regions(
+        lambda region: enable_ebs_encryption_by_default(connect_to_ec2(region)),
+        ["ec2"],
+        BOTO_CONFIG,
+    )
+
+    return {
+        "output": {
+            "Message": summarize_regions(results, "EBS encryption by default enabled"),
+            "Regions": results,
+        }
+    }
+
+
+def enable_ebs_encryption_by_default(ec2):
+    if ec2.get_ebs_encryption_by_default()["EbsEncryptionByDefault"]:
+        return "EBS encryption by default is already enabled."
+
+    ec2.enable_ebs_encryption_by_default()
+
+    if not ec2.get_ebs_encryption_by_default()["EbsEncryptionByDefault"]:
+        raise RuntimeError("Failed to verify that EBS encryption by default is enabled")
+    return "EBS encryption by default enabled."
@@ -1,18 +1,51 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from multi_region import apply_in_regions, summarize_regions
+except ImportError:
+    # multi_region.py is inlined ahead of this script in the runbook
+    pass
+
 BOTO_CONFIG = Config(retries={"mode": "standard"})
 
 
-def connect_to_guardduty(boto_config):
-    return boto3.client("guardduty", config=boto_config)
+def connect_to_guardduty(boto_config, region_name=None):
+    return get_client("guardduty", region_name, boto_config)
 
 
 def lambda_handler(_, __):
     guardduty = connect_to_guardduty(BOTO_CONFIG)
 
+    return {"output": {"Message": enable_guardduty(guardduty)}}
+
+
+def all_regions_handler(_, __):
+    """
+    Enables GuardDuty in every enabled region of the account
+    """
+    results = apply_in_regions(
+        lambda region: enable_guardduty(connect_to_guardduty(BOTO_CONFIG, region)),
+        ["guardduty"],
+        BOTO_CONFIG,
+    )
+
+    return {
+        "output": {
+            "Message": summarize_regions(results, "GuardDuty enabled"),
+            "Regions": results,
+        }
+    }
+
+
+def enable_guardduty(guardduty):
     detector_list = guardduty.list_detectors()["DetectorIds"]
 
     if detector_list == []:
@@ -24,11 +57,7 @@ def lambda_handler(_, __):
             },
         )
 
-        return {
-            "output": {
-                "Message": f'GuardDuty Enabled. Detector {detector["DetectorId"]} created'
-            }
-        }
+        return f'GuardDuty Enabled. Detector {detector["DetectorId"]} created'
 
     else:
         for detector_id in detector_list:
@@ -41,10 +70,6 @@ def lambda_handler(_, __):
                         "Kubernetes": {"AuditLogs": {"Enable": True}},
                     },
                 )
-                return {
-                    "output": {
-                        "Message": f"GuardDuty Enabled. Existing detector {detector_id} has been enabled."
-                    }
-                }
+                return f"GuardDuty Enabled. Existing detector {detector_id} has been enabled."
 
-        return {"output": {"Message": "GuardDuty is already enabled."}}
+        return "GuardDuty is already enabled."
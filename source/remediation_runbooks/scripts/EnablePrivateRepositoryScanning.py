@@ -1,13 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_ecr():
-    return boto3.client("ecr", config=boto_config)
+    return get_client("ecr", config=boto_config)
 
 
 def lambda_handler(event, _):
@@ -2,17 +2,28 @@
 # SPDX-License-Identifier: Apache-2.0
 import time
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import WaiterTimeoutError, wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
 
 def connect_to_logs(boto_config):
-    return boto3.client("logs", config=boto_config)
+    return get_client("logs", config=boto_config)
 
 
 def connect_to_ec2(boto_config):
-    return boto3.client("ec2", config=boto_config)
+    return get_client("ec2", config=boto_config)
 
 
 def log_group_exists(client, group):
@@ -34,13 +45,28 @@ def wait_for_seconds(wait_interval):
     time.sleep(wait_interval)
 
 
+def wait_with_backoff(condition, description, wait_interval, max_retries):
+    # Back off from one second to twice wait_interval, making at most max_retries checks
+    wait_until(
+        condition,
+        description,
+        initial_delay=min(1, wait_interval),
+        max_delay=2 * wait_interval,
+        max_attempts=max_retries,
+        sleep=wait_for_seconds,
+    )
+
+
 def wait_for_loggroup(client, wait_interval, max_retries, loggroup):
-    attempts = 1
-    while not log_group_exists(client, loggroup):
-        wait_for_seconds(wait_interval)
-        attempts += 1
-        if attempts > max_retries:
-            exit(f"Timeout waiting for log group {loggroup} to become active")
+    try:
+        wait_with_backoff(
+            lambda: log_group_exists(client, loggroup),
+            f"log group {loggroup}",
+            wait_interval,
+            max_retries,
+        )
+    except WaiterTimeoutError:
+        exit(f"Timeout waiting for log group {loggroup} to become active")
 
 
 def flowlogs_active(client, loggroup):
@@ -62,14 +88,15 @@ def flowlogs_active(client, loggroup):
 
 
 def wait_for_flowlogs(client, wait_interval, max_retries, loggroup):
-    attempts = 1
-    while not flowlogs_active(client, loggroup):
-        wait_for_seconds(wait_interval)
-        attempts += 1
-        if attempts > max_retries:
-            exit(
-                f"Timeout waiting for flowlogs to log group {loggroup} to become active"
-            )
+    try:
+        wait_with_backoff(
+            lambda: flowlogs_active(client, loggroup),
+            f"flow logs to log group {loggroup}",
+            wait_interval,
+            max_retries,
+        )
+    except WaiterTimeoutError:
+        exit(f"Timeout waiting for flowlogs to log group {loggroup} to become active")
 
 
 def enable_flow_logs(event, _):
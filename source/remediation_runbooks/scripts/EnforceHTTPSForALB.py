@@ -2,14 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
 def get_elbv2_client():
-    return boto3.client("elbv2", config=boto_config)
+    return get_client("elbv2", config=boto_config)
 
 
 class Event(TypedDict):
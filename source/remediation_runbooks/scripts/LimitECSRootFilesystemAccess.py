@@ -2,9 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
@@ -18,7 +23,7 @@ class Response(TypedDict):
 
 
 def get_ecs_client():
-    return boto3.client("ecs", config=boto_config)
+    return get_client("ecs", config=boto_config)
 
 
 def handler(event, _) -> Response:
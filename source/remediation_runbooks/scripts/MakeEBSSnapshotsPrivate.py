@@ -1,47 +1,131 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+# Snapshots are made private and verified this many at a time
+CHUNK_SIZE = 1000
+# describe_snapshots accepts at most 1000 snapshot IDs per request
+MAX_DESCRIBE_IDS = 1000
+MAX_WORKERS = 10
+FAILURE_SAMPLE_SIZE = 10
+
 
 def connect_to_ec2(boto_config):
-    return boto3.client("ec2", config=boto_config)
+    return get_client("ec2", config=boto_config)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def make_snapshot_private(ec2, snapshot_id):
+    try:
+        ec2.modify_snapshot_attribute(
+            Attribute="CreateVolumePermission",
+            CreateVolumePermission={"Remove": [{"Group": "all"}]},
+            SnapshotId=snapshot_id,
+        )
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def get_public_snapshot_ids(ec2, snapshot_ids):
+    """Return which of the snapshots are still restorable by all AWS accounts"""
+    public_snapshot_ids = set()
+    paginator = ec2.get_paginator("describe_snapshots")
+    for batch in chunked(snapshot_ids, MAX_DESCRIBE_IDS):
+        for page in paginator.paginate(SnapshotIds=batch, RestorableByUserIds=["all"]):
+            public_snapshot_ids.update(
+                snapshot["SnapshotId"] for snapshot in page.get("Snapshots", [])
+            )
+    return public_snapshot_ids
+
+
+def verify_snapshots(ec2, snapshot_ids):
+    """
+    Return the failures for the snapshots that are still public or could not be
+    verified. One snapshot that cannot be described, such as one deleted since it was
+    made private, fails the whole request, so then each snapshot is verified alone.
+    """
+    try:
+        still_public = get_public_snapshot_ids(ec2, snapshot_ids)
+    except Exception as e:
+        print(f"FAILED to verify {len(snapshot_ids)} Snapshots together: {str(e)}")
+    else:
+        return [
+            {"SnapshotId": snapshot_id, "Error": "Snapshot is still public"}
+            for snapshot_id in snapshot_ids
+            if snapshot_id in still_public
+        ]
+
+    failures = []
+    for snapshot_id in snapshot_ids:
+        try:
+            if get_public_snapshot_ids(ec2, [snapshot_id]):
+                failures.append(
+                    {"SnapshotId": snapshot_id, "Error": "Snapshot is still public"}
+                )
+        except Exception as e:
+            failures.append(
+                {"SnapshotId": snapshot_id, "Error": f"Could not verify: {str(e)}"}
+            )
+    return failures
 
 
 def make_snapshots_private(event, _):
-    boto_config = Config(retries={"mode": "standard", "max_attempts": 10})
+    # Adaptive retries rate-limit the client's requests, shared by the worker threads,
+    # when EC2 throttles them
+    boto_config = Config(retries={"mode": "adaptive", "max_attempts": 10})
     ec2 = connect_to_ec2(boto_config)
 
-    remediated = []
-    snapshots = event["snapshots"]
-
+    total_count = 0
     success_count = 0
+    failures = []
 
-    for snapshot_id in snapshots:
-        try:
-            ec2.modify_snapshot_attribute(
-                Attribute="CreateVolumePermission",
-                CreateVolumePermission={"Remove": [{"Group": "all"}]},
-                SnapshotId=snapshot_id,
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for chunk in chunked(event["snapshots"], CHUNK_SIZE):
+            total_count += len(chunk)
+            errors = executor.map(
+                lambda snapshot_id: make_snapshot_private(ec2, snapshot_id), chunk
             )
-            print(f"Snapshot {snapshot_id} permissions set to private")
 
-            remediated.append(snapshot_id)
-            success_count += 1
-        except Exception as e:
-            print(e)
-            print(f"FAILED to remediate Snapshot {snapshot_id}")
+            remediated = []
+            for snapshot_id, error in zip(chunk, errors):
+                if error:
+                    failures.append({"SnapshotId": snapshot_id, "Error": error})
+                else:
+                    remediated.append(snapshot_id)
+
+            unverified = verify_snapshots(ec2, remediated)
+            failures.extend(unverified)
+
+            success_count += len(remediated) - len(unverified)
+            print(
+                f"{success_count} of {total_count} Snapshot permissions set to private"
+            )
 
-    result = json.dumps(
-        ec2.describe_snapshots(SnapshotIds=remediated), indent=2, default=str
-    )
-    print(result)
+    if failures:
+        raise RuntimeError(
+            f"Failed to make {len(failures)} of {total_count} Snapshots private: "
+            f"{json.dumps(failures[:FAILURE_SAMPLE_SIZE])}"
+        )
 
     return {
         "response": {
-            "message": f"{success_count} of {len(snapshots)} Snapshot permissions set to private",
+            "message": f"{success_count} of {total_count} Snapshot permissions set to private",
             "status": "Success",
         }
     }
@@ -1,12 +1,17 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 
 def connect_to_rds():
     boto_config = Config(retries={"mode": "standard"})
-    return boto3.client("rds", config=boto_config)
+    return get_client("rds", config=boto_config)
 
 
 def make_snapshot_private(event, _):
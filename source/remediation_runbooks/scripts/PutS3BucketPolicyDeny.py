@@ -9,23 +9,38 @@ resources.
 Note:
 - The deny list is a comma-separated list configured on the Config rule in parameter blacklistedActionPattern
 """
-import copy
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from bucket_policy_engine import (
+        BucketPolicy,
+        PolicySizeError,
+        compact_principals,
+        get_principal_account,
+    )
+except ImportError:
+    # bucket_policy_engine.py is inlined ahead of this script in the runbook
+    pass
+
 BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_s3():
-    return boto3.client("s3", config=BOTO_CONFIG)
+    return get_client("s3", config=BOTO_CONFIG)
 
 
 def get_partition():
     return (
-        boto3.client("sts", config=BOTO_CONFIG)
+        get_client("sts", config=BOTO_CONFIG)
         .get_caller_identity()
         .get("Arn")
         .split(":")[1]
@@ -43,6 +58,7 @@ class BucketToRemediate:
 
     def initialize_bucket_policy_to_none(self):
         self.bucket_policy = None
+        self.policy_updated = False
 
     def get_partition_where_running(self):
         self.partition = get_partition()
@@ -84,41 +100,31 @@ class BucketToRemediate:
                 f"Failed to store the new bucket policy: {self.account_id} {self.bucket_name}"
             )
 
-    def __principal_is_asterisk(self, principals):
-        return True if isinstance(principals, str) and principals == "*" else False
-
-    def get_account_principals_from_bucket_policy_statement(self, statement_principals):
-        aws_account_principals = []
-        for principal_type, principal in statement_principals.items():
-            if principal_type != "AWS":
-                continue  # not an AWS account
-            aws_account_principals = (
-                principal if isinstance(principal, list) else [principal]
-            )
-        return aws_account_principals
+    def get_cross_account_principals(self, policy):
+        """The AWS principals in other accounts that the policy allows"""
+        return [
+            principal
+            for principal in policy.get_aws_principals(effect="Allow")
+            if get_principal_account(principal) not in [None, self.account_id]
+        ]
 
     def create_explicit_deny_in_bucket_policy(self):
-        new_bucket_policy = json.loads(self.bucket_policy)  # type: ignore[arg-type]
+        """
+        Add a statement denying the denylist to the cross-account principals.
+        :return: whether there are cross-account principals to deny
+        """
+        policy = BucketPolicy.from_json(self.bucket_policy)  # type: ignore[arg-type]
         deny_statement = DenyStatement(self)
-        for statement in new_bucket_policy["Statement"]:
-            principals = statement.get("Principal", None)
-            if principals and not self.__principal_is_asterisk(principals):
-                account_principals = (
-                    self.get_account_principals_from_bucket_policy_statement(
-                        copy.deepcopy(principals)
-                    )
-                )
-                deny_statement.add_next_principal_to_deny(
-                    account_principals, self.account_id
-                )
+        deny_statement.add_deny_principals(self.get_cross_account_principals(policy))
+        if not deny_statement.deny_statement_json["Principal"]["AWS"]:
+            return False
 
-        if (
-            deny_statement.deny_statement_json
-            and len(deny_statement.deny_statement_json["Principal"]["AWS"]) > 0
-        ):
-            new_bucket_policy["Statement"].append(deny_statement.deny_statement_json)
-            self.bucket_policy = json.dumps(new_bucket_policy)
-            return True
+        self.policy_updated = policy.add_statement(deny_statement.deny_statement_json)
+        try:
+            self.bucket_policy = policy.serialize()
+        except PolicySizeError as e:
+            exit(f"{str(e)}: {self.account_id} {self.bucket_name}")
+        return True
 
 
 class DenyStatement:
@@ -139,19 +145,10 @@ class DenyStatement:
     def __str__(self):
         return json.dumps(self.deny_statement_json)
 
-    def add_next_principal_to_deny(self, principals_to_deny, bucket_account):
-        if len(principals_to_deny) == 0:
-            return
-        this_principal = principals_to_deny.pop()
-        principal_account = this_principal.split(":")[4]
-        if principal_account and principal_account != bucket_account:
-            self.add_deny_principal(this_principal)
-
-        self.add_next_principal_to_deny(principals_to_deny, bucket_account)
-
-    def add_deny_principal(self, principal_arn):
-        if principal_arn not in self.deny_statement_json["Principal"]["AWS"]:
-            self.deny_statement_json["Principal"]["AWS"].append(principal_arn)
+    def add_deny_principals(self, principal_arns: List[str]) -> None:
+        self.deny_statement_json["Principal"]["AWS"] = compact_principals(
+            self.deny_statement_json["Principal"]["AWS"] + principal_arns
+        )
 
 
 def update_bucket_policy(event, _):
@@ -164,7 +161,13 @@ def update_bucket_policy(event, _):
     bucket_to_update.set_account_id_from_event(event)
     bucket_to_update.get_current_bucket_policy()
     if bucket_to_update.create_explicit_deny_in_bucket_policy():
-        bucket_to_update.update_bucket_policy()
+        if bucket_to_update.policy_updated:
+            bucket_to_update.update_bucket_policy()
+        else:
+            print(
+                f"The bucket policy for {bucket_to_update.bucket_name} already denies "
+                "the cross-account principals"
+            )
     else:
         exit(
             f"Unable to create an explicit deny statement for {bucket_to_update.bucket_name}"
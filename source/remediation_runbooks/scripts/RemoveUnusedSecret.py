@@ -3,9 +3,14 @@
 
 from datetime import datetime, timezone
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
 # Current date in the same format SecretsManager tracks LastAccessedDate
@@ -15,7 +20,7 @@ DATE_TODAY = datetime.now().replace(
 
 
 def connect_to_secretsmanager():
-    return boto3.client("secretsmanager", config=BOTO_CONFIG)
+    return get_client("secretsmanager", config=BOTO_CONFIG)
 
 
 def lambda_handler(event, _):
@@ -2,20 +2,31 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TypedDict
 
-import boto3
 from botocore.config import Config
 
-BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
-
-# IPV4 and IPV6 open access
-OPENIPV4 = "0.0.0.0/0"
-OPENIPV6 = "::/0"
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from security_group_rule_engine import (
+        is_all_traffic_rule,
+        is_open_ingress_rule,
+        is_range_covered,
+        revoke_ingress_rules,
+        to_port_intervals,
+    )
+except ImportError:
+    # security_group_rule_engine.py is inlined ahead of this script in the runbook
+    pass
 
-PROTOCOLS = {"tcp", "udp", "-1"}
+BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_ec2():
-    return boto3.client("ec2", config=BOTO_CONFIG)
+    return get_client("ec2", config=BOTO_CONFIG)
 
 
 class Event(TypedDict):
@@ -77,26 +88,13 @@ def get_security_group_rules(security_group_id: str) -> list:
         exit("Failed to describe security group rules: " + str(e))
 
 
-def has_open_access(rule: dict) -> bool:
-    return ("CidrIpv4" in rule and rule["CidrIpv4"] == OPENIPV4) or (
-        "CidrIpv6" in rule and rule["CidrIpv6"] == OPENIPV6
-    )
-
-
-def check_unauthorized_ports(authorized_ports: set, rule: dict) -> bool:
-    for port in range(rule["FromPort"], rule["ToPort"] + 1):
-        if (port not in authorized_ports) and has_open_access(rule):
-            return True
-    return False
+def check_unauthorized_ports(authorized_intervals: list, rule: dict) -> bool:
+    return not is_range_covered(rule["FromPort"], rule["ToPort"], authorized_intervals)
 
 
-def is_all_traffic_rule_with_open_access(rule: dict) -> bool:
-    return (rule["FromPort"] == rule["ToPort"] == -1) and has_open_access(rule)
-
-
-def should_revoke_rule(rule: dict, authorized_ports: set) -> bool:
-    return is_all_traffic_rule_with_open_access(rule) or check_unauthorized_ports(
-        authorized_ports, rule
+def should_revoke_rule(rule: dict, authorized_intervals: list) -> bool:
+    return is_all_traffic_rule(rule) or check_unauthorized_ports(
+        authorized_intervals, rule
     )
 
 
@@ -106,25 +104,21 @@ def revoke_unauthorized_rules(
     authorized_tcp_ports: set,
     authorized_udp_ports: set,
 ) -> list:
-    ec2 = connect_to_ec2()
-    rules_deleted = []
+    authorized_tcp_intervals = to_port_intervals(authorized_tcp_ports)
+    authorized_udp_intervals = to_port_intervals(authorized_udp_ports)
+
+    rule_ids = []
     for rule in security_group_rules:
-        if rule["IpProtocol"] not in PROTOCOLS or rule["IsEgress"]:
+        if not is_open_ingress_rule(rule):
             continue
 
-        authorized_ports = (
-            authorized_tcp_ports
+        authorized_intervals = (
+            authorized_tcp_intervals
             if rule["IpProtocol"] == "tcp"
-            else authorized_udp_ports
+            else authorized_udp_intervals
         )
 
-        if should_revoke_rule(rule, authorized_ports):
-            try:
-                ec2.revoke_security_group_ingress(
-                    GroupId=security_group_id,
-                    SecurityGroupRuleIds=[rule["SecurityGroupRuleId"]],
-                )
-                rules_deleted.append(rule["SecurityGroupRuleId"])
-            except Exception as e:
-                print(f"Failed to delete rule {rule['SecurityGroupRuleId']}: {str(e)}")
-    return rules_deleted
+        if should_revoke_rule(rule, authorized_intervals):
+            rule_ids.append(rule["SecurityGroupRuleId"])
+
+    return revoke_ingress_rules(connect_to_ec2(), security_group_id, rule_ids)
@@ -3,9 +3,20 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Dict, List, Literal, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from iam_credential_report import revoke_stale_credentials
+except ImportError:
+    # iam_credential_report.py is inlined ahead of this script in the account-wide step
+    pass
+
 if TYPE_CHECKING:
     from mypy_boto3_iam.type_defs import EmptyResponseMetadataTypeDef
 else:
@@ -24,7 +35,7 @@ responses["DeactivateUnusedKeysResponse"] = []
 
 
 def connect_to_iam(boto_config):
-    return boto3.client("iam", config=boto_config)
+    return get_client("iam", config=boto_config)
 
 
 def list_access_keys(user_name, include_inactive=False):
@@ -102,3 +113,21 @@ def unrotated_key_handler(event, _):
     access_keys = list_access_keys(user_name)
     deactivate_unused_keys(access_keys, max_credential_usage_age, user_name)
     return verify_expired_credentials_revoked(responses, user_name)
+
+
+def account_unrotated_key_handler(event, _):
+    """Deactivate the unrotated access keys of every IAM user in the account"""
+    max_credential_usage_age = int(event.get("MaxCredentialUsageAge"))
+    result = revoke_stale_credentials(
+        connect_to_iam(boto_config), max_credential_usage_age, rotation=True
+    )
+    if result["Failures"]:
+        raise RuntimeError(
+            "VERIFICATION FAILED. ACCESS KEYS OF {} USERS NOT DEACTIVATED: {}".format(
+                result["Failures"], result["FailureSamples"]
+            )
+        )
+    return {
+        "output": "Verification of unrotated access keys is successful.",
+        "result": result,
+    }
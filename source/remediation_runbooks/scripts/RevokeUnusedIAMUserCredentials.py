@@ -3,15 +3,26 @@
 from datetime import datetime, timezone
 from typing import Optional, TypedDict
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from iam_credential_report import revoke_stale_credentials
+except ImportError:
+    # iam_credential_report.py is inlined ahead of this script in the account-wide step
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
 def connect_to_service(service):
-    return boto3.client(service, config=boto_config)
+    return get_client(service, config=boto_config)
 
 
 class Event(TypedDict):
@@ -26,6 +37,16 @@ class HandlerResponse(TypedDict):
     DeletedProfile: Optional[str]
 
 
+class AccountEvent(TypedDict):
+    MaxCredentialUsageAge: str
+
+
+class AccountHandlerResponse(TypedDict):
+    Message: str
+    Status: str
+    Result: dict
+
+
 class LoginProfile(TypedDict):
     UserName: str
     CreateDate: datetime
@@ -57,6 +78,32 @@ def handler(event, _) -> HandlerResponse:
         )
 
 
+def account_handler(event, _) -> AccountHandlerResponse:
+    """Revoke the unused credentials of every IAM user in the account"""
+    try:
+        max_credential_usage_age = int(event.get("MaxCredentialUsageAge"))
+
+        result = revoke_stale_credentials(
+            connect_to_service("iam"), max_credential_usage_age
+        )
+    except Exception as e:
+        raise RuntimeError(
+            f"Encountered error while revoking unusued IAM user credentials: {str(e)}"
+        )
+
+    if result["Failures"]:
+        raise RuntimeError(
+            f"Failed to revoke unused credentials for {result['Failures']} IAM users: "
+            f"{result}"
+        )
+
+    return {
+        "Message": "Successfully revoked unused IAM user credentials",
+        "Status": "Success",
+        "Result": result,
+    }
+
+
 def list_access_keys(user_name: str) -> list:
     iam_client = connect_to_service("iam")
     try:
@@ -1,11 +1,15 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-import boto3
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
 
 
 def lambda_handler(event, _):
     # Initialize the CloudFront client
-    cloudfront_client = boto3.client("cloudfront")
+    cloudfront_client = get_client("cloudfront")
 
     # The ID of the CloudFront distribution you want to update
     distribution_id = event["Id"]
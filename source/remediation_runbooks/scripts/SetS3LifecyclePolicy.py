@@ -1,14 +1,27 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from s3_bucket_sweep import sweep_buckets
+except ImportError:
+    # s3_bucket_sweep.py is inlined ahead of this script in the runbook
+    pass
+
+RULE_ID = "S3.13 Remediation Example"
+
 BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_s3():
-    return boto3.client("s3", config=BOTO_CONFIG)
+    return get_client("s3", config=BOTO_CONFIG)
 
 
 def lambda_handler(event, _):
@@ -17,15 +30,46 @@ def lambda_handler(event, _):
     target_transition_days = int(event["TargetTransitionDays"])
     target_expiration_days = int(event["TargetExpirationDays"])
     target_transition_storage_class = event["TargetTransitionStorageClass"]
-    rule_id = "S3.13 Remediation Example"
     s3 = connect_to_s3()
 
+    lifecycle_policy = get_lifecycle_policy(
+        target_transition_days,
+        target_expiration_days,
+        target_transition_storage_class,
+    )
+
+    # Set example lifecycle policy
+    # Moves objects larger than 128 KB to Intelligent Tiering storage class after 30 days
+    s3.put_bucket_lifecycle_configuration(
+        Bucket=bucket_name, LifecycleConfiguration=lifecycle_policy
+    )
+
+    # Get new lifecycle configuration
+    lifecycle_config = s3.get_bucket_lifecycle_configuration(
+        Bucket=bucket_name,
+    )
+
+    if lifecycle_config["Rules"][0]["ID"] == RULE_ID:
+        return {
+            "message": "Successfully set example S3 lifecycle policy. Review and update as needed.",
+            "status": "Success",
+        }
+
+    else:
+        raise RuntimeError(
+            "Failed to set S3 lifecycle policy. Lifecycle rule ID did not match 'S3.13 Remediation Example'"
+        )
+
+
+def get_lifecycle_policy(
+    target_transition_days, target_expiration_days, target_transition_storage_class
+):
     lifecycle_policy = {}
     if target_expiration_days != 0:
         lifecycle_policy = {
             "Rules": [
                 {
-                    "ID": rule_id,
+                    "ID": RULE_ID,
                     "Status": "Enabled",
                     "Expiration": {
                         "Days": target_expiration_days,
@@ -46,7 +90,7 @@ def lambda_handler(event, _):
         lifecycle_policy = {
             "Rules": [
                 {
-                    "ID": rule_id,
+                    "ID": RULE_ID,
                     "Status": "Enabled",
                     "Transitions": [
                         {
@@ -60,25 +104,38 @@ def lambda_handler(event, _):
                 },
             ],
         }
+    return lifecycle_policy
 
-    # Set example lifecycle policy
-    # Moves objects larger than 128 KB to Intelligent Tiering storage class after 30 days
-    s3.put_bucket_lifecycle_configuration(
-        Bucket=bucket_name, LifecycleConfiguration=lifecycle_policy
-    )
 
-    # Get new lifecycle configuration
-    lifecycle_config = s3.get_bucket_lifecycle_configuration(
-        Bucket=bucket_name,
-    )
+def has_lifecycle_configuration(s3, bucket_name, account_id):
+    try:
+        return bool(
+            s3.get_bucket_lifecycle_configuration(
+                Bucket=bucket_name, ExpectedBucketOwner=account_id
+            )["Rules"]
+        )
+    except s3.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchLifecycleConfiguration":
+            return False
+        raise
 
-    if lifecycle_config["Rules"][0]["ID"] == rule_id:
-        return {
-            "message": "Successfully set example S3 lifecycle policy. Review and update as needed.",
-            "status": "Success",
-        }
 
-    else:
-        raise RuntimeError(
-            "Failed to set S3 lifecycle policy. Lifecycle rule ID did not match 'S3.13 Remediation Example'"
+def sweep_handler(event, _):
+    """
+    Sets the example lifecycle policy on every bucket in the account that has no
+    lifecycle configuration
+    """
+    lifecycle_policy = get_lifecycle_policy(
+        int(event["TargetTransitionDays"]),
+        int(event["TargetExpirationDays"]),
+        event["TargetTransitionStorageClass"],
+    )
+
+    def remediate(s3, bucket_name, account_id):
+        s3.put_bucket_lifecycle_configuration(
+            Bucket=bucket_name,
+            LifecycleConfiguration=lifecycle_policy,
+            ExpectedBucketOwner=account_id,
         )
+
+    return sweep_buckets(event["AccountId"], has_lifecycle_configuration, remediate)
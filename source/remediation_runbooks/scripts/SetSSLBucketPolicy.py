@@ -2,15 +2,32 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from bucket_policy_engine import BucketPolicy, PolicySizeError
+except ImportError:
+    # bucket_policy_engine.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from s3_bucket_sweep import sweep_buckets
+except ImportError:
+    # s3_bucket_sweep.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_s3():
-    return boto3.client("s3", config=boto_config)
+    return get_client("s3", config=boto_config)
 
 
 def policy_to_add(bucket, partition):
@@ -50,16 +67,22 @@ def add_ssl_bucket_policy(event, _):
     except Exception as e:
         exit(f"ERROR getting bucket policy for {bucket_name}: {str(e)}")
 
-    if not bucket_policy:
-        bucket_policy = new_policy()
+    policy = BucketPolicy(bucket_policy or new_policy())
 
-    print(f"Existing policy: {bucket_policy}")
-    bucket_policy["Statement"].append(policy_to_add(bucket_name, aws_partition))
+    print(f"Existing policy: {policy.policy}")
+    if not policy.add_statement(policy_to_add(bucket_name, aws_partition)):
+        print(f"The policy for {bucket_name} already requires SSL")
+        return
+
+    try:
+        new_bucket_policy = policy.serialize(indent=4, default=str)
+    except PolicySizeError as e:
+        exit(f"ERROR: {str(e)}")
 
     try:
         result = s3.put_bucket_policy(
             Bucket=bucket_name,
-            Policy=json.dumps(bucket_policy, indent=4, default=str),
+            Policy=new_bucket_policy,
             ExpectedBucketOwner=account_id,
         )
         print(result)
@@ -69,4 +92,53 @@ def add_ssl_bucket_policy(event, _):
     except Exception as e:
         exit(f"ERROR putting bucket policy for {bucket_name}: {str(e)}")
 
-    print(f"New policy: {bucket_policy}")
+    print(f"New policy: {policy.policy}")
+
+
+def get_bucket_policy(s3, bucket_name, account_id):
+    try:
+        existing_policy = s3.get_bucket_policy(
+            Bucket=bucket_name, ExpectedBucketOwner=account_id
+        )
+        return json.loads(existing_policy["Policy"])
+    except ClientError as ex:
+        if ex.response["Error"]["Code"] == "NoSuchBucketPolicy":
+            return {}
+        raise
+
+
+def requires_ssl(bucket_policy):
+    """Whether the policy denies requests that do not use SSL"""
+    return any(
+        str(
+            statement.get("Condition", {})
+            .get("Bool", {})
+            .get("aws:SecureTransport", "")
+        ).lower()
+        == "false"
+        for statement in BucketPolicy(bucket_policy).statements_with(effect="Deny")
+    )
+
+
+def sweep_ssl_bucket_policies(event, _):
+    """
+    Adds the SSL-only statement to the policy of every bucket in the account whose
+    policy does not already deny requests that do not use SSL
+    """
+    aws_partition = event["partition"]
+
+    def is_compliant(s3, bucket_name, account_id):
+        return requires_ssl(get_bucket_policy(s3, bucket_name, account_id))
+
+    def remediate(s3, bucket_name, account_id):
+        policy = BucketPolicy(
+            get_bucket_policy(s3, bucket_name, account_id) or new_policy()
+        )
+        policy.add_statement(policy_to_add(bucket_name, aws_partition))
+        s3.put_bucket_policy(
+            Bucket=bucket_name,
+            Policy=policy.serialize(indent=4, default=str),
+            ExpectedBucketOwner=account_id,
+        )
+
+    return sweep_buckets(event["accountid"], is_compliant, remediate)
@@ -2,9 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import List, TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 boto_config = Config(retries={"mode": "standard"})
 
 
@@ -15,11 +20,11 @@ class Event(TypedDict):
 
 
 def get_guardduty_client():
-    return boto3.client("guardduty", config=boto_config)
+    return get_client("guardduty", config=boto_config)
 
 
 def get_dynamodb_client():
-    return boto3.client("dynamodb", config=boto_config)
+    return get_client("dynamodb", config=boto_config)
 
 
 def lambda_handler(event, _):
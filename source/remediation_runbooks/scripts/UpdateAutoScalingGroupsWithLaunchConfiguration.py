@@ -1,19 +1,42 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-
-from typing import TYPE_CHECKING, TypedDict
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from typing import TYPE_CHECKING, Iterator, List, Optional, TypedDict
+
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
 
 if TYPE_CHECKING:
     from mypy_boto3_apigateway import AutoScalingClient
 else:
     AutoScalingClient = object
 
-import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
+
+BOTO_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 10})
+
+# DescribeAutoScalingGroups returns at most 100 groups per page
+PAGE_SIZE = 100
+MAX_WORKERS = 5
+UPDATE_ATTEMPTS = 5
+# Errors that clear once the group's current scaling activity or update finishes
+RETRYABLE_ERRORS = ["ScalingActivityInProgress", "ResourceContention"]
 
 
 def connect_to_auto_scaling(boto_config: Config) -> AutoScalingClient:
-    return boto3.client("autoscaling", config=boto_config)
+    return get_client("autoscaling", config=boto_config)
 
 
 class Event(TypedDict):
@@ -21,52 +44,142 @@ class Event(TypedDict):
     NewLaunchConfigurationName: str
 
 
-def update_auto_scaling_groups_with_launch_configuration(event: Event, _):
+class FilteredEvent(Event, total=False):
+    AutoScalingGroupNames: List[str]
+    Filters: List[dict]
+
+
+def update_auto_scaling_groups_with_launch_configuration(event: FilteredEvent, _):
+    """
+    Updates the Auto Scaling groups that use the old launch configuration to use the
+    new one. The groups to check can be narrowed with AutoScalingGroupNames or with
+    DescribeAutoScalingGroups tag Filters.
+    """
     try:
-        auto_scaling_groups = get_auto_scaling_groups()
-        update_auto_scaling_groups(
-            auto_scaling_groups,
+        autoscaling_client = connect_to_auto_scaling(BOTO_CONFIG)
+        auto_scaling_group_names = iter_auto_scaling_groups_using(
+            autoscaling_client,
             event["OldLaunchConfigurationName"],
+            event.get("AutoScalingGroupNames"),
+            event.get("Filters"),
+        )
+        updated, failures = update_auto_scaling_groups(
+            autoscaling_client,
+            auto_scaling_group_names,
             event["NewLaunchConfigurationName"],
         )
-
-        return {
-            "message": "Successfully updated auto scaling groups with launch configuration",
-            "status": "Success",
-        }
     except Exception as e:
         raise RuntimeError(
             f"Encountered an error updating auto scaling groups: {str(e)}"
         )
 
+    if failures:
+        raise RuntimeError(
+            f"Failed to update {len(failures)} of {len(updated) + len(failures)} "
+            f"auto scaling groups: {json.dumps(failures)}"
+        )
 
-def get_auto_scaling_groups():
-    autoscaling_client = connect_to_auto_scaling(Config(retries={"mode": "standard"}))
+    return {
+        "message": f"Successfully updated {len(updated)} auto scaling groups with launch configuration",
+        "status": "Success",
+        "updated_count": str(len(updated)),
+        "failed_count": "0",
+    }
+
+
+def iter_auto_scaling_groups_using(
+    autoscaling_client: AutoScalingClient,
+    launch_configuration_name: str,
+    auto_scaling_group_names: Optional[List[str]] = None,
+    filters: Optional[List[dict]] = None,
+) -> Iterator[str]:
+    """
+    Yields the names of the Auto Scaling groups that use the launch configuration,
+    page by page, without keeping the descriptions of the other groups
+    """
     paginator = autoscaling_client.get_paginator("describe_auto_scaling_groups")
-    page_iterator = paginator.paginate()
-
-    auto_scaling_groups = []
-    for page in page_iterator:
-        auto_scaling_groups += page["AutoScalingGroups"]
+    parameters: dict = {"PaginationConfig": {"PageSize": PAGE_SIZE}}
+    if auto_scaling_group_names:
+        parameters["AutoScalingGroupNames"] = auto_scaling_group_names
+    if filters:
+        parameters["Filters"] = filters
+
+    for page in paginator.paginate(**parameters):
+        for auto_scaling_group in page["AutoScalingGroups"]:
+            # Groups that use a launch template have no launch configuration
+            if (
+                auto_scaling_group.get("LaunchConfigurationName")
+                == launch_configuration_name
+            ):
+                yield auto_scaling_group["AutoScalingGroupName"]
+
+
+def is_retryable(error: Exception) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response["Error"]["Code"] in RETRYABLE_ERRORS
+    )
+
+
+def update_auto_scaling_group(
+    autoscaling_client: AutoScalingClient,
+    auto_scaling_group_name: str,
+    new_launch_configuration_name: str,
+) -> Optional[str]:
+    """Updates the group, returning the error if the update failed"""
+
+    def update() -> bool:
+        autoscaling_client.update_auto_scaling_group(
+            AutoScalingGroupName=auto_scaling_group_name,
+            LaunchConfigurationName=new_launch_configuration_name,
+        )
+        return True
 
-    return auto_scaling_groups
+    try:
+        wait_until(
+            update,
+            f"update of auto scaling group {auto_scaling_group_name}",
+            initial_delay=2,
+            max_attempts=UPDATE_ATTEMPTS,
+            retry_if=is_retryable,
+            sleep=sleep,
+        )
+        return None
+    except Exception as e:
+        return str(e)
 
 
 def update_auto_scaling_groups(
-    auto_scaling_groups,
-    old_launch_configuration_name: str,
-    new_launch_configuation_name: str,
+    autoscaling_client: AutoScalingClient,
+    auto_scaling_group_names: Iterator[str],
+    new_launch_configuration_name: str,
 ):
-    autoscaling_client = connect_to_auto_scaling(Config(retries={"mode": "standard"}))
-
-    for auto_scaling_group in auto_scaling_groups:
-        if (
-            auto_scaling_group["LaunchConfigurationName"]
-            != old_launch_configuration_name
-        ):
-            continue
-
-        autoscaling_client.update_auto_scaling_group(
-            AutoScalingGroupName=auto_scaling_group["AutoScalingGroupName"],
-            LaunchConfigurationName=new_launch_configuation_name,
-        )
+    """
+    Updates the groups concurrently as they are found
+    :return: the names of the updated groups, and the groups that failed with errors
+    """
+    updated = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            auto_scaling_group_name: executor.submit(
+                update_auto_scaling_group,
+                autoscaling_client,
+                auto_scaling_group_name,
+                new_launch_configuration_name,
+            )
+            for auto_scaling_group_name in auto_scaling_group_names
+        }
+        for auto_scaling_group_name, future in futures.items():
+            error = future.result()
+            if error:
+                failures.append(
+                    {"AutoScalingGroupName": auto_scaling_group_name, "Error": error}
+                )
+            else:
+                updated.append(auto_scaling_group_name)
+
+    print(
+        f"Updated {len(updated)} auto scaling groups, failed to update {len(failures)}"
+    )
+    return updated, failures
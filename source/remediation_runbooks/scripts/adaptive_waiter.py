@@ -0,0 +1,100 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Polling with exponential backoff and jitter for remediation runbook scripts.
+
+wait_until calls a condition until it returns a truthy value, which it returns. The
+first check is made immediately and the delay between checks starts short and doubles
+up to a maximum, with jitter so that concurrent executions do not poll in step. Waiting
+stops at the first of the attempt limit, the timeout, and the step timeout less a
+margin. The step timeout is the step's timeoutSeconds when it is passed in, and
+otherwise DEFAULT_STEP_TIMEOUT_SECONDS, the aws:executeScript default.
+The time waited and the number of attempts are printed when the wait ends.
+
+SSM runs each step's script on its own, so runbooks inline this file ahead of their
+script with a second %%SCRIPT%% line, and the scripts import it only when it is
+available as a module.
+"""
+import random
+import time
+from typing import Any, Callable, Optional
+
+DEFAULT_STEP_TIMEOUT_SECONDS = 600
+DEADLINE_MARGIN_SECONDS = 10
+
+
+class WaiterTimeoutError(Exception):
+    """The condition was not met before the attempts or time ran out"""
+
+
+def get_step_deadline(
+    started: float, step_timeout_seconds: Optional[float] = None
+) -> float:
+    """The time.monotonic() value by which a wait started at started must end"""
+    return (
+        started
+        + (step_timeout_seconds or DEFAULT_STEP_TIMEOUT_SECONDS)
+        - DEADLINE_MARGIN_SECONDS
+    )
+
+
+def get_delay(
+    attempt: int, initial_delay: float, max_delay: float, jitter: bool = True
+) -> float:
+    """The delay after the given attempt, with up to half of it randomized"""
+    delay = min(max_delay, initial_delay * 2**attempt)
+    if jitter:
+        delay = delay / 2 + random.uniform(0, delay / 2)  # nosec
+    return delay
+
+
+def wait_until(
+    condition: Callable[[], Any],
+    description: str,
+    initial_delay: float = 1,
+    max_delay: float = 30,
+    timeout_seconds: Optional[float] = None,
+    max_attempts: Optional[int] = None,
+    step_timeout_seconds: Optional[float] = None,
+    retry_if: Optional[Callable[[Exception], bool]] = None,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> Any:
+    """
+    Return the first truthy result of condition. Exceptions for which retry_if returns
+    True count as a failed check, and the last one is raised if the condition is not
+    met in time. Otherwise raises WaiterTimeoutError if the condition is not met in time.
+    """
+    started = time.monotonic()
+    deadline = get_step_deadline(started, step_timeout_seconds)
+    if timeout_seconds is not None:
+        deadline = min(deadline, started + timeout_seconds)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        error: Optional[Exception] = None
+        try:
+            result = condition()
+        except Exception as e:
+            if not retry_if or not retry_if(e):
+                raise
+            result, error = None, e
+
+        elapsed = time.monotonic() - started
+        if result:
+            print(f"Waited {elapsed:.1f}s for {description} ({attempt} attempts)")
+            return result
+
+        delay = get_delay(attempt - 1, initial_delay, max_delay)
+        out_of_attempts = max_attempts is not None and attempt >= max_attempts
+        if out_of_attempts or time.monotonic() + delay > deadline:
+            print(
+                f"Gave up waiting for {description} after {elapsed:.1f}s "
+                f"({attempt} attempts)"
+            )
+            if error:
+                raise error
+            raise WaiterTimeoutError(
+                f"Timed out waiting for {description} after {attempt} attempts"
+            )
+        sleep(delay)
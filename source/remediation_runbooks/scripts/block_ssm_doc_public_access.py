@@ -5,9 +5,14 @@ Remediates SSM.4 and SSM.7 by disabling public access to SSM documents
 """
 from typing import TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
 
 class EventType(TypedDict):
     accountid: str
@@ -18,7 +23,7 @@ BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
 def connect_to_ssm():
-    return boto3.client("ssm", config=BOTO_CONFIG)
+    return get_client("ssm", config=BOTO_CONFIG)
 
 
 def get_document_name(event):
@@ -0,0 +1,243 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Merge statements into S3 bucket policies for remediation runbook scripts.
+
+BucketPolicy parses a policy once and indexes its statements by effect, principal and
+action, so that scripts can look statements up without walking and copying the whole
+policy. add_statement merges a statement idempotently: a statement that is already in
+the policy is not added again, and one that differs from an existing statement only
+in its AWS principals is merged into it rather than appended. Principal sets are
+compacted, dropping duplicates and principals in accounts whose root is already in
+the set, since a statement for the account applies to every principal in it.
+
+Bucket policies are limited to 20 KB. serialize falls back to compact JSON when the
+formatted policy is too large, and raises PolicySizeError before the policy is put if
+it still does not fit.
+
+SSM runs each step's script on its own, so runbooks inline this file ahead of their
+script with a second %%SCRIPT%% line, and the scripts import it only when it is
+available as a module.
+"""
+import json
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+MAX_POLICY_SIZE = 20 * 1024
+
+ACCOUNT_ID = re.compile(r"^\d{12}$")
+
+
+class PolicySizeError(Exception):
+    """The policy is larger than a bucket policy may be"""
+
+
+def as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def get_principal_account(principal: str) -> Optional[str]:
+    """The account of an AWS principal ARN or account ID, or None for "*" """
+    if ACCOUNT_ID.match(principal):
+        return principal
+    parts = principal.split(":")
+    if len(parts) > 4 and parts[4]:
+        return parts[4]
+    return None
+
+
+def is_account_principal(principal: str) -> bool:
+    return bool(ACCOUNT_ID.match(principal)) or principal.endswith(":root")
+
+
+def compact_principals(principals: Iterable[str]) -> List[str]:
+    """
+    The principals in their first order without duplicates, or principals in accounts
+    whose root is also in the set
+    """
+    principals = list(principals)
+    accounts = {
+        get_principal_account(principal)
+        for principal in principals
+        if is_account_principal(principal)
+    }
+    compacted: List[str] = []
+    seen: Set[Optional[str]] = set()
+    for principal in principals:
+        if is_account_principal(principal):
+            key = get_principal_account(principal)
+        elif get_principal_account(principal) in accounts:
+            continue
+        else:
+            key = principal
+        if key not in seen:
+            seen.add(key)
+            compacted.append(principal)
+    return compacted
+
+
+def get_aws_principals(statement: Dict[str, Any]) -> List[str]:
+    principal = statement.get("Principal")
+    if principal == "*":
+        return ["*"]
+    if isinstance(principal, dict):
+        return as_list(principal.get("AWS"))
+    return []
+
+
+def _statement_key(statement: Dict[str, Any], with_principal: bool = True) -> str:
+    """A key that is equal for statements with the same meaning"""
+    key: Dict[str, Any] = {}
+    for element, value in statement.items():
+        if element == "Sid" or (element == "Principal" and not with_principal):
+            continue
+        if element in ["Action", "NotAction", "Resource", "NotResource"]:
+            value = sorted(as_list(value))
+        elif element == "Principal" and isinstance(value, dict):
+            value = {
+                principal_type: sorted(as_list(principals))
+                for principal_type, principals in value.items()
+            }
+        key[element] = value
+    return json.dumps(key, sort_keys=True, default=str)
+
+
+def _has_only_aws_principals(statement: Dict[str, Any]) -> bool:
+    principal = statement.get("Principal")
+    return isinstance(principal, dict) and list(principal) == ["AWS"]
+
+
+class BucketPolicy:
+    def __init__(self, policy: Dict[str, Any]):
+        self.policy = policy
+        self.policy["Statement"] = as_list(policy.get("Statement"))
+        self._by_effect: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_principal: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_action: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._by_key_without_principal: Dict[str, Dict[str, Any]] = {}
+        self._sids: Set[str] = set()
+        for statement in self.statements:
+            self._index(statement)
+
+    @classmethod
+    def from_json(cls, policy: str) -> "BucketPolicy":
+        return cls(json.loads(policy))
+
+    @property
+    def statements(self) -> List[Dict[str, Any]]:
+        statements: List[Dict[str, Any]] = self.policy["Statement"]
+        return statements
+
+    def _index(self, statement: Dict[str, Any]) -> None:
+        self._by_effect[statement.get("Effect", "")].append(statement)
+        for principal in get_aws_principals(statement):
+            self._by_principal[principal].append(statement)
+        for action in as_list(statement.get("Action")):
+            self._by_action[action].append(statement)
+        self._by_key[_statement_key(statement)] = statement
+        if _has_only_aws_principals(statement):
+            self._by_key_without_principal[
+                _statement_key(statement, with_principal=False)
+            ] = statement
+        if "Sid" in statement:
+            self._sids.add(statement["Sid"])
+
+    def _reindex(self) -> None:
+        for index in [self._by_effect, self._by_principal, self._by_action]:
+            index.clear()
+        self._by_key.clear()
+        self._by_key_without_principal.clear()
+        self._sids.clear()
+        for statement in self.statements:
+            self._index(statement)
+
+    def statements_with(
+        self,
+        effect: Optional[str] = None,
+        principal: Optional[str] = None,
+        action: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """The statements with the effect, AWS principal and action that are given"""
+        candidates: Optional[List[Dict[str, Any]]] = None
+        for index, value in [
+            (self._by_effect, effect),
+            (self._by_principal, principal),
+            (self._by_action, action),
+        ]:
+            if value is None:
+                continue
+            matches = index.get(value, [])
+            if candidates is None:
+                candidates = list(matches)
+            else:
+                match_ids = {id(match) for match in matches}
+                candidates = [
+                    statement for statement in candidates if id(statement) in match_ids
+                ]
+        return self.statements if candidates is None else candidates
+
+    def get_aws_principals(self, effect: Optional[str] = None) -> List[str]:
+        """The AWS principals of the statements with the effect, in policy order"""
+        principals: List[str] = []
+        for statement in self.statements_with(effect=effect):
+            principals.extend(get_aws_principals(statement))
+        return principals
+
+    def add_statement(self, statement: Dict[str, Any]) -> bool:
+        """
+        Add the statement unless the policy already has it, merging its AWS principals
+        into a statement that differs only in those principals
+        :return: whether the policy changed
+        """
+        if _statement_key(statement) in self._by_key:
+            return False
+
+        if _has_only_aws_principals(statement):
+            existing = self._by_key_without_principal.get(
+                _statement_key(statement, with_principal=False)
+            )
+            if existing is not None:
+                current = as_list(existing["Principal"]["AWS"])
+                merged = compact_principals(
+                    current + as_list(statement["Principal"]["AWS"])
+                )
+                if merged == compact_principals(current):
+                    return False
+                existing["Principal"]["AWS"] = merged
+                self._reindex()
+                return True
+
+        statement = dict(statement)
+        if statement.get("Sid") in self._sids:
+            # Statement IDs must be unique within a policy
+            del statement["Sid"]
+        self.statements.append(statement)
+        self._index(statement)
+        return True
+
+    def serialize(self, **json_options: Any) -> str:
+        """
+        The policy as JSON formatted with json_options, or as compact JSON if that is
+        too large
+        :raises PolicySizeError: if the policy is too large even as compact JSON
+        """
+        policy, size = _dumps(self.policy, json_options)
+        if size > MAX_POLICY_SIZE:
+            policy, size = _dumps(
+                self.policy, {"separators": (",", ":"), "default": str}
+            )
+        if size > MAX_POLICY_SIZE:
+            raise PolicySizeError(
+                f"The bucket policy is {size} bytes, more than the "
+                f"{MAX_POLICY_SIZE} bytes a bucket policy may be"
+            )
+        return policy
+
+
+def _dumps(policy: Dict[str, Any], json_options: Dict[str, Any]) -> Tuple[str, int]:
+    text = json.dumps(policy, **json_options)
+    return text, len(text.encode("utf-8"))
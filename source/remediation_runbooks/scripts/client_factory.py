@@ -0,0 +1,60 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Shared boto3 clients for remediation runbook scripts.
+
+Creating a boto3 client loads and parses the service model, which takes tens of
+milliseconds in a short aws:executeScript step. get_client and get_resource return one
+client or resource per service, region and configuration for the life of the script,
+so each helper can ask for the client it needs without building a new one.
+
+SSM runs each step's script on its own, so runbooks inline this file ahead of their
+script with a second %%SCRIPT%% line, and the scripts import it only when it is
+available as a module.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+_clients: Dict[Tuple[str, Optional[str], str], Any] = {}
+_resources: Dict[Tuple[str, Optional[str], str], Any] = {}
+
+
+def _config_key(config: Optional[Config]) -> str:
+    # Config does not define equality, so configurations are compared by their options
+    if config is None:
+        return ""
+    return repr(sorted(vars(config).items(), key=lambda option: option[0]))
+
+
+def get_client(
+    service_name: str,
+    region_name: Optional[str] = None,
+    config: Optional[Config] = None,
+) -> Any:
+    key = (service_name, region_name, _config_key(config))
+    if key not in _clients:
+        _clients[key] = boto3.client(
+            service_name, region_name=region_name, config=config
+        )
+    return _clients[key]
+
+
+def get_resource(
+    service_name: str,
+    region_name: Optional[str] = None,
+    config: Optional[Config] = None,
+) -> Any:
+    key = (service_name, region_name, _config_key(config))
+    if key not in _resources:
+        _resources[key] = boto3.resource(
+            service_name, region_name=region_name, config=config
+        )
+    return _resources[key]
+
+
+def clear_clients() -> None:
+    """Discard the shared clients and resources"""
+    _clients.clear()
+    _resources.clear()
@@ -4,12 +4,23 @@
 Configure a CloudFormation stack with an SNS topic for notifications, creating the topic if it does
 not already exist
 """
-from time import sleep, time
+from time import sleep
 from typing import TYPE_CHECKING
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client, get_resource
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from adaptive_waiter import WaiterTimeoutError, wait_until
+except ImportError:
+    # adaptive_waiter.py is inlined ahead of this script in the runbook
+    pass
+
 if TYPE_CHECKING:
     from mypy_boto3_sns.client import SNSClient
 else:
@@ -39,14 +50,14 @@ def lambda_handler(event, _):
 
 def get_or_create_topic(topic_name: str) -> str:
     """Get the SQS topic arn for the given topic name, creating it if it does not already exist"""
-    sns: SNSClient = boto3.client("sns", config=boto_config)
+    sns: SNSClient = get_client("sns", config=boto_config)
     response = sns.create_topic(Name=topic_name)
     return response["TopicArn"]
 
 
 def configure_notifications(stack_arn: str, topic_arn: str) -> None:
     """Configure the stack with ARN `stack_arn` to notify the queue with ARN `topic_arn`"""
-    cloudformation = boto3.resource("cloudformation", config=boto_config)
+    cloudformation = get_resource("cloudformation", config=boto_config)
     stack = cloudformation.Stack(stack_arn)
     kwargs = {"UsePreviousTemplate": True, "NotificationARNs": [topic_arn]}
     if stack.parameters:
@@ -65,19 +76,22 @@ class UpdateTimeoutException(Exception):
 
 def wait_for_update(stack_arn: str) -> None:
     """Wait for the stack with ARN `stack_arn` to be in status `UPDATE_COMPLETE`"""
-    wait_interval_seconds = 10
-    timeout_seconds = 300
-    start = time()
-    while get_stack_status(stack_arn) != "UPDATE_COMPLETE":
-        if time() - start > timeout_seconds:
-            raise UpdateTimeoutException("Timed out waiting for stack update")
-        wait_seconds(wait_interval_seconds)
-        wait_interval_seconds = wait_interval_seconds * 2
+    try:
+        wait_until(
+            lambda: get_stack_status(stack_arn) == "UPDATE_COMPLETE",
+            f"stack {stack_arn} to update",
+            initial_delay=5,
+            max_delay=60,
+            timeout_seconds=300,
+            sleep=wait_seconds,
+        )
+    except WaiterTimeoutError:
+        raise UpdateTimeoutException("Timed out waiting for stack update")
 
 
 def get_stack_status(stack_arn):
     """Get the status of the CloudFormation stack with ARN `stack_arn`"""
-    cloudformation = boto3.client("cloudformation", config=boto_config)
+    cloudformation = get_client("cloudformation", config=boto_config)
     response = cloudformation.describe_stacks(StackName=stack_arn)
     return response["Stacks"][0]["StackStatus"]
 
@@ -92,19 +106,28 @@ def assert_stack_configured(stack_arn, topic_arn):
     Verify that the CloudFormation stack with ARN `stack_arn` is configured to update the SQS topic
     with ARN `topic_arn`
     """
-    cloudformation = boto3.resource("cloudformation", config=boto_config)
+    cloudformation = get_resource("cloudformation", config=boto_config)
     stack = cloudformation.Stack(stack_arn)
-    wait_interval_seconds = 10
-    timeout_seconds = 300
-    start = time()
-    while stack.notification_arns != [topic_arn]:
-        if time() - start > timeout_seconds:
-            raise StackConfigurationFailedException(
-                "Timed out waiting for stack configuration to take effect"
-            )
-        wait_seconds(wait_interval_seconds)
-        wait_interval_seconds = wait_interval_seconds * 2
+
+    def notifications_configured():
+        if stack.notification_arns == [topic_arn]:
+            return True
         stack.reload()
+        return stack.notification_arns == [topic_arn]
+
+    try:
+        wait_until(
+            notifications_configured,
+            f"stack {stack_arn} to notify {topic_arn}",
+            initial_delay=5,
+            max_delay=60,
+            timeout_seconds=300,
+            sleep=wait_seconds,
+        )
+    except WaiterTimeoutError:
+        raise StackConfigurationFailedException(
+            "Timed out waiting for stack configuration to take effect"
+        )
     return {"NotificationARNs": stack.notification_arns}
 
 
@@ -11,6 +11,18 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import UnknownRegionError
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from s3_bucket_sweep import sweep_buckets
+except ImportError:
+    # s3_bucket_sweep.py is inlined ahead of this script in the runbook
+    pass
+
 if TYPE_CHECKING:
     from mypy_boto3_sns.client import SNSClient
 else:
@@ -57,25 +69,34 @@ def partition_from_region(session: boto3.session.Session):
 
 def get_or_create_topic(topic_name: str, bucket_name: str, account_id: str) -> str:
     """Get the SNS topic arn that will be used to configure notifications, creating it if it does not already exist"""
-    sns: SNSClient = boto3.client("sns", config=boto_config)
+    return _get_or_create_topic(topic_name, account_id, bucket_name)
+
+
+def _get_or_create_topic(topic_name: str, account_id: str, source_bucket: str) -> str:
+    """
+    Get or create the SNS topic, allowing S3 to publish to it from `source_bucket`,
+    which may be a wildcard
+    """
+    sns: SNSClient = get_client("sns", config=boto_config)
     # get partition and region to buildArn here, replace sourceArn under condition
     session = boto3.session.Session()
     region = session.region_name
     partition = partition_from_region(session)
     expected_topic_arn = f"arn:{partition}:sns:{region}:{account_id}:{topic_name}"
+    statement_id = source_bucket + " ASR Notification Policy"
     policy = {
         "Version": "2012-10-17",
         "Id": "ASR Notification Policy",
         "Statement": [
             {
-                "Sid": bucket_name + " ASR Notification Policy",
+                "Sid": statement_id,
                 "Effect": "Allow",
                 "Principal": {"Service": "s3.amazonaws.com"},
                 "Action": ["SNS:Publish"],
                 "Resource": expected_topic_arn,
                 "Condition": {
                     "ArnLike": {
-                        "aws:SourceArn": [f"arn:{partition}:s3:::" + bucket_name]
+                        "aws:SourceArn": [f"arn:{partition}:s3:::" + source_bucket]
                     },
                     "StringEquals": {"aws:SourceAccount": [account_id]},
                 },
@@ -88,7 +109,7 @@ def get_or_create_topic(topic_name: str, bucket_name: str, account_id: str) -> s
         topic_attributes_policy = topic_attributes["Attributes"]["Policy"]  # str
         topic_attributes_policy_dict = json.loads(topic_attributes_policy)  # dict
         for statement in topic_attributes_policy_dict["Statement"]:
-            if statement["Sid"] == bucket_name + " ASR Notification Policy":
+            if statement["Sid"] == statement_id:
                 return expected_topic_arn
         topic_attributes_policy_dict["Statement"].append(policy["Statement"][0])
         new_topic_attributes_policy = json.dumps(topic_attributes_policy_dict)
@@ -111,27 +132,33 @@ def configure_notifications(
     bucket_name: str, topic_arn: str, event_types: List[str]
 ) -> None:
     """Configure the bucket `bucket_name` to notify the sns topic with ARN `topic_arn`"""
-    s3 = boto3.client("s3", config=boto_config)
+    s3 = get_client("s3", config=boto_config)
     s3.put_bucket_notification_configuration(
         Bucket=bucket_name,
-        NotificationConfiguration={
-            "TopicConfigurations": [
-                {
-                    "Id": "ASR Bucket Notification Topic Config",
-                    "Events": event_types,
-                    "TopicArn": topic_arn,
-                }
-            ]
-        },
+        NotificationConfiguration=get_notification_configuration(
+            topic_arn, event_types
+        ),
     )
 
 
+def get_notification_configuration(topic_arn: str, event_types: List[str]) -> dict:
+    return {
+        "TopicConfigurations": [
+            {
+                "Id": "ASR Bucket Notification Topic Config",
+                "Events": event_types,
+                "TopicArn": topic_arn,
+            }
+        ]
+    }
+
+
 def assert_bucket_notifcations_configured(bucket_name, account_id):
     """
     Verify that the bucket `bucket_name` is configured to update the SNS topic
     with ARN `topic_arn`
     """
-    s3 = boto3.client("s3", config=boto_config)
+    s3 = get_client("s3", config=boto_config)
     notification_configuration = s3.get_bucket_notification_configuration(
         Bucket=bucket_name, ExpectedBucketOwner=account_id
     )
@@ -145,3 +172,49 @@ def assert_bucket_notifcations_configured(bucket_name, account_id):
         raise RuntimeError(
             f"ERROR: {bucket_name} was not configured with notifications"
         )
+
+
+def sweep_handler(event, _):
+    """
+    Configure every bucket in the account that has no event notifications to notify
+    one SNS topic, creating the topic if it does not already exist. The topic allows
+    every bucket in the account to publish to it. S3 requires the topic to be in the
+    bucket's region, so buckets in other regions are reported as failed.
+
+    `event` should have the keys `topic_name`, `account_id` and `event_types`
+
+    `context` is ignored
+    """
+    account_id = event["account_id"]
+    topic_arn = _get_or_create_topic(event["topic_name"], account_id, "*")
+    topic_region = topic_arn.split(":")[3]
+    notification_configuration = get_notification_configuration(
+        topic_arn, event["event_types"]
+    )
+
+    def has_notifications(s3, bucket_name: str, expected_owner: str) -> bool:
+        configuration = s3.get_bucket_notification_configuration(
+            Bucket=bucket_name, ExpectedBucketOwner=expected_owner
+        )
+        return any(
+            configuration.get(key)
+            for key in [
+                "TopicConfigurations",
+                "QueueConfigurations",
+                "LambdaFunctionConfigurations",
+                "EventBridgeConfiguration",
+            ]
+        )
+
+    def configure(s3, bucket_name: str, expected_owner: str) -> None:
+        if s3.meta.region_name != topic_region:
+            raise RuntimeError(
+                f"Bucket is in {s3.meta.region_name} and the topic in {topic_region}"
+            )
+        s3.put_bucket_notification_configuration(
+            Bucket=bucket_name,
+            NotificationConfiguration=notification_configuration,
+            ExpectedBucketOwner=expected_owner,
+        )
+
+    return sweep_buckets(account_id, has_notifications, configure)
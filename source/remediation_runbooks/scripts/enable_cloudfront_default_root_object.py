@@ -3,7 +3,11 @@
 import datetime
 import json
 
-import boto3
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
 
 
 def default(obj):
@@ -24,7 +28,7 @@ def verify_enable_cloudfront_default_root_object(
 
 
 def handler(event, _):
-    cloudfront_client = boto3.client("cloudfront")
+    cloudfront_client = get_client("cloudfront")
     cloudfront_distribution_arn = event["cloudfront_distribution"]
     cloudfront_distribution_id = cloudfront_distribution_arn.split("/")[1]
     response = cloudfront_client.get_distribution_config(Id=cloudfront_distribution_id)
@@ -2,9 +2,20 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TypedDict
 
-import boto3
 from botocore.config import Config
 
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+try:
+    from multi_region import apply_in_regions, summarize_regions
+except ImportError:
+    # multi_region.py is inlined ahead of this script in the runbook
+    pass
+
 
 class EventType(TypedDict):
     account_id: str
@@ -13,42 +24,14 @@ class EventType(TypedDict):
 boto_config = Config(retries={"mode": "standard", "max_attempts": 10})
 
 
-def connect_to_ssm():
-    return boto3.client("ssm", config=boto_config)
+def connect_to_ssm(region_name=None):
+    return get_client("ssm", region_name, boto_config)
 
 
 def lambda_handler(event: EventType, _):
     try:
         account_id = event["account_id"]
-        ssm_client = connect_to_ssm()
-
-        current_setting = get_service_setting(ssm_client)
-
-        if current_setting == "Disable":
-            return {
-                "response": {
-                    "message": f"Block public sharing is already enabled for account {account_id}",
-                    "status": "NO_CHANGE_REQUIRED",
-                    "setting_value": "Disable",
-                }
-            }
-
-        update_service_setting(ssm_client)
-
-        verify_setting = get_service_setting(ssm_client)
-
-        if verify_setting == "Disable":
-            return {
-                "response": {
-                    "message": f"Successfully enabled block public sharing for account {account_id}",
-                    "status": "SUCCESS",
-                    "setting_value": "Disable",
-                }
-            }
-        else:
-            raise RuntimeError(
-                f"Failed to verify setting change. Expected 'Disable', got '{verify_setting}'"
-            )
+        return {"response": block_public_sharing(connect_to_ssm(), account_id)}
 
     except Exception as e:
         error_msg = f"Failed to enable block public sharing: {str(e)}"
@@ -56,6 +39,53 @@ def lambda_handler(event: EventType, _):
         raise RuntimeError(error_msg)
 
 
+def all_regions_handler(event: EventType, _):
+    """
+    Enables block public sharing for SSM documents in every enabled region
+    """
+    account_id = event["account_id"]
+    results = apply_in_regions(
+        lambda region: block_public_sharing(connect_to_ssm(region), account_id),
+        ["ssm"],
+        boto_config,
+    )
+
+    return {
+        "response": {
+            "message": summarize_regions(
+                results, f"Block public sharing enabled for account {account_id}"
+            ),
+            "regions": results,
+        }
+    }
+
+
+def block_public_sharing(ssm_client, account_id):
+    current_setting = get_service_setting(ssm_client)
+
+    if current_setting == "Disable":
+        return {
+            "message": f"Block public sharing is already enabled for account {account_id}",
+            "status": "NO_CHANGE_REQUIRED",
+            "setting_value": "Disable",
+        }
+
+    update_service_setting(ssm_client)
+
+    verify_setting = get_service_setting(ssm_client)
+
+    if verify_setting == "Disable":
+        return {
+            "message": f"Successfully enabled block public sharing for account {account_id}",
+            "status": "SUCCESS",
+            "setting_value": "Disable",
+        }
+    else:
+        raise RuntimeError(
+            f"Failed to verify setting change. Expected 'Disable', got '{verify_setting}'"
+        )
+
+
 def get_service_setting(ssm_client):
     try:
         response = ssm_client.get_service_setting(
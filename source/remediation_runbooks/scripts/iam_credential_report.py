@@ -0,0 +1,209 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Account-wide revocation of stale IAM user credentials from the IAM credential report.
+
+The credential report is generated once and its CSV is parsed row by row, so stale
+access keys and passwords are found for every user in the account without per-user or
+per-key IAM calls. Only the users with stale credentials are then read and updated,
+using a bounded thread pool.
+
+IAM only generates a new credential report when the current one is more than four hours
+old, so the report can be up to four hours out of date. Each candidate is checked against
+its current last-used date before it is revoked, and revocations are verified with one
+list_access_keys call per affected user, as a second report would not reflect them.
+
+SSM runs each step's script on its own, so a runbook step that uses the account-wide
+handlers of RevokeUnusedIAMUserCredentials.py or RevokeUnrotatedKeys.py inlines this
+file ahead of the script with a second %%SCRIPT%% line.
+"""
+import csv
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+ROOT_ACCOUNT = "<root_account>"
+ACCESS_KEY_SLOTS = ["access_key_1", "access_key_2"]
+REPORT_POLL_SECONDS = 2
+REPORT_TIMEOUT_SECONDS = 300
+MAX_WORKERS = 8
+FAILURE_SAMPLE_SIZE = 10
+
+
+def get_credential_report(iam) -> Iterator[Dict[str, str]]:
+    """Generate the credential report, waiting until it is complete, and parse it"""
+    deadline = time.monotonic() + REPORT_TIMEOUT_SECONDS
+    while iam.generate_credential_report()["State"] != "COMPLETE":
+        if time.monotonic() > deadline:
+            raise RuntimeError("Timed out waiting for the IAM credential report")
+        time.sleep(REPORT_POLL_SECONDS)
+    content = iam.get_credential_report()["Content"]
+    return csv.DictReader(io.TextIOWrapper(io.BytesIO(content), encoding="utf-8"))
+
+
+def parse_report_date(value: str) -> Optional[datetime]:
+    """Report dates are ISO 8601, or N/A, no_information or not_supported"""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def days_since(date: datetime, now: datetime) -> int:
+    return (now - date).days
+
+
+def is_stale(
+    last_used: Optional[datetime],
+    created: Optional[datetime],
+    max_age: int,
+    now: datetime,
+    rotation: bool,
+) -> bool:
+    """
+    A credential is unused when it was last used, or if never used was created, at
+    least max_age days ago. A key is unrotated when it was created or last used more
+    than max_age days ago.
+    """
+    if rotation:
+        return any(
+            date and days_since(date, now) > max_age for date in (created, last_used)
+        )
+    date = last_used or created
+    return bool(date) and days_since(date, now) >= max_age
+
+
+def find_stale_credentials(
+    rows: Iterator[Dict[str, str]], max_age: int, rotation: bool = False
+) -> Dict[str, Dict]:
+    """
+    Return the users with stale credentials, keyed by user name, with the creation
+    times of their stale access keys and whether their password is stale. Passwords
+    are only checked for unused credentials.
+    """
+    now = datetime.now(timezone.utc)
+    stale: Dict[str, Dict] = {}
+    for row in rows:
+        user_name = row["user"]
+        if user_name == ROOT_ACCOUNT:
+            continue
+
+        key_created = []
+        for slot in ACCESS_KEY_SLOTS:
+            if row.get(f"{slot}_active") != "true":
+                continue
+            created = parse_report_date(row.get(f"{slot}_last_rotated", ""))
+            last_used = parse_report_date(row.get(f"{slot}_last_used_date", ""))
+            if created and is_stale(last_used, created, max_age, now, rotation):
+                key_created.append(created.replace(microsecond=0))
+
+        password = not rotation and (
+            row.get("password_enabled") == "true"
+            and is_stale(
+                parse_report_date(row.get("password_last_used", "")),
+                parse_report_date(row.get("password_last_changed", "")),
+                max_age,
+                now,
+                rotation,
+            )
+        )
+
+        if key_created or password:
+            stale[user_name] = {"KeyCreateDates": key_created, "Password": password}
+    return stale
+
+
+def revoke_user_credentials(
+    iam, user_name: str, stale: Dict, max_age: int, rotation: bool
+) -> Dict[str, List]:
+    """
+    Deactivate the user's stale access keys and delete their stale password, after
+    checking each against its current last-used date
+    """
+    now = datetime.now(timezone.utc)
+    revoked: Dict[str, List] = {"Keys": [], "Passwords": []}
+    for key in iam.list_access_keys(UserName=user_name)["AccessKeyMetadata"]:
+        created = key["CreateDate"].replace(microsecond=0)
+        if key["Status"] != "Active" or created not in stale["KeyCreateDates"]:
+            continue
+        last_used = iam.get_access_key_last_used(AccessKeyId=key["AccessKeyId"])[
+            "AccessKeyLastUsed"
+        ].get("LastUsedDate")
+        if is_stale(last_used, key["CreateDate"], max_age, now, rotation):
+            iam.update_access_key(
+                UserName=user_name, AccessKeyId=key["AccessKeyId"], Status="Inactive"
+            )
+            revoked["Keys"].append(key["AccessKeyId"])
+
+    if stale["Password"]:
+        password_last_used = iam.get_user(UserName=user_name)["User"].get(
+            "PasswordLastUsed"
+        )
+        if not password_last_used or days_since(password_last_used, now) >= max_age:
+            iam.delete_login_profile(UserName=user_name)
+            revoked["Passwords"].append(user_name)
+    return revoked
+
+
+def verify_user_credentials(iam, user_name: str, revoked: Dict[str, List]) -> None:
+    active_keys = {
+        key["AccessKeyId"]
+        for key in iam.list_access_keys(UserName=user_name)["AccessKeyMetadata"]
+        if key["Status"] == "Active"
+    }
+    still_active = active_keys.intersection(revoked["Keys"])
+    if still_active:
+        raise RuntimeError(f"Access keys {sorted(still_active)} are still active")
+
+
+def revoke_stale_credentials(iam, max_age: int, rotation: bool = False) -> Dict:
+    """
+    Revoke the stale credentials of every IAM user in the account. Returns counts of
+    the users checked and the credentials revoked, with a sample of the failures.
+    """
+    users_checked = 0
+
+    def counted(rows: Iterator[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        nonlocal users_checked
+        for row in rows:
+            users_checked += row["user"] != ROOT_ACCOUNT
+            yield row
+
+    stale = find_stale_credentials(
+        counted(get_credential_report(iam)), max_age, rotation
+    )
+
+    def revoke_and_verify(user_name: str) -> Dict[str, List]:
+        revoked = revoke_user_credentials(
+            iam, user_name, stale[user_name], max_age, rotation
+        )
+        if revoked["Keys"]:
+            verify_user_credentials(iam, user_name, revoked)
+        return revoked
+
+    deactivated_keys: List[str] = []
+    deleted_passwords: List[str] = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            user_name: executor.submit(revoke_and_verify, user_name)
+            for user_name in stale
+        }
+        for user_name, future in futures.items():
+            try:
+                revoked = future.result()
+                deactivated_keys.extend(revoked["Keys"])
+                deleted_passwords.extend(revoked["Passwords"])
+            except Exception as e:
+                failures.append({"UserName": user_name, "Error": str(e)})
+
+    return {
+        "UsersChecked": users_checked,
+        "UsersWithStaleCredentials": len(stale),
+        "DeactivatedKeys": len(deactivated_keys),
+        "DeletedPasswords": len(deleted_passwords),
+        "Failures": len(failures),
+        "FailureSamples": failures[:FAILURE_SAMPLE_SIZE],
+    }
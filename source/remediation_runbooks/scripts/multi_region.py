@@ -0,0 +1,103 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Apply an account-level remediation in every enabled region.
+
+Settings such as EBS encryption by default, GuardDuty and AWS Config are regional, so
+bringing an account into compliance otherwise takes one remediation per region.
+get_enabled_regions lists the regions enabled for the account once per script, and
+apply_in_regions runs a change in each of them concurrently. It returns a map from
+region to the result of the change, or to the error, so that a failure in one region
+does not stop the others.
+
+boto3 does not create clients safely from several threads, so apply_in_regions creates
+each region's clients through client_factory before starting the workers, and the
+change gets the same clients from get_client with the region name and configuration.
+
+SSM runs each step's script on its own, so runbooks inline this file ahead of their
+script with a second %%SCRIPT%% line, and the scripts import it only when it is
+available as a module.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from botocore.config import Config
+
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+MAX_REGION_WORKERS = 8
+
+_enabled_regions: List[str] = []
+
+
+def get_enabled_regions() -> List[str]:
+    """The regions enabled for the account, listed once per script"""
+    if not _enabled_regions:
+        ec2 = get_client("ec2", config=Config(retries={"mode": "standard"}))
+        # Without AllRegions, DescribeRegions lists only the regions that are enabled
+        regions = ec2.describe_regions()["Regions"]
+        _enabled_regions.extend(sorted(region["RegionName"] for region in regions))
+    return list(_enabled_regions)
+
+
+def clear_enabled_regions() -> None:
+    """Discard the enabled regions listed so far"""
+    _enabled_regions.clear()
+
+
+def apply_in_regions(
+    apply: Callable[[str], Any],
+    service_names: Iterable[str],
+    config: Optional[Config] = None,
+    regions: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Call apply with each region, by default every enabled region, concurrently. The
+    clients for service_names and config are created in each region beforehand.
+    :return: a map from region to {"Status": "Success", "Result": ...} or
+        {"Status": "Failed", "Error": ...}
+    """
+    if regions is None:
+        regions = get_enabled_regions()
+    for region in regions:
+        for service_name in service_names:
+            get_client(service_name, region, config)
+
+    def apply_in_region(region: str) -> Dict[str, Any]:
+        try:
+            return {"Status": "Success", "Result": apply(region)}
+        except Exception as e:
+            print(f"Failed to apply the change in {region}: {str(e)}")
+            return {"Status": "Failed", "Error": str(e)}
+
+    if not regions:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_REGION_WORKERS, len(regions))
+    ) as executor:
+        return dict(zip(regions, executor.map(apply_in_region, regions)))
+
+
+def get_failed_regions(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    """The regions in a result of apply_in_regions where the change failed"""
+    return [
+        region for region, result in results.items() if result["Status"] != "Success"
+    ]
+
+
+def summarize_regions(results: Dict[str, Dict[str, Any]], change: str) -> str:
+    """
+    A message for a result of apply_in_regions, raising RuntimeError if the change
+    failed in every region
+    """
+    failed = get_failed_regions(results)
+    message = f"{change} in {len(results) - len(failed)} of {len(results)} regions"
+    if failed:
+        message += f", failed in {', '.join(failed)}"
+    if results and len(failed) == len(results):
+        raise RuntimeError(message)
+    return message
@@ -0,0 +1,140 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Sweep every S3 bucket in an account for a bucket-level control.
+
+The bucket remediations otherwise run one automation per finding, so an account with
+many non-compliant buckets takes a long time to drain. sweep_buckets lists the
+account's buckets once, reads each bucket's current state on a pool of workers, and
+changes only the buckets that need it on a smaller pool, so that writes stay within
+the S3 control plane's request rates. Every read and change passes the account as
+ExpectedBucketOwner, so a bucket that changed hands since it was listed is not touched.
+
+The result counts the buckets by outcome, and its manifest lists the buckets that
+were remediated, already compliant, or failed with their errors, so that the
+findings for all of them can be updated from one execution.
+
+boto3 does not create clients safely from several threads, so the S3 client for each
+bucket region is created through client_factory before the workers start.
+
+SSM runs each step's script on its own, so runbooks inline this file ahead of their
+script with a second %%SCRIPT%% line, and the scripts import it only when it is
+available as a module.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from botocore.config import Config
+
+try:
+    from client_factory import get_client
+except ImportError:
+    # client_factory.py is inlined ahead of this script in the runbook
+    pass
+
+READ_WORKERS = 16
+WRITE_WORKERS = 4
+MAX_ERROR_LENGTH = 200
+
+SWEEP_BOTO_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 10})
+
+REMEDIATED = "Remediated"
+COMPLIANT = "Compliant"
+FAILED = "Failed"
+
+
+def get_s3_client(region_name: Optional[str] = None) -> Any:
+    return get_client("s3", region_name, SWEEP_BOTO_CONFIG)
+
+
+def list_buckets() -> Dict[str, Optional[str]]:
+    """The buckets owned by the account, mapped to their regions"""
+    paginator = get_s3_client().get_paginator("list_buckets")
+    buckets: Dict[str, Optional[str]] = {}
+    for page in paginator.paginate():
+        for bucket in page.get("Buckets", []):
+            buckets[bucket["Name"]] = bucket.get("BucketRegion")
+    return buckets
+
+
+def _run(
+    action: Callable[[Any, str], Any],
+    buckets: Dict[str, Optional[str]],
+    max_workers: int,
+) -> Dict[str, Any]:
+    """Call action with each bucket's client and name, returning results or errors"""
+
+    def run_for_bucket(bucket_name: str) -> Any:
+        try:
+            return action(get_s3_client(buckets[bucket_name]), bucket_name)
+        except Exception as e:
+            return e
+
+    if not buckets:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(buckets))) as executor:
+        return dict(zip(buckets, executor.map(run_for_bucket, buckets)))
+
+
+def _format_error(error: Exception) -> str:
+    return str(error)[:MAX_ERROR_LENGTH]
+
+
+def sweep_buckets(
+    account_id: str,
+    is_compliant: Callable[[Any, str, str], bool],
+    remediate: Callable[[Any, str, str], None],
+    bucket_names: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Remediate every bucket in the account, or the given buckets, that is not compliant.
+    :param is_compliant: called with an S3 client, the bucket name and the account ID,
+        returns whether the bucket needs no change
+    :param remediate: called with the same arguments for the buckets that need a change
+    :return: the number of buckets with each outcome, and the manifest as JSON
+    """
+    buckets = list_buckets()
+    if bucket_names is not None:
+        buckets = {name: buckets.get(name) for name in bucket_names}
+    for region in set(buckets.values()):
+        get_s3_client(region)
+
+    manifest: Dict[str, Any] = {REMEDIATED: [], COMPLIANT: [], FAILED: {}}
+
+    checks = _run(
+        lambda s3, bucket_name: is_compliant(s3, bucket_name, account_id),
+        buckets,
+        READ_WORKERS,
+    )
+    to_remediate = {}
+    for bucket_name, check in checks.items():
+        if isinstance(check, Exception):
+            manifest[FAILED][bucket_name] = _format_error(check)
+        elif check:
+            manifest[COMPLIANT].append(bucket_name)
+        else:
+            to_remediate[bucket_name] = buckets[bucket_name]
+
+    changes = _run(
+        lambda s3, bucket_name: remediate(s3, bucket_name, account_id),
+        to_remediate,
+        WRITE_WORKERS,
+    )
+    for bucket_name, change in changes.items():
+        if isinstance(change, Exception):
+            manifest[FAILED][bucket_name] = _format_error(change)
+        else:
+            manifest[REMEDIATED].append(bucket_name)
+
+    print(
+        f"Swept {len(buckets)} buckets: {len(manifest[REMEDIATED])} remediated, "
+        f"{len(manifest[COMPLIANT])} compliant, {len(manifest[FAILED])} failed"
+    )
+    return {
+        "BucketsChecked": len(buckets),
+        REMEDIATED: len(manifest[REMEDIATED]),
+        COMPLIANT: len(manifest[COMPLIANT]),
+        FAILED: len(manifest[FAILED]),
+        "Manifest": json.dumps(manifest, separators=(",", ":")),
+    }
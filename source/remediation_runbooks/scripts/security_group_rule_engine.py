@@ -0,0 +1,97 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Security group rule evaluation shared by the security group remediation runbooks.
+
+Port sets are sorted once, and each rule's FromPort-ToPort range is checked against
+them with a binary search, so the cost of a rule does not depend on the width of its
+port range. Offending rules are revoked with one revoke_security_group_ingress call
+per batch of rule IDs rather than one call per rule.
+
+SSM runs each step's script on its own, so the runbooks inline this file ahead of
+their own script with a second %%SCRIPT%% line and import from it only when it is
+available as a module.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Tuple
+
+# IPV4 and IPV6 open access
+OPENIPV4 = "0.0.0.0/0"
+OPENIPV6 = "::/0"
+
+PROTOCOLS = {"tcp", "udp", "-1"}
+
+REVOKE_BATCH_SIZE = 100
+
+
+def to_port_intervals(ports: Iterable[int]) -> List[Tuple[int, int]]:
+    """Merge ports into sorted, non-overlapping (first, last) intervals"""
+    intervals: List[Tuple[int, int]] = []
+    for port in sorted(set(ports)):
+        if intervals and port == intervals[-1][1] + 1:
+            intervals[-1] = (intervals[-1][0], port)
+        else:
+            intervals.append((port, port))
+    return intervals
+
+
+def is_range_covered(
+    from_port: int, to_port: int, intervals: List[Tuple[int, int]]
+) -> bool:
+    """Whether every port from from_port to to_port is in one of the intervals"""
+    index = bisect_right(intervals, (from_port, float("inf"))) - 1
+    return index >= 0 and intervals[index][1] >= to_port
+
+
+def is_range_overlapping(from_port: int, to_port: int, ports: List[int]) -> bool:
+    """Whether any of the sorted ports is from from_port to to_port"""
+    index = bisect_left(ports, from_port)
+    return index < len(ports) and ports[index] <= to_port
+
+
+def has_open_access(rule: dict) -> bool:
+    return rule.get("CidrIpv4") == OPENIPV4 or rule.get("CidrIpv6") == OPENIPV6
+
+
+def is_all_traffic_rule(rule: dict) -> bool:
+    return rule["FromPort"] == rule["ToPort"] == -1
+
+
+def is_open_ingress_rule(rule: dict) -> bool:
+    return (
+        rule["IpProtocol"] in PROTOCOLS
+        and not rule["IsEgress"]
+        and has_open_access(rule)
+    )
+
+
+def revoke_ingress_rules(ec2, security_group_id: str, rule_ids: List[str]) -> list:
+    """
+    Revoke the rules in batches of REVOKE_BATCH_SIZE. If a batch fails, its rules are
+    revoked one at a time so that the rules that can be revoked still are.
+    Returns the IDs of the rules revoked.
+    """
+    rules_deleted = []
+    for start in range(0, len(rule_ids), REVOKE_BATCH_SIZE):
+        batch = rule_ids[start : start + REVOKE_BATCH_SIZE]
+        try:
+            ec2.revoke_security_group_ingress(
+                GroupId=security_group_id, SecurityGroupRuleIds=batch
+            )
+            rules_deleted.extend(batch)
+            continue
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"Failed to delete rule {batch[0]}: {str(e)}")
+                continue
+            print(f"Failed to delete {len(batch)} rules, retrying each: {str(e)}")
+
+        for rule_id in batch:
+            try:
+                ec2.revoke_security_group_ingress(
+                    GroupId=security_group_id, SecurityGroupRuleIds=[rule_id]
+                )
+                rules_deleted.append(rule_id)
+            except Exception as e:
+                print(f"Failed to delete rule {rule_id}: {str(e)}")
+    return rules_deleted
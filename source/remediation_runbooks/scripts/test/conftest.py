@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 import os
 
+import client_factory
+import multi_region
 import pytest
 
 
@@ -14,3 +16,13 @@ def aws_credentials():
     os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
     os.environ["SOLUTION_ID"] = "SOTestID"
     os.environ["AWS_ACCOUNT"] = "123456789012"
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_clients():
+    # Clients and regions are shared for the life of a runbook script, not across tests
+    client_factory.clear_clients()
+    multi_region.clear_enabled_regions()
+    yield
+    client_factory.clear_clients()
+    multi_region.clear_enabled_regions()
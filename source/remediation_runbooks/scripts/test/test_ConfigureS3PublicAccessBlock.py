@@ -268,3 +268,49 @@ def test_validate_account_public_access_block_error(mocker):
         str(e.value),
     )
     s3control_stubber.deactivate()
+
+
+@mock_aws
+def test_handle_account_all_regions(mocker):
+    mocker.patch("ConfigureS3PublicAccessBlock.sleep", return_value=None)
+    mocker.patch(
+        "multi_region.get_enabled_regions", return_value=["eu-west-1", "us-east-1"]
+    )
+    setup_account()
+
+    result = remediation.handle_account_all_regions(
+        {"AccountId": MOTO_ACCOUNT_ID, **TEST_POLICY}, None
+    )
+
+    assert result["Message"] == (
+        f"Account {MOTO_ACCOUNT_ID} public access block verified in 2 of 2 regions"
+    )
+    assert result["Regions"]["eu-west-1"] == {
+        "Status": "Success",
+        "Result": TEST_POLICY,
+    }
+
+
+@mock_aws
+def test_sweep_s3_buckets():
+    setup_bucket()
+    set_bucket_public_access_block(setup_bucket_named("compliant-bucket"), TEST_POLICY)
+
+    result = remediation.sweep_s3_buckets(
+        {"AccountId": MOTO_ACCOUNT_ID, **TEST_POLICY}, None
+    )
+
+    assert result["Remediated"] == 1
+    assert result["Compliant"] == 1
+    s3_client = boto3.client("s3", config=BOTO_CONFIG)
+    assert (
+        s3_client.get_public_access_block(Bucket=BUCKET_NAME)[
+            "PublicAccessBlockConfiguration"
+        ]
+        == TEST_POLICY
+    )
+
+
+def setup_bucket_named(bucket_name):
+    boto3.client("s3", config=BOTO_CONFIG).create_bucket(Bucket=bucket_name)
+    return bucket_name
@@ -76,7 +76,7 @@ def test_validate_policy_statements_no_statements():
     assert "No policy statements found" in result["issues"]
 
 
-@patch("EnableCloudTrailToCloudWatchLogging_validatepolicy.boto3.client")
+@patch("boto3.client")
 def test_validate_cloudtrail_bucket_policy_success(mock_boto_client):
     mock_cloudtrail = Mock()
     mock_s3 = Mock()
@@ -121,7 +121,7 @@ def test_validate_cloudtrail_bucket_policy_success(mock_boto_client):
     assert result["output"]["TrailArn"] == TRAIL_ARN
 
 
-@patch("EnableCloudTrailToCloudWatchLogging_validatepolicy.boto3.client")
+@patch("boto3.client")
 def test_validate_cloudtrail_bucket_policy_no_policy(mock_boto_client):
     mock_cloudtrail = Mock()
     mock_s3 = Mock()
@@ -143,7 +143,7 @@ def test_validate_cloudtrail_bucket_policy_no_policy(mock_boto_client):
     assert "No bucket policy found" in result["output"]["Message"]
 
 
-@patch("EnableCloudTrailToCloudWatchLogging_validatepolicy.boto3.client")
+@patch("boto3.client")
 def test_validate_cloudtrail_bucket_policy_invalid_policy(mock_boto_client):
     mock_cloudtrail = Mock()
     mock_s3 = Mock()
@@ -0,0 +1,48 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test the functionality of the `EnableDefaultEncryptionS3` sweep"""
+import json
+
+import boto3
+import EnableDefaultEncryptionS3 as remediation
+from moto import mock_aws
+
+ACCOUNT_ID = "123456789012"
+
+
+def create_buckets():
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="plain-bucket")
+    s3.create_bucket(Bucket="aes-bucket")
+    s3.put_bucket_encryption(
+        Bucket="aes-bucket",
+        ServerSideEncryptionConfiguration=remediation.get_encryption_configuration(
+            remediation.DEFAULT_KMS_KEY_ALIAS
+        ),
+    )
+    return s3
+
+
+@mock_aws
+def test_sweep_encrypts_unencrypted_buckets():
+    s3 = create_buckets()
+
+    result = remediation.sweep_handler({"AccountId": ACCOUNT_ID}, {})
+
+    manifest = json.loads(result["Manifest"])
+    assert manifest["Remediated"] == ["plain-bucket"]
+    assert manifest["Compliant"] == ["aes-bucket"]
+    assert remediation.get_sse_algorithm(s3, "plain-bucket", ACCOUNT_ID) == "AES256"
+
+
+@mock_aws
+def test_sweep_with_customer_managed_key():
+    s3 = create_buckets()
+
+    result = remediation.sweep_handler(
+        {"AccountId": ACCOUNT_ID, "KmsKeyAlias": "alias/my-key"}, {}
+    )
+
+    assert result["Remediated"] == 2
+    for bucket_name in ["plain-bucket", "aes-bucket"]:
+        assert remediation.get_sse_algorithm(s3, bucket_name, ACCOUNT_ID) == "aws:kms"
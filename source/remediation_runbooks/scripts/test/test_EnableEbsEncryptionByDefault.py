@@ -0,0 +1,45 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import boto3
+import EnableEbsEncryptionByDefault as remediation
+from moto import mock_aws
+
+REGIONS = ["eu-west-1", "us-east-1", "us-west-2"]
+
+
+@mock_aws
+def test_enable_ebs_encryption_by_default():
+    ec2 = boto3.client("ec2", region_name="us-east-1")
+
+    response = remediation.lambda_handler({}, None)
+
+    assert response["output"]["Message"] == "EBS encryption by default enabled."
+    assert ec2.get_ebs_encryption_by_default()["EbsEncryptionByDefault"]
+
+
+@mock_aws
+def test_already_enabled():
+    boto3.client("ec2", region_name="us-east-1").enable_ebs_encryption_by_default()
+
+    response = remediation.lambda_handler({}, None)
+
+    assert "already enabled" in response["output"]["Message"]
+
+
+@mock_aws
+def test_all_regions(mocker):
+    mocker.patch("multi_region.get_enabled_regions", return_value=REGIONS)
+    boto3.client("ec2", region_name="us-west-2").enable_ebs_encryption_by_default()
+
+    response = remediation.all_regions_handler({}, None)
+
+    assert response["output"]["Message"] == (
+        "EBS encryption by default enabled in 3 of 3 regions"
+    )
+    assert response["output"]["Regions"]["us-west-2"] == {
+        "Status": "Success",
+        "Result": "EBS encryption by default is already enabled.",
+    }
+    for region in REGIONS:
+        ec2 = boto3.client("ec2", region_name=region)
+        assert ec2.get_ebs_encryption_by_default()["EbsEncryptionByDefault"]
@@ -3,6 +3,7 @@
 
 import boto3
 from botocore.config import Config
+from EnableGuardDuty import all_regions_handler as all_regions_remediation
 from EnableGuardDuty import lambda_handler as remediation
 from moto import mock_aws
 
@@ -42,3 +43,19 @@ def test_create_detector():
     # Assert that the GuardDuty detector is enabled
     for detector_id in detector_list:
         assert guardduty.get_detector(DetectorId=detector_id)["Status"] == "ENABLED"
+
+
+# Test 3: Ensure GuardDuty is enabled in every enabled region.
+@mock_aws
+def test_all_regions(mocker):
+    regions = ["eu-west-1", "us-east-1"]
+    mocker.patch("multi_region.get_enabled_regions", return_value=regions)
+
+    response = all_regions_remediation(_={}, __="")
+
+    assert response["output"]["Message"] == "GuardDuty enabled in 2 of 2 regions"
+    for region in regions:
+        guardduty = boto3.client("guardduty", region_name=region)
+        detector_list = guardduty.list_detectors()["DetectorIds"]
+        assert len(detector_list) == 1
+        assert response["output"]["Regions"][region]["Status"] == "Success"
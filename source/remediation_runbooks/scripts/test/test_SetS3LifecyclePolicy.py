@@ -2,10 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 """Test the functionality of the `SetS3LifecyclePolicy` remediation script"""
 
+import json
+
 import boto3
 from botocore.config import Config
 from moto import mock_aws
 from SetS3LifecyclePolicy import lambda_handler as remediation
+from SetS3LifecyclePolicy import sweep_handler
 
 BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
 
@@ -60,3 +63,41 @@ def test_set_lifecycle_policy_with_expiration():
     # Assert the rule is the one we set with the remediation script
     assert lifecycle_config["Rules"][0]["ID"] == "S3.13 Remediation Example"
     assert "Expiration" in lifecycle_config["Rules"][0]
+
+
+@mock_aws
+def test_sweep_sets_lifecycle_policy_where_missing():
+    s3 = boto3.client("s3", config=BOTO_CONFIG)
+    s3.create_bucket(Bucket="bucket-without-policy")
+    s3.create_bucket(Bucket="bucket-with-policy")
+    s3.put_bucket_lifecycle_configuration(
+        Bucket="bucket-with-policy",
+        LifecycleConfiguration={
+            "Rules": [
+                {
+                    "ID": "Existing",
+                    "Status": "Enabled",
+                    "Filter": {},
+                    "Expiration": {"Days": 7},
+                }
+            ]
+        },
+    )
+
+    result = sweep_handler(
+        {
+            "AccountId": "123456789012",
+            "TargetTransitionDays": 30,
+            "TargetExpirationDays": 0,
+            "TargetTransitionStorageClass": "INTELLIGENT_TIERING",
+        },
+        {},
+    )
+
+    assert json.loads(result["Manifest"])["Remediated"] == ["bucket-without-policy"]
+    rules = s3.get_bucket_lifecycle_configuration(Bucket="bucket-without-policy")[
+        "Rules"
+    ]
+    assert rules[0]["ID"] == "S3.13 Remediation Example"
+    rules = s3.get_bucket_lifecycle_configuration(Bucket="bucket-with-policy")["Rules"]
+    assert rules[0]["ID"] == "Existing"
@@ -2,7 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import boto3
+import pytest
+import UpdateAutoScalingGroupsWithLaunchConfiguration as remediation
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from moto import mock_aws
 from UpdateAutoScalingGroupsWithLaunchConfiguration import (
     Event,
@@ -190,3 +193,121 @@ def test_update_auto_scaling_group_launch_configuration():
         )
         == 0
     )
+
+
+def get_launch_configuration_names():
+    autoscaling_client = boto3.client("autoscaling", config=BOTO_CONFIG)
+    return {
+        group["AutoScalingGroupName"]: group.get("LaunchConfigurationName")
+        for group in autoscaling_client.describe_auto_scaling_groups()[
+            "AutoScalingGroups"
+        ]
+    }
+
+
+@mock_aws
+def test_update_reports_count_and_skips_launch_template_groups():
+    setup()
+    ec2_client = boto3.client("ec2", config=BOTO_CONFIG)
+    ec2_client.create_launch_template(
+        LaunchTemplateName="LaunchTemplate",
+        LaunchTemplateData={"ImageId": "ami-025d618a66d5e032d"},
+    )
+    boto3.client("autoscaling", config=BOTO_CONFIG).create_auto_scaling_group(
+        AutoScalingGroupName="TemplateGroup",
+        LaunchTemplate={"LaunchTemplateName": "LaunchTemplate"},
+        MinSize=0,
+        MaxSize=1,
+        AvailabilityZones=["us-east-1a"],
+    )
+
+    result = update_auto_scaling_groups_with_launch_configuration(
+        {
+            "OldLaunchConfigurationName": OLD_LAUNCH_CONFIGURATION_NAME,
+            "NewLaunchConfigurationName": NEW_LAUNCH_CONFIGURATION_NAME,
+        },
+        None,
+    )
+
+    assert result["updated_count"] == "3"
+    assert result["failed_count"] == "0"
+
+
+@mock_aws
+def test_update_only_named_groups():
+    setup()
+
+    update_auto_scaling_groups_with_launch_configuration(
+        {
+            "OldLaunchConfigurationName": OLD_LAUNCH_CONFIGURATION_NAME,
+            "NewLaunchConfigurationName": NEW_LAUNCH_CONFIGURATION_NAME,
+            "AutoScalingGroupNames": ["AutoScalingGroup1", "AutoScalingGroup3"],
+        },
+        None,
+    )
+
+    launch_configuration_names = get_launch_configuration_names()
+    assert launch_configuration_names["AutoScalingGroup1"] == (
+        NEW_LAUNCH_CONFIGURATION_NAME
+    )
+    assert launch_configuration_names["AutoScalingGroup"] == (
+        OLD_LAUNCH_CONFIGURATION_NAME
+    )
+    assert launch_configuration_names["AutoScalingGroup3"] == (
+        ANOTHER_LAUNCH_CONFIGURATION_NAME
+    )
+
+
+def contention_error():
+    return ClientError(
+        {"Error": {"Code": "ResourceContention", "Message": "Busy"}},
+        "UpdateAutoScalingGroup",
+    )
+
+
+def test_update_retries_contention(mocker):
+    mocker.patch("UpdateAutoScalingGroupsWithLaunchConfiguration.sleep")
+    autoscaling_client = mocker.Mock()
+    autoscaling_client.update_auto_scaling_group.side_effect = [
+        contention_error(),
+        {},
+    ]
+
+    updated, failures = remediation.update_auto_scaling_groups(
+        autoscaling_client, iter(["AutoScalingGroup"]), NEW_LAUNCH_CONFIGURATION_NAME
+    )
+
+    assert updated == ["AutoScalingGroup"]
+    assert failures == []
+    assert autoscaling_client.update_auto_scaling_group.call_count == 2
+
+
+@mock_aws
+def test_update_failures_are_reported(mocker):
+    mocker.patch("UpdateAutoScalingGroupsWithLaunchConfiguration.sleep")
+    setup()
+    autoscaling_client = remediation.connect_to_auto_scaling(remediation.BOTO_CONFIG)
+    update = autoscaling_client.update_auto_scaling_group
+
+    def update_or_fail(**kwargs):
+        if kwargs["AutoScalingGroupName"] == "AutoScalingGroup1":
+            raise contention_error()
+        return update(**kwargs)
+
+    mocker.patch.object(
+        autoscaling_client, "update_auto_scaling_group", side_effect=update_or_fail
+    )
+
+    with pytest.raises(RuntimeError, match="Failed to update 1 of 3") as e:
+        update_auto_scaling_groups_with_launch_configuration(
+            {
+                "OldLaunchConfigurationName": OLD_LAUNCH_CONFIGURATION_NAME,
+                "NewLaunchConfigurationName": NEW_LAUNCH_CONFIGURATION_NAME,
+            },
+            None,
+        )
+
+    assert "AutoScalingGroup1" in str(e.value)
+    assert autoscaling_client.update_auto_scaling_group.call_count == (
+        2 + remediation.UPDATE_ATTEMPTS
+    )
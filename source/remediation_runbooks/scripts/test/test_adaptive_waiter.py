@@ -0,0 +1,114 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test the polling shared by the remediation runbook scripts"""
+from unittest.mock import Mock
+
+import pytest
+from adaptive_waiter import WaiterTimeoutError, get_delay, wait_until
+
+
+def test_returns_first_truthy_result_without_waiting():
+    sleep = Mock()
+
+    assert wait_until(lambda: "ready", "resource", sleep=sleep) == "ready"
+    sleep.assert_not_called()
+
+
+def test_backs_off_until_condition_is_met():
+    sleep = Mock()
+    results = iter([None, None, None, {"Status": "ACTIVE"}])
+
+    result = wait_until(
+        lambda: next(results), "resource", initial_delay=2, max_delay=5, sleep=sleep
+    )
+
+    assert result == {"Status": "ACTIVE"}
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert 1 <= delays[0] <= 2
+    assert 2 <= delays[1] <= 4
+    assert 2.5 <= delays[2] <= 5
+
+
+def test_delay_is_capped_and_jittered():
+    assert get_delay(10, 1, 30, jitter=False) == 30
+    assert all(15 <= get_delay(10, 1, 30) <= 30 for _ in range(100))
+
+
+def test_gives_up_after_max_attempts():
+    condition = Mock(return_value=False)
+
+    with pytest.raises(WaiterTimeoutError):
+        wait_until(condition, "resource", max_attempts=3, sleep=Mock())
+
+    assert condition.call_count == 3
+
+
+def test_gives_up_before_deadline():
+    condition = Mock(return_value=False)
+    sleep = Mock()
+
+    with pytest.raises(WaiterTimeoutError):
+        wait_until(
+            condition, "resource", initial_delay=10, timeout_seconds=5, sleep=sleep
+        )
+
+    condition.assert_called_once()
+    sleep.assert_not_called()
+
+
+def test_gives_up_before_step_timeout():
+    condition = Mock(return_value=False)
+
+    with pytest.raises(WaiterTimeoutError):
+        wait_until(
+            condition,
+            "resource",
+            initial_delay=10,
+            step_timeout_seconds=15,
+            sleep=Mock(),
+        )
+
+    condition.assert_called_once()
+
+
+def test_retries_retryable_errors():
+    condition = Mock(side_effect=[ValueError("not yet"), "ready"])
+
+    assert (
+        wait_until(
+            condition,
+            "resource",
+            retry_if=lambda e: isinstance(e, ValueError),
+            sleep=Mock(),
+        )
+        == "ready"
+    )
+
+
+def test_raises_last_retryable_error_when_out_of_attempts():
+    condition = Mock(side_effect=ValueError("not yet"))
+
+    with pytest.raises(ValueError):
+        wait_until(
+            condition,
+            "resource",
+            max_attempts=2,
+            retry_if=lambda e: isinstance(e, ValueError),
+            sleep=Mock(),
+        )
+
+    assert condition.call_count == 2
+
+
+def test_raises_other_errors_immediately():
+    condition = Mock(side_effect=KeyError("missing"))
+
+    with pytest.raises(KeyError):
+        wait_until(
+            condition,
+            "resource",
+            retry_if=lambda e: isinstance(e, ValueError),
+            sleep=Mock(),
+        )
+
+    condition.assert_called_once()
@@ -0,0 +1,144 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test the bucket policy engine shared by the S3 bucket policy scripts"""
+import json
+
+import pytest
+from bucket_policy_engine import (
+    MAX_POLICY_SIZE,
+    BucketPolicy,
+    PolicySizeError,
+    compact_principals,
+    get_principal_account,
+)
+
+
+def deny_statement(principals):
+    return {
+        "Effect": "Deny",
+        "Principal": {"AWS": principals},
+        "Action": ["s3:PutBucketPolicy", "s3:DeleteBucketPolicy"],
+        "Resource": ["arn:aws:s3:::abucket", "arn:aws:s3:::abucket/*"],
+    }
+
+
+def policy():
+    return {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "AllowReplication",
+                "Effect": "Allow",
+                "Principal": {"AWS": "arn:aws:iam::111122223333:role/replication"},
+                "Action": "s3:ReplicateObject",
+                "Resource": "arn:aws:s3:::abucket/*",
+            },
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "cloudtrail.amazonaws.com"},
+                "Action": "s3:PutObject",
+                "Resource": "arn:aws:s3:::abucket/*",
+            },
+        ],
+    }
+
+
+def test_get_principal_account():
+    assert get_principal_account("111122223333") == "111122223333"
+    assert get_principal_account("arn:aws:iam::111122223333:user/Dave") == (
+        "111122223333"
+    )
+    assert get_principal_account("*") is None
+
+
+def test_compact_principals_drops_duplicates_and_principals_of_listed_accounts():
+    assert compact_principals(
+        [
+            "arn:aws:iam::111122223333:user/Dave",
+            "arn:aws:iam::222233334444:user/Lalit",
+            "arn:aws:iam::111122223333:root",
+            "111122223333",
+            "arn:aws:iam::222233334444:user/Lalit",
+        ]
+    ) == ["arn:aws:iam::222233334444:user/Lalit", "arn:aws:iam::111122223333:root"]
+
+
+def test_statements_are_indexed_by_effect_principal_and_action():
+    bucket_policy = BucketPolicy(policy())
+
+    assert bucket_policy.statements_with(effect="Allow") == policy()["Statement"]
+    assert bucket_policy.statements_with(
+        principal="arn:aws:iam::111122223333:role/replication",
+        action="s3:ReplicateObject",
+    ) == [policy()["Statement"][0]]
+    assert bucket_policy.statements_with(effect="Deny") == []
+    assert bucket_policy.get_aws_principals(effect="Allow") == [
+        "arn:aws:iam::111122223333:role/replication"
+    ]
+
+
+def test_single_statement_is_read_as_a_list():
+    single = policy()
+    single["Statement"] = single["Statement"][0]
+
+    assert BucketPolicy(single).statements == [policy()["Statement"][0]]
+
+
+def test_adding_a_statement_again_does_not_change_the_policy():
+    bucket_policy = BucketPolicy(policy())
+
+    assert bucket_policy.add_statement(deny_statement(["111122223333"]))
+    statement = deny_statement(["111122223333"])
+    statement["Sid"] = "Renamed"
+    statement["Action"].reverse()
+    assert not bucket_policy.add_statement(statement)
+    assert len(bucket_policy.statements) == 3
+
+
+def test_principals_are_merged_into_an_equivalent_statement():
+    bucket_policy = BucketPolicy(policy())
+    bucket_policy.add_statement(deny_statement(["arn:aws:iam::111122223333:user/Dave"]))
+
+    assert bucket_policy.add_statement(
+        deny_statement(["arn:aws:iam::111122223333:root"])
+    )
+    assert not bucket_policy.add_statement(
+        deny_statement(["arn:aws:iam::111122223333:user/Mary"])
+    )
+    assert bucket_policy.statements[2] == deny_statement(
+        ["arn:aws:iam::111122223333:root"]
+    )
+    assert bucket_policy.statements_with(
+        effect="Deny", principal="arn:aws:iam::111122223333:root"
+    ) == [bucket_policy.statements[2]]
+
+
+def test_colliding_statement_id_is_dropped():
+    bucket_policy = BucketPolicy(policy())
+    statement = deny_statement(["111122223333"])
+    statement["Sid"] = "AllowReplication"
+
+    bucket_policy.add_statement(statement)
+
+    assert "Sid" not in bucket_policy.statements[2]
+
+
+def test_serialize_falls_back_to_compact_json():
+    bucket_policy = BucketPolicy(policy())
+    principals = [f"arn:aws:iam::111122223333:role/r{i:04}" for i in range(450)]
+    bucket_policy.add_statement(deny_statement(principals))
+    assert len(json.dumps(bucket_policy.policy, indent=4)) > MAX_POLICY_SIZE
+
+    serialized = bucket_policy.serialize(indent=4)
+
+    assert len(serialized) <= MAX_POLICY_SIZE
+    assert json.loads(serialized) == bucket_policy.policy
+
+
+def test_serialize_raises_when_the_policy_is_too_large():
+    bucket_policy = BucketPolicy(policy())
+    principals = [f"arn:aws:iam::111122223333:role/r{i:04}" for i in range(700)]
+    bucket_policy.add_statement(deny_statement(principals))
+
+    with pytest.raises(PolicySizeError):
+        bucket_policy.serialize(indent=4)
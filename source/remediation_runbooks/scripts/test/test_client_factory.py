@@ -0,0 +1,68 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test the boto3 clients shared by the remediation runbook scripts"""
+import ast
+from collections import Counter
+from pathlib import Path
+
+import boto3
+import client_factory
+import RevokeUnusedIAMUserCredentials
+from botocore.config import Config
+from moto import mock_aws
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_clients_are_shared_per_service_region_and_config():
+    config = Config(retries={"mode": "standard"})
+
+    client = client_factory.get_client("s3", config=config)
+
+    assert client_factory.get_client("s3", config=config) is client
+    assert (
+        client_factory.get_client("s3", config=Config(retries={"mode": "standard"}))
+        is client
+    )
+    assert client_factory.get_client("s3", config=Config()) is not client
+    assert client_factory.get_client("s3", "eu-west-1", config) is not client
+    assert client_factory.get_client("sns", config=config) is not client
+
+
+def test_resources_are_shared():
+    resource = client_factory.get_resource("cloudformation")
+
+    assert client_factory.get_resource("cloudformation") is resource
+
+
+def test_scripts_create_clients_through_the_factory():
+    direct_calls = []
+    for script in SCRIPTS_DIR.glob("*.py"):
+        if script.name == "client_factory.py":
+            continue
+        for node in ast.walk(ast.parse(script.read_text())):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == "boto3"
+                and node.attr in ["client", "resource"]
+            ):
+                direct_calls.append(f"{script.name}:{node.lineno}")
+
+    assert direct_calls == []
+
+
+@mock_aws
+def test_script_creates_one_client_per_service(mocker):
+    iam = boto3.client("iam", region_name="us-east-1")
+    iam.create_user(UserName="Bob")
+    iam.create_access_key(UserName="Bob")
+    iam.create_login_profile(UserName="Bob", Password="mypassword")
+    create_client = mocker.spy(boto3, "client")
+
+    RevokeUnusedIAMUserCredentials.handler(
+        {"IAMUserName": "Bob", "MaxCredentialUsageAge": "0"}, None
+    )
+
+    clients = Counter(call.args[0] for call in create_client.call_args_list)
+    assert clients == {"iam": 1}
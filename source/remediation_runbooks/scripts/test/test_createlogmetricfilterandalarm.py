@@ -1,5 +1,6 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import json
 from typing import Dict
 
 import boto3
@@ -9,6 +10,7 @@ import CreateLogMetricFilterAndAlarm_createtopic as topicutil
 import pytest
 from botocore.config import Config
 from botocore.stub import Stubber
+from moto import mock_aws
 
 my_session = boto3.session.Session()
 my_region = my_session.region_name
@@ -437,3 +439,87 @@ def test_ensure_log_group_exists_already_exists_during_creation(mocker):
     assert result == {"exists": True, "created": False}
     logs_stubber.assert_no_pending_responses()
     logs_stubber.deactivate()
+
+
+def batch_event():
+    return {
+        "LogGroupName": "test_log",
+        "MetricNamespace": "LogMetrics",
+        "TopicArn": "arn:aws:sns:us-east-1:111111111111:test-topic-name",
+        "Filters": [
+            {
+                "FilterName": name,
+                "FilterPattern": f'{{$.eventName="{name}"}}',
+                "MetricName": name,
+                "MetricValue": 1,
+                "AlarmName": name,
+                "AlarmDesc": f"Alarm for {name} > 0",
+                "AlarmThreshold": 1,
+            }
+            for name in ["RootAccountUsage", "IAMPolicyChanges", "CloudTrailChanges"]
+        ],
+    }
+
+
+@mock_aws
+def test_verify_batch(mocker):
+    ensure_spy = mocker.spy(logMetricAlarm, "ensure_log_group_exists")
+
+    response = logMetricAlarm.verify_batch(batch_event(), {})["response"]
+
+    ensure_spy.assert_called_once()
+    assert response["status"] == "Success"
+    assert response["succeededCount"] == "3"
+    assert [result["Status"] for result in json.loads(response["results"])] == [
+        "Success"
+    ] * 3
+    logs = boto3.client("logs", region_name=my_region)
+    filters = logs.describe_metric_filters(logGroupName="test_log")["metricFilters"]
+    assert len(filters) == 3
+    cloudwatch = boto3.client("cloudwatch", region_name=my_region)
+    assert len(cloudwatch.describe_alarms()["MetricAlarms"]) == 3
+
+
+@mock_aws
+def test_verify_batch_reports_failed_filters(mocker):
+    put_metric_alarm = logMetricAlarm.put_metric_alarm
+
+    def fail_one_alarm(alarm_name, *args):
+        if alarm_name == "IAMPolicyChanges":
+            raise logMetricAlarm.MetricAlarmCreationError("Cannot add alarm")
+        put_metric_alarm(alarm_name, *args)
+
+    mocker.patch(
+        "CreateLogMetricFilterAndAlarm.put_metric_alarm", side_effect=fail_one_alarm
+    )
+
+    response = logMetricAlarm.verify_batch(batch_event(), {})["response"]
+
+    assert response["status"] == "PartialSuccess"
+    assert response["failedCount"] == "1"
+    results = json.loads(response["results"])
+    assert results[1] == {
+        "FilterName": "IAMPolicyChanges",
+        "AlarmName": "IAMPolicyChanges",
+        "Status": "Failed",
+        "Error": "Cannot add alarm",
+    }
+
+
+@mock_aws
+def test_verify_batch_fails_when_no_filter_succeeds(mocker):
+    mocker.patch(
+        "CreateLogMetricFilterAndAlarm.put_metric_alarm",
+        side_effect=logMetricAlarm.MetricAlarmCreationError("Cannot add alarm"),
+    )
+
+    with pytest.raises(logMetricAlarm.RemediationError, match="Created 0 of 3"):
+        logMetricAlarm.verify_batch(batch_event(), {})
+
+
+def test_verify_batch_requires_filter_parameters():
+    event = batch_event()
+    del event["Filters"][0]["FilterPattern"]
+
+    with pytest.raises(ValueError, match="FilterPattern"):
+        logMetricAlarm.verify_batch(event, {})
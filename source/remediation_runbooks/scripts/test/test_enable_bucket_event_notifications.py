@@ -10,7 +10,8 @@ import pytest
 from botocore.config import Config
 from botocore.exceptions import UnknownRegionError
 from botocore.stub import Stubber
-from enable_bucket_event_notifications import lambda_handler
+from enable_bucket_event_notifications import lambda_handler, sweep_handler
+from moto import mock_aws
 
 
 def partition_from_region(session: boto3.session.Session):
@@ -426,3 +427,45 @@ def test_error_case(mocker):
             match=f"ERROR: {bucket_name} was not configured with notifications",
         ):
             lambda_handler(event, {})
+
+
+@mock_aws
+def test_sweep_configures_buckets_without_notifications():
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="quiet-bucket")
+    s3.create_bucket(Bucket="notifying-bucket")
+    s3.put_bucket_notification_configuration(
+        Bucket="notifying-bucket",
+        NotificationConfiguration={
+            "QueueConfigurations": [
+                {
+                    "QueueArn": "arn:aws:sqs:us-east-1:123456789012:existing-queue",
+                    "Events": ["s3:ObjectCreated:*"],
+                }
+            ]
+        },
+    )
+
+    result = sweep_handler(
+        {
+            "topic_name": topic_name,
+            "account_id": "123456789012",
+            "event_types": ["s3:ObjectCreated:*"],
+        },
+        {},
+    )
+
+    manifest = json.loads(result["Manifest"])
+    assert manifest["Remediated"] == ["quiet-bucket"]
+    assert manifest["Compliant"] == ["notifying-bucket"]
+    topic_arn = f"arn:aws:sns:us-east-1:123456789012:{topic_name}"
+    configuration = s3.get_bucket_notification_configuration(Bucket="quiet-bucket")
+    assert configuration["TopicConfigurations"][0]["TopicArn"] == topic_arn
+    policy = json.loads(
+        boto3.client("sns", region_name="us-east-1").get_topic_attributes(
+            TopicArn=topic_arn
+        )["Attributes"]["Policy"]
+    )
+    assert policy["Statement"][0]["Condition"]["ArnLike"]["aws:SourceArn"] == [
+        "arn:aws:s3:::*"
+    ]
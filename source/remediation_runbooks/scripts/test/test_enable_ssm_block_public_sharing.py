@@ -115,3 +115,26 @@ def test_lambda_handler_missing_account_id():
 
     with pytest.raises(Exception):
         remediation.lambda_handler(event, None)
+
+
+def test_all_regions_handler(mocker, event):
+    mocker.patch(
+        "multi_region.get_enabled_regions", return_value=["eu-west-1", "us-east-1"]
+    )
+    mocker.patch("multi_region.get_client")
+    clients = {"eu-west-1": MagicMock(), "us-east-1": MagicMock()}
+    clients["eu-west-1"].get_service_setting.return_value = {
+        "ServiceSetting": {"SettingValue": "Disable"}
+    }
+    clients["us-east-1"].get_service_setting.side_effect = ClientError(
+        {"Error": {"Code": "AccessDeniedException", "Message": "Denied"}},
+        "GetServiceSetting",
+    )
+
+    with patch.object(remediation, "connect_to_ssm", side_effect=clients.get):
+        result = remediation.all_regions_handler(event, None)
+
+    regions = result["response"]["regions"]
+    assert regions["eu-west-1"]["Result"]["status"] == "NO_CHANGE_REQUIRED"
+    assert regions["us-east-1"]["Status"] == "Failed"
+    assert result["response"]["message"].endswith("failed in us-east-1")
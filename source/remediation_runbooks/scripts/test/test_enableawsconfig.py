@@ -177,3 +177,31 @@ def test_enable_config_with_existing_recorder():
 
     verify_config_enabled_with_all_resources("my-recorder")
     assert response["Message"]
+
+
+@mock_aws(config={"iam": {"load_aws_managed_policies": True}})
+def test_enable_config_all_regions(mocker):
+    mocker.patch("multi_region.get_enabled_regions", return_value=["eu-west-1", REGION])
+    enable_config_event = {
+        "partition": "aws",
+        "account": "123456789012",
+        "config_bucket": "so0111-aws-config-us-east-1-123456789012",
+        "topic_arn": "arn:aws:sns:us-east-1:123456789012:sharr-test",
+        "aws_service_role": "aws-service-role/config.amazonaws.com/AWSServiceRoleForConfig",
+        "remediation_scope": "AllRegions",
+    }
+
+    response = enableconfig.enable_config(enable_config_event, {})
+
+    assert response["Message"] == "Config recorder set up in 2 of 2 regions"
+    verify_config_enabled_with_all_resources("default")
+    config_client = boto3.client("config", region_name="eu-west-1")
+    recorder = config_client.describe_configuration_recorders()[
+        "ConfigurationRecorders"
+    ][0]
+    assert not recorder["recordingGroup"]["includeGlobalResourceTypes"]
+    assert config_client.describe_configuration_recorder_status()[
+        "ConfigurationRecordersStatus"
+    ][0]["recording"]
+    channel = config_client.describe_delivery_channels()["DeliveryChannels"][0]
+    assert "snsTopicARN" not in channel
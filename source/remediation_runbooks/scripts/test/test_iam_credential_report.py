@@ -0,0 +1,113 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test the account-wide revocation of stale IAM user credentials"""
+import io
+from datetime import datetime, timedelta, timezone
+
+import boto3
+import iam_credential_report as report
+import pytest
+import RevokeUnrotatedKeys
+import RevokeUnusedIAMUserCredentials
+from botocore.config import Config
+from moto import mock_aws
+
+BOTO_CONFIG = Config(retries={"mode": "standard"}, region_name="us-east-1")
+
+HEADER = (
+    "user,arn,password_enabled,password_last_used,password_last_changed,"
+    "access_key_1_active,access_key_1_last_rotated,access_key_1_last_used_date,"
+    "access_key_2_active,access_key_2_last_rotated,access_key_2_last_used_date"
+)
+
+
+def days_ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).replace(microsecond=0)
+
+
+def report_rows(*rows):
+    content = "\n".join([HEADER, *rows]).encode()
+    return report.csv.DictReader(io.TextIOWrapper(io.BytesIO(content)))
+
+
+@pytest.fixture(autouse=True)
+def no_report_polling(mocker):
+    mocker.patch("iam_credential_report.REPORT_POLL_SECONDS", 0)
+
+
+def test_find_stale_credentials():
+    old = days_ago(120).isoformat()
+    recent = days_ago(10).isoformat()
+    rows = report_rows(
+        f"<root_account>,arn,not_supported,{old},not_supported,true,{old},{old},false,N/A,N/A",
+        f"unused,arn,true,no_information,{old},true,{old},N/A,true,{recent},N/A",
+        f"used,arn,true,{recent},{old},true,{old},{recent},false,N/A,N/A",
+        f"inactive,arn,false,N/A,N/A,false,{old},N/A,false,N/A,N/A",
+    )
+
+    assert report.find_stale_credentials(rows, 90) == {
+        "unused": {"KeyCreateDates": [days_ago(120)], "Password": True}
+    }
+
+
+def test_find_unrotated_keys():
+    old = days_ago(120).isoformat()
+    recent = days_ago(10).isoformat()
+    rows = report_rows(
+        f"used,arn,true,{recent},{old},true,{old},{recent},true,{recent},{recent}",
+    )
+
+    assert report.find_stale_credentials(rows, 90, rotation=True) == {
+        "used": {"KeyCreateDates": [days_ago(120)], "Password": False}
+    }
+
+
+@mock_aws
+def test_account_handler_revokes_unused_credentials():
+    iam = boto3.client("iam", config=BOTO_CONFIG)
+    for user_name in ["Alice", "Bob"]:
+        iam.create_user(UserName=user_name)
+        iam.create_access_key(UserName=user_name)
+    iam.create_login_profile(UserName="Bob", Password="mypassword")
+
+    response = RevokeUnusedIAMUserCredentials.account_handler(
+        {"MaxCredentialUsageAge": "0"}, {}
+    )
+
+    assert response["Result"] == {
+        "UsersChecked": 2,
+        "UsersWithStaleCredentials": 2,
+        "DeactivatedKeys": 2,
+        "DeletedPasswords": 1,
+        "Failures": 0,
+        "FailureSamples": [],
+    }
+    for user_name in ["Alice", "Bob"]:
+        keys = iam.list_access_keys(UserName=user_name)["AccessKeyMetadata"]
+        assert keys[0]["Status"] == "Inactive"
+    with pytest.raises(iam.exceptions.NoSuchEntityException):
+        iam.get_login_profile(UserName="Bob")
+
+
+@mock_aws
+def test_account_unrotated_key_handler_keeps_recent_keys():
+    iam = boto3.client("iam", config=BOTO_CONFIG)
+    iam.create_user(UserName="Alice")
+    iam.create_access_key(UserName="Alice")
+
+    response = RevokeUnrotatedKeys.account_unrotated_key_handler(
+        {"MaxCredentialUsageAge": "90"}, {}
+    )
+
+    assert response["result"]["UsersWithStaleCredentials"] == 0
+    keys = iam.list_access_keys(UserName="Alice")["AccessKeyMetadata"]
+    assert keys[0]["Status"] == "Active"
+
+
+def test_report_timeout(mocker):
+    mocker.patch("iam_credential_report.REPORT_TIMEOUT_SECONDS", 0)
+    iam = mocker.Mock()
+    iam.generate_credential_report.return_value = {"State": "INPROGRESS"}
+
+    with pytest.raises(RuntimeError, match="Timed out"):
+        report.get_credential_report(iam)
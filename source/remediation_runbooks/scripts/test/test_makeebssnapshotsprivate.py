@@ -1,11 +1,13 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import json
 from typing import Any, Dict
 
 import boto3
 import botocore.session
 import GetPublicEBSSnapshots as getsnaps
 import MakeEBSSnapshotsPrivate as updatesnaps
+import pytest
 from botocore.config import Config
 from botocore.stub import Stubber
 
@@ -188,3 +190,90 @@ def test_make_snaps_private(mocker):
     }
     ec2_stubber.assert_no_pending_responses()
     ec2_stubber.deactivate()
+
+
+def test_make_snaps_private_reports_failures(mocker):
+    snapshot_ids = [f"snap-0000000000000000{index}" for index in range(3)]
+    event = {"account_id": "111111111111", "snapshots": snapshot_ids}
+    mocker.patch("MakeEBSSnapshotsPrivate.CHUNK_SIZE", 2)
+    mocker.patch("MakeEBSSnapshotsPrivate.MAX_WORKERS", 1)
+
+    ec2 = botocore.session.get_session().create_client("ec2", config=BOTO_CONFIG)
+    ec2_stubber = Stubber(ec2)
+    for snapshot_id in snapshot_ids[:2]:
+        ec2_stubber.add_response(
+            "modify_snapshot_attribute",
+            {},
+            {
+                "Attribute": "CreateVolumePermission",
+                "CreateVolumePermission": {"Remove": [{"Group": "all"}]},
+                "SnapshotId": snapshot_id,
+            },
+        )
+    ec2_stubber.add_response(
+        "describe_snapshots",
+        {"Snapshots": [{"SnapshotId": snapshot_ids[1]}]},
+        {"SnapshotIds": snapshot_ids[:2], "RestorableByUserIds": ["all"]},
+    )
+    ec2_stubber.add_client_error("modify_snapshot_attribute", "InvalidSnapshot.InUse")
+
+    ec2_stubber.activate()
+    mocker.patch("MakeEBSSnapshotsPrivate.connect_to_ec2", return_value=ec2)
+
+    with pytest.raises(RuntimeError, match="Failed to make 2 of 3 Snapshots") as e:
+        updatesnaps.make_snapshots_private(event, {})
+
+    failures = json.loads(str(e.value).split(": ", 1)[1])
+    assert [failure["SnapshotId"] for failure in failures] == [
+        snapshot_ids[1],
+        snapshot_ids[2],
+    ]
+    ec2_stubber.assert_no_pending_responses()
+    ec2_stubber.deactivate()
+
+
+def test_make_snaps_private_verifies_each_snapshot_when_chunk_fails(mocker):
+    snapshot_ids = [f"snap-0000000000000000{index}" for index in range(3)]
+    event = {"account_id": "111111111111", "snapshots": snapshot_ids}
+    mocker.patch("MakeEBSSnapshotsPrivate.MAX_WORKERS", 1)
+
+    ec2 = botocore.session.get_session().create_client("ec2", config=BOTO_CONFIG)
+    ec2_stubber = Stubber(ec2)
+    for snapshot_id in snapshot_ids:
+        ec2_stubber.add_response(
+            "modify_snapshot_attribute",
+            {},
+            {
+                "Attribute": "CreateVolumePermission",
+                "CreateVolumePermission": {"Remove": [{"Group": "all"}]},
+                "SnapshotId": snapshot_id,
+            },
+        )
+    ec2_stubber.add_client_error("describe_snapshots", "InvalidSnapshot.NotFound")
+    ec2_stubber.add_response(
+        "describe_snapshots",
+        {"Snapshots": []},
+        {"SnapshotIds": [snapshot_ids[0]], "RestorableByUserIds": ["all"]},
+    )
+    ec2_stubber.add_client_error("describe_snapshots", "InvalidSnapshot.NotFound")
+    ec2_stubber.add_response(
+        "describe_snapshots",
+        {"Snapshots": [{"SnapshotId": snapshot_ids[2]}]},
+        {"SnapshotIds": [snapshot_ids[2]], "RestorableByUserIds": ["all"]},
+    )
+
+    ec2_stubber.activate()
+    mocker.patch("MakeEBSSnapshotsPrivate.connect_to_ec2", return_value=ec2)
+
+    with pytest.raises(RuntimeError, match="Failed to make 2 of 3 Snapshots") as e:
+        updatesnaps.make_snapshots_private(event, {})
+
+    failures = json.loads(str(e.value).split(": ", 1)[1])
+    assert [failure["SnapshotId"] for failure in failures] == [
+        snapshot_ids[1],
+        snapshot_ids[2],
+    ]
+    assert failures[0]["Error"].startswith("Could not verify")
+    assert failures[1]["Error"] == "Snapshot is still public"
+    ec2_stubber.assert_no_pending_responses()
+    ec2_stubber.deactivate()
@@ -0,0 +1,59 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test applying account-level remediations in every enabled region"""
+import boto3
+import multi_region
+import pytest
+from moto import mock_aws
+
+
+def test_enabled_regions_are_listed_once(mocker):
+    ec2 = mocker.patch("multi_region.get_client").return_value
+    ec2.describe_regions.return_value = {
+        "Regions": [{"RegionName": "us-east-1"}, {"RegionName": "eu-west-1"}]
+    }
+
+    assert multi_region.get_enabled_regions() == ["eu-west-1", "us-east-1"]
+    assert multi_region.get_enabled_regions() == ["eu-west-1", "us-east-1"]
+    ec2.describe_regions.assert_called_once_with()
+
+
+@mock_aws
+def test_applies_in_every_enabled_region():
+    results = multi_region.apply_in_regions(
+        lambda region: boto3.client("sts", region_name=region).meta.region_name,
+        ["sts"],
+    )
+
+    assert set(results) == set(multi_region.get_enabled_regions())
+    assert results["eu-west-1"] == {"Status": "Success", "Result": "eu-west-1"}
+
+
+def test_failures_are_reported_per_region(mocker):
+    mocker.patch("multi_region.get_client")
+
+    def apply(region):
+        if region == "eu-west-1":
+            raise ValueError("not allowed")
+        return "done"
+
+    results = multi_region.apply_in_regions(
+        apply, ["sts"], regions=["us-east-1", "eu-west-1"]
+    )
+
+    assert results == {
+        "us-east-1": {"Status": "Success", "Result": "done"},
+        "eu-west-1": {"Status": "Failed", "Error": "not allowed"},
+    }
+    assert multi_region.get_failed_regions(results) == ["eu-west-1"]
+    assert (
+        multi_region.summarize_regions(results, "Changed")
+        == "Changed in 1 of 2 regions, failed in eu-west-1"
+    )
+
+
+def test_summary_raises_when_every_region_failed():
+    with pytest.raises(RuntimeError, match="Changed in 0 of 1 regions"):
+        multi_region.summarize_regions(
+            {"us-east-1": {"Status": "Failed", "Error": "not allowed"}}, "Changed"
+        )
@@ -170,12 +170,7 @@ def policy_multi_principal_expected():
             },
             {
                 "Effect": "Deny",
-                "Principal": {
-                    "AWS": [
-                        "arn:aws:iam::111122223333:user/Dave",
-                        "arn:aws:iam::111122223333:root",
-                    ]
-                },
+                "Principal": {"AWS": ["arn:aws:iam::111122223333:root"]},
                 "Action": [
                     "s3:DeleteBucketPolicy",
                     "s3:PutBucketAcl",
@@ -394,3 +389,18 @@ def test_policy_statement_only_star_principal(mocker):
     )
 
     s3_stubber.deactivate()
+
+
+def test_rerun_does_not_duplicate_the_deny_statement(mocker):
+    s3_client = botocore.session.get_session().create_client("s3", config=BOTO_CONFIG)
+    s3_stubber = Stubber(s3_client)
+    s3_stubber.add_response(
+        "get_bucket_policy",
+        {"Policy": json.dumps(policy_basic_expected())},
+        expected_params={"Bucket": "example", "ExpectedBucketOwner": "222233334444"},
+    )
+    s3_stubber.activate()
+    mocker.patch("PutS3BucketPolicyDeny.connect_to_s3", return_value=s3_client)
+    assert remediation.update_bucket_policy(event(), {}) is None
+    s3_stubber.assert_no_pending_responses()
+    s3_stubber.deactivate()
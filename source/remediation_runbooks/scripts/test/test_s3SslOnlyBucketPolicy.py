@@ -7,6 +7,7 @@ import botocore.session
 import SetSSLBucketPolicy as remediation
 from botocore.config import Config
 from botocore.stub import Stubber
+from moto import mock_aws
 
 my_session = boto3.session.Session()
 my_region = my_session.region_name
@@ -122,3 +123,43 @@ def test_add_to_policy(mocker):
     mocker.patch("SetSSLBucketPolicy.connect_to_s3", return_value=s3_client)
     assert remediation.add_ssl_bucket_policy(event(), {}) is None
     s3_stubber.deactivate()
+
+
+@mock_aws
+def test_sweep_adds_statement_only_where_missing():
+    s3 = boto3.client("s3", config=BOTO_CONFIG)
+    s3.create_bucket(Bucket="abucket")
+    s3.put_bucket_policy(Bucket="abucket", Policy=json.dumps(existing_policy()))
+    s3.create_bucket(Bucket="ssl-bucket")
+    s3.put_bucket_policy(
+        Bucket="ssl-bucket",
+        Policy=json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Sid": "DenyInsecureTransport",
+                        "Effect": "Deny",
+                        "Principal": "*",
+                        "Action": "s3:*",
+                        "Resource": "arn:aws:s3:::ssl-bucket/*",
+                        "Condition": {"Bool": {"aws:SecureTransport": False}},
+                    }
+                ],
+            }
+        ),
+    )
+    s3.create_bucket(Bucket="no-policy-bucket")
+
+    result = remediation.sweep_ssl_bucket_policies(
+        {"accountid": "123456789012", "partition": "aws"}, {}
+    )
+
+    manifest = json.loads(result["Manifest"])
+    assert sorted(manifest["Remediated"]) == ["abucket", "no-policy-bucket"]
+    assert manifest["Compliant"] == ["ssl-bucket"]
+    for bucket_name in ["abucket", "no-policy-bucket"]:
+        policy = json.loads(s3.get_bucket_policy(Bucket=bucket_name)["Policy"])
+        assert remediation.requires_ssl(policy)
+    policy = json.loads(s3.get_bucket_policy(Bucket="abucket")["Policy"])
+    assert policy["Statement"][0] == existing_policy()["Statement"][0]
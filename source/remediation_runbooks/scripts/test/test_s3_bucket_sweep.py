@@ -0,0 +1,91 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test sweeping every S3 bucket in an account for a bucket-level control"""
+import json
+
+import boto3
+import s3_bucket_sweep
+from moto import mock_aws
+
+ACCOUNT_ID = "123456789012"
+
+
+def create_buckets(*bucket_names):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    for bucket_name in bucket_names:
+        s3.create_bucket(Bucket=bucket_name)
+
+
+@mock_aws
+def test_remediates_only_non_compliant_buckets(mocker):
+    create_buckets("compliant-bucket", "open-bucket", "broken-bucket")
+    remediated = []
+
+    def remediate(s3, bucket_name, account_id):
+        assert account_id == ACCOUNT_ID
+        if bucket_name == "broken-bucket":
+            raise RuntimeError("Access Denied")
+        remediated.append(bucket_name)
+
+    result = s3_bucket_sweep.sweep_buckets(
+        ACCOUNT_ID,
+        lambda s3, bucket_name, account_id: bucket_name == "compliant-bucket",
+        remediate,
+    )
+
+    assert remediated == ["open-bucket"]
+    assert {key: value for key, value in result.items() if key != "Manifest"} == {
+        "BucketsChecked": 3,
+        "Remediated": 1,
+        "Compliant": 1,
+        "Failed": 1,
+    }
+    assert json.loads(result["Manifest"]) == {
+        "Remediated": ["open-bucket"],
+        "Compliant": ["compliant-bucket"],
+        "Failed": {"broken-bucket": "Access Denied"},
+    }
+
+
+@mock_aws
+def test_failed_checks_are_not_remediated():
+    create_buckets("unreadable-bucket")
+    remediate = []
+
+    def is_compliant(s3, bucket_name, account_id):
+        raise RuntimeError("x" * 500)
+
+    result = s3_bucket_sweep.sweep_buckets(
+        ACCOUNT_ID,
+        is_compliant,
+        lambda s3, bucket_name, account_id: remediate.append(bucket_name),
+    )
+
+    assert remediate == []
+    errors = json.loads(result["Manifest"])["Failed"]
+    assert len(errors["unreadable-bucket"]) == s3_bucket_sweep.MAX_ERROR_LENGTH
+
+
+@mock_aws
+def test_sweeps_only_the_given_buckets():
+    create_buckets("first-bucket", "second-bucket")
+
+    result = s3_bucket_sweep.sweep_buckets(
+        ACCOUNT_ID,
+        lambda s3, bucket_name, account_id: True,
+        lambda s3, bucket_name, account_id: None,
+        bucket_names=["second-bucket"],
+    )
+
+    assert json.loads(result["Manifest"])["Compliant"] == ["second-bucket"]
+
+
+@mock_aws
+def test_account_without_buckets():
+    result = s3_bucket_sweep.sweep_buckets(
+        ACCOUNT_ID,
+        lambda s3, bucket_name, account_id: True,
+        lambda s3, bucket_name, account_id: None,
+    )
+
+    assert result["BucketsChecked"] == 0
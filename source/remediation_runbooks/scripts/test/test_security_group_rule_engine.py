@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""Test the security group rule evaluation shared by the security group runbooks"""
+import random
+
+import boto3
+import security_group_rule_engine as engine
+from botocore.config import Config
+from botocore.stub import Stubber
+from DisableUnrestrictedAccessToHighRiskPorts import (
+    PORTS_TO_CHECK,
+    rule_has_access_to_high_risk_ports,
+)
+from RevokeUnauthorizedInboundRules import revoke_unauthorized_rules
+
+BOTO_CONFIG = Config(retries={"mode": "standard", "max_attempts": 10})
+
+
+def wide_range_rules(count, seed=0):
+    rng = random.Random(seed)
+    rules = []
+    for index in range(count):
+        from_port = rng.randint(0, 65535)
+        rules.append(
+            {
+                "SecurityGroupRuleId": f"sgr-{index:05d}",
+                "IsEgress": False,
+                "IpProtocol": rng.choice(["tcp", "udp"]),
+                "FromPort": from_port,
+                "ToPort": rng.randint(from_port, 65535),
+                "CidrIpv4": engine.OPENIPV4,
+            }
+        )
+    return rules
+
+
+def test_to_port_intervals():
+    assert engine.to_port_intervals([443, 80, 81, 82, 8080, 81]) == [
+        (80, 82),
+        (443, 443),
+        (8080, 8080),
+    ]
+    assert engine.to_port_intervals([]) == []
+
+
+def test_is_range_covered():
+    intervals = engine.to_port_intervals([80, 81, 82, 443])
+
+    assert engine.is_range_covered(80, 82, intervals)
+    assert engine.is_range_covered(443, 443, intervals)
+    assert not engine.is_range_covered(80, 83, intervals)
+    assert not engine.is_range_covered(79, 80, intervals)
+    assert not engine.is_range_covered(82, 443, intervals)
+    assert not engine.is_range_covered(-1, -1, intervals)
+    assert not engine.is_range_covered(0, 65535, [])
+
+
+def test_interval_evaluation_matches_port_by_port_evaluation():
+    authorized_ports = set(random.Random(1).sample(range(0, 65536), 200))
+    authorized_ports.update(range(8000, 8100))
+    intervals = engine.to_port_intervals(authorized_ports)
+    sorted_ports = sorted(authorized_ports)
+
+    for rule in wide_range_rules(200):
+        ports = range(rule["FromPort"], rule["ToPort"] + 1)
+        assert engine.is_range_covered(
+            rule["FromPort"], rule["ToPort"], intervals
+        ) == all(port in authorized_ports for port in ports)
+        assert engine.is_range_overlapping(
+            rule["FromPort"], rule["ToPort"], sorted_ports
+        ) == any(port in authorized_ports for port in ports)
+
+    for from_port in range(7990, 8110):
+        for to_port in range(from_port, 8110):
+            assert engine.is_range_covered(from_port, to_port, intervals) == all(
+                port in authorized_ports for port in range(from_port, to_port + 1)
+            )
+
+
+def test_high_risk_port_evaluation_matches_port_by_port_evaluation():
+    for rule in wide_range_rules(500):
+        assert rule_has_access_to_high_risk_ports(rule) == any(
+            port in range(rule["FromPort"], rule["ToPort"] + 1)
+            for port in PORTS_TO_CHECK
+        )
+
+
+def test_revoke_unauthorized_rules_batches_revocation(mocker):
+    group_id = "sg-0123456789"
+    rules = wide_range_rules(250)
+    ec2_client = boto3.client("ec2", config=BOTO_CONFIG)
+    mocker.patch(
+        "RevokeUnauthorizedInboundRules.connect_to_ec2", return_value=ec2_client
+    )
+    rule_ids = [rule["SecurityGroupRuleId"] for rule in rules]
+    ec2_stubber = Stubber(ec2_client)
+    for start in range(0, len(rule_ids), engine.REVOKE_BATCH_SIZE):
+        ec2_stubber.add_response(
+            "revoke_security_group_ingress",
+            {},
+            {
+                "GroupId": group_id,
+                "SecurityGroupRuleIds": rule_ids[
+                    start : start + engine.REVOKE_BATCH_SIZE
+                ],
+            },
+        )
+    ec2_stubber.activate()
+
+    assert revoke_unauthorized_rules(group_id, rules, {80}, {53}) == rule_ids
+
+    ec2_stubber.assert_no_pending_responses()
+    ec2_stubber.deactivate()
+
+
+def test_failed_batch_is_revoked_rule_by_rule():
+    group_id = "sg-0123456789"
+    ec2_client = boto3.client("ec2", config=BOTO_CONFIG)
+    ec2_stubber = Stubber(ec2_client)
+    ec2_stubber.add_client_error("revoke_security_group_ingress", "InvalidGroup")
+    ec2_stubber.add_response(
+        "revoke_security_group_ingress",
+        {},
+        {"GroupId": group_id, "SecurityGroupRuleIds": ["sgr-1"]},
+    )
+    ec2_stubber.add_client_error(
+        "revoke_security_group_ingress", "InvalidSecurityGroupRuleId.NotFound"
+    )
+    ec2_stubber.activate()
+
+    assert engine.revoke_ingress_rules(ec2_client, group_id, ["sgr-1", "sgr-2"]) == [
+        "sgr-1"
+    ]
+
+    ec2_stubber.assert_no_pending_responses()
+    ec2_stubber.deactivate()
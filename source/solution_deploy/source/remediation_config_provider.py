@@ -145,7 +145,7 @@ def update_table(table_name: str, supported_controls: List[str]) -> None:
 
 
 @event_source(data_class=CloudFormationCustomResourceEvent)  # type: ignore[misc]
-@tracer.capture_lambda_handler  # type: ignore[misc]
+@tracer.capture_lambda_handler
 def lambda_handler(
     event: CloudFormationCustomResourceEvent, context: LambdaContext
 ) -> None: